@@ -0,0 +1,88 @@
+# benchmarks/bench_analytics.py
+"""
+The pandas analytics (src/analytics.py) on a scratch database with 500k
+transactions over 20 years.
+
+Usage:
+    python -m benchmarks.bench_analytics [rows]
+
+Reports what importing the services costs with and without pandas loaded,
+the frame load (chunked, categorical) against one plain pd.read_sql and the
+memory each frame takes, and the time of the two UI reports.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "analytics.db")
+
+from src import analytics
+from src.database import ReadSession
+from src.services.core import svc_add_transactions_bulk
+
+CATEGORIES = ["Groceries", "Fuel", "Rent / Bond", "Eating Out", "Medical", "Salary"]
+TAGS = ["", "", "SPAR, Milk", "Woolworths", "Shell, Car", "Takealot", "Gym"]
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2006, 1, 1)
+    for start in range(0, rows, batch):
+        svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 70),
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "amount": Decimal("1500.00") if i % 6 == 5 else Decimal(-(i % 9000 + 100)) / 100,
+                "description": f"bench row {i}",
+                "tags": TAGS[i % len(TAGS)],
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+
+
+def _import_time(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main(rows: int = 500_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+    pd = analytics._pd()
+
+    print(f"  import src.services.core: {_import_time('src.services.core') * 1000:.0f} ms"
+          f" (pandas alone: {_import_time('pandas') * 1000:.0f} ms, paid on first report)\n")
+
+    def plain():
+        with ReadSession() as db:
+            return pd.read_sql(analytics._frame_query(), db.connection())
+
+    plain_s, plain_frame = _timed(plain)
+    frame_s, frame = _timed(analytics.transactions_frame)
+    print(f"  {rows:,} rows\n")
+    print(f"  {'frame':<34}{'s':>7}{'MB':>8}")
+    print(f"  {'pd.read_sql, one piece':<34}{plain_s:>7.2f}{plain_frame.memory_usage(deep=True).sum() / 2**20:>8.1f}")
+    print(f"  {'transactions_frame (chunked)':<34}{frame_s:>7.2f}{frame.memory_usage(deep=True).sum() / 2**20:>8.1f}\n")
+
+    today = date(2025, 6, 30)
+    for name, report in (
+        ("monthly_trends(12)", lambda: analytics.monthly_trends(12, today)),
+        ("category_pivot(6)", lambda: analytics.category_pivot(6, today)),
+        ("period_totals, whole frame, QS", lambda: analytics.period_totals(frame, "QS")),
+    ):
+        print(f"  {name:<34}{_timed(report)[0] * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,128 @@
+# benchmarks/bench_backup.py
+"""
+Online backup (src/backup.py) time and the stall it causes, on a scratch
+database with a million transactions.
+
+Usage:
+    python -m benchmarks.bench_backup [rows]
+
+For each pages-per-step setting the backup runs on a worker thread, the way
+the app runs it, while the main thread plays the UI:
+  - an asyncio loop ticking every 5 ms; "loop lag" is how late the ticks are;
+  - a diary page query (get_transactions_page) every 50 ms, timed.
+The same numbers without a backup running are printed first as the baseline.
+The last case also keeps a writer busy during the backup to show restarts.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "backup.db")
+
+from src import backup
+from src.models import add_transaction, get_transactions_page
+from src.services.core import svc_add_transactions_bulk
+
+BATCH = 100_000
+
+
+def _fill(rows: int):
+    day0 = date(2000, 1, 1)
+    for start in range(0, rows, BATCH):
+        svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 100),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "description": f"bench row {i}",
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+            }
+            for i in range(start, min(start + BATCH, rows))
+        ])
+
+
+async def _ui_probe(done: threading.Event) -> dict:
+    """Tick the loop and run diary queries until `done` is set."""
+    lags, queries = [], []
+    next_query = time.perf_counter()
+    while not done.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - before - 0.005)
+        if time.perf_counter() >= next_query:
+            started = time.perf_counter()
+            get_transactions_page(None, 50)
+            queries.append(time.perf_counter() - started)
+            next_query = started + 0.05
+    return {"lags": lags, "queries": queries}
+
+
+async def _measure(pages: int | None, writer: bool = False) -> dict:
+    done = threading.Event()
+    result, writes = {}, [0]
+
+    def run_backup():
+        try:
+            if pages is None:
+                time.sleep(2)  # baseline: nothing but the probe
+            else:
+                result.update(backup.backup_database(pages_per_step=pages, keep=1))
+        finally:
+            done.set()
+
+    def write():
+        while not done.is_set():
+            add_transaction(date(2030, 1, 1), "Bench", Decimal("1.00"))
+            writes[0] += 1
+
+    threads = [threading.Thread(target=run_backup)]
+    if writer:
+        threads.append(threading.Thread(target=write))
+    for t in threads:
+        t.start()
+    probe = await _ui_probe(done)
+    for t in threads:
+        t.join()
+    return {**result, **probe, "writes": writes[0]}
+
+
+def _ms(values, pct=None) -> str:
+    if pct is None:
+        return f"{max(values) * 1000:7.1f}" if values else f"{'-':>7}"
+    if len(values) < 2:
+        return f"{'-':>7}"  # quantiles needs two samples; small runs can have fewer
+    return f"{statistics.quantiles(values, n=100)[pct - 1] * 1000:7.1f}"
+
+
+def main(rows: int = 1_000_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    started = time.perf_counter()
+    _fill(rows)
+    size_mb = os.path.getsize(os.environ["MORNINGMONEY_DB"]) / 1e6
+    print(f"  {rows:,} rows, {size_mb:.0f} MB (built in {time.perf_counter() - started:.0f}s)\n")
+
+    print(f"  {'case':<26}{'backup s':>9}{'restarts':>9}{'lag p99':>9}{'lag max':>9}{'query p50':>10}{'query max':>10}")
+    cases = [("no backup (baseline)", None, False)]
+    cases += [(f"{pages} pages/step", pages, False) for pages in (64, 256, backup.PAGES_PER_STEP, 8192)]
+    cases += [("all in one step", -1, False), (f"{backup.PAGES_PER_STEP} pages/step + writer", backup.PAGES_PER_STEP, True)]
+    for name, pages, writer in cases:
+        m = asyncio.run(_measure(pages, writer))
+        seconds = f"{m['seconds']:9.2f}" if "seconds" in m else f"{'-':>9}"
+        restarts = f"{m['restarts']:9d}" if "restarts" in m else f"{'-':>9}"
+        print(
+            f"  {name:<26}{seconds}{restarts}{_ms(m['lags'], 99):>9}{_ms(m['lags']):>9}"
+            f"{_ms(m['queries'], 50):>10}{_ms(m['queries']):>10}"
+            + (f"   ({m['writes']} writes)" if writer else "")
+        )
+    print("\n  times in ms; the backup itself runs on a worker thread")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,52 @@
+# benchmarks/bench_bulk_insert.py
+"""
+Rows/second for svc_add_transactions_bulk against svc_add_transaction.
+
+Usage:
+    python -m benchmarks.bench_bulk_insert [rows]
+
+Runs on a scratch database in a temp directory.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "bulk.db")
+
+from src.services.core import svc_add_transaction, svc_add_transactions_bulk
+
+
+def _rows(n: int, day0: date):
+    for i in range(n):
+        yield {
+            "date": day0 + timedelta(days=i // 50),
+            "category": "Groceries" if i % 4 else "Salary",
+            "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+            "description": f"bench row {i}",
+            "tags": "SPAR, Milk" if i % 7 == 0 else "",
+        }
+
+
+def main(rows: int = 200_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+
+    single = 500
+    start = time.perf_counter()
+    for row in _rows(single, date(2015, 1, 1)):
+        svc_add_transaction(row["date"], row["category"], row["amount"], row["description"], row["tags"])
+    single_s = time.perf_counter() - start
+    print(f"  svc_add_transaction       {single / single_s:>12,.0f} rows/s  ({single} rows)")
+
+    batch = list(_rows(rows, date(2020, 1, 1)))
+    start = time.perf_counter()
+    svc_add_transactions_bulk(batch)
+    bulk_s = time.perf_counter() - start
+    print(f"  svc_add_transactions_bulk {rows / bulk_s:>12,.0f} rows/s  ({rows} rows, one batch)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
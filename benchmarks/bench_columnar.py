@@ -0,0 +1,143 @@
+# benchmarks/bench_columnar.py
+"""
+Analytics on SQL vs on the in-memory columnar store (src/columnar.py), on a
+scratch database with a million transactions over 27 years.
+
+Usage:
+    python -m benchmarks.bench_columnar [rows]
+
+Each analytic runs through its src/models.py function twice: with the store
+disabled (the SQL path) and with it loaded (the store is turned on here
+whatever MORNINGMONEY_COLUMNAR says). Also reports the one-off load
+time, the memory the arrays take, and what keeping the store current adds
+to a single add_transaction.
+
+Then checks that the store still agrees with SQL after archiving a year
+whose rows held the highest ids, adding a row and deleting it again (the
+new row must not reuse an archived id; if it does, the delete drops its
+archived twin from the store too). Exits with 1 if they disagree.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "columnar.db")
+
+from src import columnar
+from src.archive import archive_year
+from src.database import init_db, next_transaction_id
+from src.models import (
+    add_transaction,
+    delete_transaction,
+    get_balance,
+    get_balance_as_of,
+    get_category_summary,
+    get_monthly_summary,
+    get_tag_summary,
+    get_total_saved,
+)
+from src.services.core import svc_add_transactions_bulk
+
+ROUNDS = 20
+CATEGORIES = ["Groceries", "Fuel", "Rent / Bond", "Eating Out", "Medical", "Salary"]
+TAGS = ["", "", "SPAR, Milk", "Woolworths", "Shell, Car", "Takealot", "Gym"]
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2000, 1, 1)
+    for start in range(0, rows, batch):
+        svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 100),
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "amount": Decimal("1500.00") if i % 6 == 5 else Decimal(-(i % 9000 + 100)) / 100,
+                "description": f"bench row {i}",
+                "tags": TAGS[i % len(TAGS)],
+                "saved_amount": Decimal("1.00") if i % 9 == 0 else Decimal("0.00"),
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+
+
+def _time(fn) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _wait_for_store():
+    columnar.get_store()
+    while columnar.get_store() is None:
+        time.sleep(0.01)
+
+
+def _check_archive_insert_delete() -> bool:
+    """archive -> insert -> delete; True when the store and SQL still agree."""
+    columnar.ENABLED = True
+    columnar.invalidate()
+    _wait_for_store()
+    # Back-dated into the oldest year, so archiving it frees the highest id
+    add_transaction(date(2000, 6, 1), "Bench", Decimal("-10.00"), tags="Bench")
+    archive_year(2000)
+    with init_db().connect() as conn:
+        new_id = next_transaction_id(conn)
+    add_transaction(date(2026, 1, 2), "Bench", Decimal("-5.00"))
+    delete_transaction(new_id)
+
+    checks = (get_balance, get_total_saved, lambda: get_monthly_summary(None))
+    store = [fn() for fn in checks]
+    columnar.ENABLED = False
+    sql = [fn() for fn in checks]
+    columnar.ENABLED = True
+    return store == sql
+
+
+def main(rows: int = 1_000_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+    month = "2020-06"
+    analytics = (
+        ("balance", get_balance),
+        ("balance as of", lambda: get_balance_as_of(date(2012, 3, 4))),
+        ("total saved", get_total_saved),
+        ("monthly summary (all)", lambda: get_monthly_summary(None)),
+        ("tag summary (month)", lambda: get_tag_summary(month)),
+        ("category summary (month)", lambda: get_category_summary(month)),
+    )
+
+    columnar.ENABLED = False
+    sql = [(name, _time(fn), fn()) for name, fn in analytics]
+
+    columnar.ENABLED = True
+    started = time.perf_counter()
+    _wait_for_store()
+    loaded = time.perf_counter() - started
+    store = columnar.get_store()
+    held = sum(getattr(store, name).nbytes for name in ("ids", "days", "months", "amounts", "saved", "categories", "tags"))
+
+    print(f"  {rows:,} rows; store loaded in {loaded:.2f} s, {held / 2**20:.1f} MB of arrays\n")
+    print(f"  {'analytic':<28}{'sql ms':>10}{'columnar ms':>13}{'same result':>13}")
+    for (name, fn), (_, sql_s, sql_result) in zip(analytics, sql):
+        print(f"  {name:<28}{sql_s * 1000:>10.3f}{_time(fn) * 1000:>13.3f}{str(fn() == sql_result):>13}")
+
+    def add(tracked: bool):
+        columnar.ENABLED = tracked
+        return _time(lambda: add_transaction(date(2026, 1, 1), "Bench", Decimal("-1.00"), tags="Bench"))
+
+    print(f"\n  add_transaction: {add(False) * 1000:.2f} ms untracked, {add(True) * 1000:.2f} ms with the store kept current")
+
+    agree = _check_archive_insert_delete()
+    print(f"  archive -> insert -> delete: store and SQL agree: {agree}")
+    if not agree:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
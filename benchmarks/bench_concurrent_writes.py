@@ -0,0 +1,116 @@
+# benchmarks/bench_concurrent_writes.py
+"""
+Concurrent writers, as in web mode with several sessions open: each thread
+adds transactions as fast as it can while reader threads page the diary.
+
+Usage:
+    python -m benchmarks.bench_concurrent_writes [threads] [writes_per_thread]
+
+  direct  every thread calls models.add_transaction on its own session
+          (how the UI wrote before src/db_writer.py)
+  writer  every thread calls svc_add_transaction, which queues the write on
+          the single writer thread
+
+Reports failed writes (any database error: "database is locked", a
+constraint broken by a racing writer, ...), write latency percentiles and
+the diary query latency seen by the readers meanwhile. Runs on a scratch
+database in a temp directory, seeded with 100k rows.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "writes.db")
+
+from sqlalchemy.exc import DBAPIError
+
+from src.models import add_transaction, get_transactions_page
+from src.services.core import svc_add_transaction, svc_add_transactions_bulk
+
+READERS = 2
+
+
+def _seed(rows: int = 100_000):
+    day0 = date(2020, 1, 1)
+    svc_add_transactions_bulk([
+        {
+            "date": day0 + timedelta(days=i // 50),
+            "category": "Groceries" if i % 4 else "Salary",
+            "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+            "description": f"seed row {i}",
+        }
+        for i in range(rows)
+    ])
+
+
+def _run(write, threads: int, writes: int) -> dict:
+    latencies, read_latencies, errors = [], [], []
+    done = threading.Event()
+
+    def writer(n: int):
+        for i in range(writes):
+            started = time.perf_counter()
+            try:
+                # Back-dated rows, so every write also shifts later running balances
+                write(date(2024, 1, 1) + timedelta(days=(n * writes + i) % 700), "Bench", Decimal("-1.00"))
+            except DBAPIError as ex:
+                # "database is locked", but also e.g. a constraint a racing writer broke
+                errors.append(f"{type(ex.orig).__name__}: {ex.orig}")
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    def reader():
+        while not done.is_set():
+            started = time.perf_counter()
+            get_transactions_page(None, 50)
+            read_latencies.append(time.perf_counter() - started)
+
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for t in readers:
+        t.join()
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "read_latencies": read_latencies,
+        "errors": errors,
+    }
+
+
+def _pct(values, pct: int) -> float:
+    return statistics.quantiles(values, n=100)[pct - 1] * 1000 if len(values) > 1 else float("nan")
+
+
+def main(threads: int = 8, writes: int = 200):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _seed()
+    print(f"  {threads} writer threads x {writes} writes, {READERS} reader threads\n")
+    print(f"  {'mode':<8}{'writes/s':>10}{'failed':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'read p50':>10}{'read p99':>10}")
+    for name, write in (("direct", add_transaction), ("writer", svc_add_transaction)):
+        r = _run(write, threads, writes)
+        ok = len(r["latencies"])
+        print(
+            f"  {name:<8}{ok / r['elapsed']:>10.0f}{len(r['errors']):>8}"
+            f"{_pct(r['latencies'], 50):>9.1f}{_pct(r['latencies'], 99):>9.1f}{max(r['latencies'] or [0]) * 1000:>9.1f}"
+            f"{_pct(r['read_latencies'], 50):>10.1f}{_pct(r['read_latencies'], 99):>10.1f}"
+        )
+        if r["errors"]:
+            print(f"          e.g. {r['errors'][0]}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,80 @@
+# benchmarks/bench_engine.py
+"""
+Insert and aggregate throughput for the SQLite engine profiles in src/database.py.
+
+Usage:
+    python -m benchmarks.bench_engine [rows]
+
+Each profile gets its own scratch database in a temp directory, so the real
+data/finance.db is never touched.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Point the app at a scratch DB before anything imports src.database
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ.setdefault("MORNINGMONEY_DB", os.path.join(_TMP_DIR, "import_guard.db"))
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, Transaction, ENGINE_PROFILES, make_engine
+
+
+def _bench_profile(profile: str, rows: int) -> dict:
+    db_path = os.path.join(_TMP_DIR, f"{profile}.db")
+    engine = make_engine(db_path, profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, future=True)
+
+    # One commit per row, same as add_transaction()
+    start = time.perf_counter()
+    day0 = date(2020, 1, 1)
+    for i in range(rows):
+        with Session() as db:
+            db.add(Transaction(
+                date=day0 + timedelta(days=i % 1500),
+                category="Groceries" if i % 3 else "Salary",
+                amount=Decimal("-12.34") if i % 3 else Decimal("500.00"),
+                description="bench",
+                tags="bench",
+            ))
+            db.commit()
+    insert_s = time.perf_counter() - start
+
+    # The monthly summary query is the heaviest aggregate the UI runs
+    start = time.perf_counter()
+    loops = 50
+    with engine.connect() as conn:
+        for _ in range(loops):
+            conn.execute(text("""
+                SELECT strftime('%Y-%m', date) AS month,
+                       SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END),
+                       SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END)
+                FROM transactions
+                GROUP BY month
+            """)).fetchall()
+    aggregate_s = time.perf_counter() - start
+
+    engine.dispose()
+    return {
+        "profile": profile,
+        "inserts_per_s": rows / insert_s,
+        "aggregates_per_s": loops / aggregate_s,
+    }
+
+
+def main(rows: int = 2000):
+    print(f"{rows} single-row commits per profile (scratch dir: {_TMP_DIR})")
+    for profile in ENGINE_PROFILES:
+        r = _bench_profile(profile, rows)
+        print(f"  {r['profile']:<8} inserts/s: {r['inserts_per_s']:>10,.0f}   "
+              f"monthly aggregates/s: {r['aggregates_per_s']:>8,.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
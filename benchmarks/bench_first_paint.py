@@ -0,0 +1,157 @@
+# benchmarks/bench_first_paint.py
+"""
+Time to first paint of the main UI, on a scratch database with 200k
+transactions and a few investments (bench_startup.py covers the imports
+before it).
+
+Usage:
+    python -m benchmarks.bench_first_paint [rows]
+
+  eager  what build_main_ui did before the tabs were lazy: construct all
+         eight desktop tabs, twice, then refresh every one of them in turn
+  lazy   main.build_main_ui as it is: eight LazyTab placeholders, and
+         only the tab on screen constructed and refreshed
+
+Both run on a stand-in page object (no Flet client) with the result cache
+and the columnar store off, so every refresh really queries. Reports the
+best of ROUNDS and how many tabs were constructed.
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "startup.db")
+os.environ["MORNINGMONEY_COLUMNAR"] = "0"
+os.environ["MORNINGMONEY_RESULT_CACHE"] = "0"
+
+import main as app
+from controls.common import init_page_extensions
+from controls.desktop import build_desktop_ui
+from src.services import core
+
+ROUNDS = 5
+TAB_CLASSES = (
+    app.NewEntryTab, app.DiaryTab, app.MonthlyTab, app.InvestmentsTab,
+    app.TagsInsightsTab, app.SavingsBragTab, app.GraphsTab, app.SettingsTab,
+)
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2015, 1, 1)
+    for start in range(0, rows, batch):
+        core.svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 50),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "description": f"bench row {i}",
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+    for n in range(5):
+        core.svc_add_or_update_investment(f"Fund {n}", Decimal("10000.00"), Decimal("500.00"))
+
+
+class _Window:
+    width, height = 1280, 900
+
+    async def top(self):
+        pass
+
+    async def center(self):
+        pass
+
+
+class BenchPage:
+    """The parts of ft.Page that startup touches."""
+
+    def __init__(self):
+        self.window = _Window()
+        self.width = 1280
+        self.platform = None
+        self.route = None
+        self.client_storage = {"seen_welcome": True}
+        self.overlay = []
+        self.session = {}
+        self.theme_mode = "light"
+        init_page_extensions(self)
+
+    def clean(self):
+        pass
+
+    def add(self, *controls):
+        pass
+
+    def update(self):
+        pass
+
+    def run_task(self, fn, *args):
+        return asyncio.get_running_loop().create_task(fn(*args))
+
+
+async def eager() -> int:
+    page = BenchPage()
+    for _ in range(2):
+        tabs = [tab_class(page, None) for tab_class in TAB_CLASSES]
+    build_desktop_ui(page, *tabs)
+    await page.balance_updater()
+    for tab in tabs:
+        try:
+            await tab.refresh()
+        except Exception:
+            pass  # controls not on a real page; the queries have run
+    await page.safe_update()
+    return 2 * len(tabs)
+
+
+_lazy_tabs = []  # the placeholders of the last build_main_ui
+
+
+async def lazy() -> int:
+    page = BenchPage()
+    await app.build_main_ui(page)
+    return sum(1 for tab in _lazy_tabs if tab.tab is not None)
+
+
+def _best(run) -> tuple:
+    best, built = float("inf"), 0
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        built = asyncio.run(run())
+        best = min(best, time.perf_counter() - started)
+    return best, built
+
+
+def main(rows: int = 200_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+    # Startup's background jobs are not part of the first paint
+    app.start_json_migration = lambda on_done=None: None
+    app.start_backup_if_due = lambda: None
+    original_create_tabs = app.create_tabs
+
+    def create_tabs(page, refresh_all=None):
+        _lazy_tabs[:] = original_create_tabs(page, refresh_all)
+        return _lazy_tabs
+
+    app.create_tabs = create_tabs
+    # Without a Flet client the tabs' own update() calls fail; the queries have run
+    logging.disable(logging.ERROR)
+    asyncio.run(eager())  # warm pools and imports
+
+    print(f"  {rows:,} rows, best of {ROUNDS}\n")
+    print(f"  {'':<8}{'first paint ms':>16}{'tabs constructed':>19}")
+    for name, run in (("eager", eager), ("lazy", lazy)):
+        seconds, built = _best(run)
+        print(f"  {name:<8}{seconds * 1000:>16.1f}{built:>19}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,125 @@
+# benchmarks/bench_refresh.py
+"""
+A burst of quick saves and the refreshes they trigger, on a scratch
+database with 200k transactions.
+
+Usage:
+    python -m benchmarks.bench_refresh [saves]
+
+Each save adds a transaction and then asks for the balance and the data
+tabs (Monthly, Tags & Insights, Savings) to refresh, the saves starting
+SPACING_S apart, like a user entering several expenses quickly. Two ways:
+
+  sequential  every save awaits its own refresh: each view one after the
+              other, then page.update() (refresh_all before the scheduler)
+  scheduler   every save requests the refresh from a RefreshScheduler
+              (ui/utils/refresh_scheduler.py)
+
+Reports the view refreshes and page.update() calls made, and the latency
+from each save's commit to the page.update() that showed it.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "refresh.db")
+
+from src.services import core, async_core
+from ui.sections.desktop.monthly_desktop import MonthlyTab
+from ui.sections.desktop.tags_insights_desktop import TagsInsightsTab
+from ui.sections.desktop.savings_brag_desktop import SavingsBragTab
+from ui.utils.refresh_scheduler import RefreshScheduler
+
+SPACING_S = 0.01
+
+
+def _fill(rows: int = 200_000, batch: int = 100_000):
+    day0 = date(2015, 1, 1)
+    for start in range(0, rows, batch):
+        core.svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 50),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+
+
+class BenchPage:
+    """Just enough of ft.Page for the tabs; counts update() calls."""
+
+    def __init__(self):
+        self.updates = 0
+        self.updates_deferred = False
+        self.shown_at = []  # perf_counter of each update()
+
+    def update(self):
+        self.updates += 1
+        self.shown_at.append(time.perf_counter())
+
+    async def safe_update(self):
+        if not self.updates_deferred:
+            self.update()
+
+
+async def _burst(saves: int, use_scheduler: bool):
+    page = BenchPage()
+    tabs = [MonthlyTab(page, None), TagsInsightsTab(page, None), SavingsBragTab(page, None)]
+    refreshed = []
+
+    async def balance():
+        refreshed.append("balance")
+        await async_core.svc_get_balance_async()
+
+    def view(tab):
+        async def refresh():
+            refreshed.append(type(tab).__name__)
+            await tab.refresh()
+        return refresh
+
+    targets = {"balance": balance, **{tab: view(tab) for tab in tabs}}
+    scheduler = RefreshScheduler(page)
+    latencies = []
+
+    async def save(n: int):
+        await asyncio.sleep(n * SPACING_S)
+        await async_core.svc_add_transaction_async(date(2026, 1, 1), "Groceries", Decimal("-1.00"))
+        committed = time.perf_counter()
+        if use_scheduler:
+            await scheduler.request(targets, committed)
+        else:
+            for refresh in targets.values():
+                await refresh()
+            await page.safe_update()
+        latencies.append(time.perf_counter() - committed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(save(n) for n in range(saves)))
+    return time.perf_counter() - started, len(refreshed), page.updates, latencies
+
+
+def main(saves: int = 10):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill()
+    asyncio.run(_burst(2, False))  # warm pools and caches
+
+    print(f"  {saves} saves {SPACING_S * 1000:.0f} ms apart\n")
+    print(f"  {'':<12}{'total ms':>10}{'refreshes':>11}{'updates':>9}{'p50 ms':>9}{'max ms':>9}")
+    for name, use_scheduler in (("sequential", False), ("scheduler", True)):
+        total, refreshes, updates, latencies = asyncio.run(_burst(saves, use_scheduler))
+        print(
+            f"  {name:<12}{total * 1000:>10.0f}{refreshes:>11}{updates:>9}"
+            f"{statistics.median(latencies) * 1000:>9.0f}{max(latencies) * 1000:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
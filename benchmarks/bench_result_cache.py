@@ -0,0 +1,94 @@
+# benchmarks/bench_result_cache.py
+"""
+The reads one refresh_all makes, with and without the result cache
+(src/services/cache.py), on a scratch database with 200k transactions and
+a few investments.
+
+Usage:
+    python -m benchmarks.bench_result_cache [rows]
+
+  cold   right after a write: every read computes (and fills the cache)
+  warm   the same reads again before the next write: all hits
+  off    the cache disabled, as before
+
+Reports the best of ROUNDS per refresh and the cache's hit/miss counts.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "result_cache.db")
+# Compare against SQL; the columnar store would hide most of the cost
+os.environ.setdefault("MORNINGMONEY_COLUMNAR", "0")
+
+from src.services import cache, core
+
+ROUNDS = 20
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2015, 1, 1)
+    for start in range(0, rows, batch):
+        core.svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 50),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+                "saved_amount": Decimal("1.00") if i % 9 == 0 else Decimal("0.00"),
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+    for n in range(5):
+        core.svc_add_or_update_investment(f"Fund {n}", Decimal("10000.00"), Decimal("500.00"))
+
+
+def refresh():
+    # What one refresh_all asks for: header balance, Daily Fire, tabs
+    core.svc_get_balance()
+    core.svc_get_total_projected_wealth()
+    core.svc_get_balance()
+    core.svc_get_total_projected_wealth()
+    core.svc_get_total_projected_wealth()
+    core.svc_get_investments()
+    core.svc_get_monthly_summary()
+    core.svc_get_tag_summary()
+    core.svc_get_total_saved()
+
+
+def _best(before=None) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        if before:
+            before()
+        started = time.perf_counter()
+        refresh()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(rows: int = 200_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+
+    cache.ENABLED = False
+    off = _best()
+    cache.ENABLED = True
+    cold = _best(before=cache.RESULT_CACHE.bump)
+    cache.RESULT_CACHE.reset_stats()
+    warm = _best()
+
+    print(f"  {rows:,} rows, one refresh_all's reads, best of {ROUNDS}\n")
+    print(f"  {'off':<8}{off * 1000:>10.3f} ms")
+    print(f"  {'cold':<8}{cold * 1000:>10.3f} ms")
+    print(f"  {'warm':<8}{warm * 1000:>10.3f} ms")
+    stats = cache.RESULT_CACHE.stats()
+    print(f"\n  warm rounds: {stats['hits']} hits, {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
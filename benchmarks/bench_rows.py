@@ -0,0 +1,105 @@
+# benchmarks/bench_rows.py
+"""
+ORM instances vs projected row tuples (src/rows.py) for the read paths, on
+a scratch database with 100k transactions.
+
+Usage:
+    python -m benchmarks.bench_rows [rows]
+
+  orm   select(Transaction) loaded as ORM instances (plus the selectin tag
+        query) and wrapped in {"transaction", "running_balance"} dicts, as
+        get_transactions_with_running_balance did before
+  rows  the same query projected to TRANSACTION_ROW_COLUMNS and built into
+        TransactionRow tuples, as the read functions do now
+
+Reports the best of 3 load times and the memory the resulting list holds
+(tracemalloc, measured on a separate run).
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "rows.db")
+
+from sqlalchemy import select
+
+from src.database import ReadSession, Transaction
+from src.models import get_transactions_with_running_balance, get_all_transactions
+from src.services.core import svc_add_transactions_bulk
+
+ROUNDS = 3
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2015, 1, 1)
+    for start in range(0, rows, batch):
+        svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 30),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "description": f"bench row {i}",
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+
+
+def orm_running_balance():
+    with ReadSession() as db:
+        transactions = db.scalars(
+            select(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc())
+        ).all()
+    return [{"transaction": t, "running_balance": t.running_balance} for t in transactions]
+
+
+def orm_all():
+    with ReadSession() as db:
+        return db.query(Transaction).order_by(Transaction.date.desc()).all()
+
+
+def _time(load) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        gc.collect()
+        started = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _memory(load) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main(rows: int = 100_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+    get_all_transactions()  # warm caches and pools
+
+    print(f"  {rows:,} rows, best of {ROUNDS}\n")
+    print(f"  {'path':<32}{'ms':>9}{'MB held':>10}")
+    cases = (
+        ("running balance, orm", orm_running_balance),
+        ("running balance, rows", get_transactions_with_running_balance),
+        ("all transactions, orm", orm_all),
+        ("all transactions, rows", get_all_transactions),
+    )
+    for name, load in cases:
+        print(f"  {name:<32}{_time(load) * 1000:>9.0f}{_memory(load) / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,89 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of importing main.py with eager against lazy database init.
+
+Usage:
+    python -m benchmarks.bench_startup [runs]
+
+Each run is a fresh interpreter that imports main and then calls init_db(),
+timing both points:
+
+  lazy init_db   import main alone: what a start pays before Flet can show
+                 a window now (init_db runs later on a worker thread)
+  eager init_db  import main plus init_db(): what a start paid when
+                 importing src.database ran it unconditionally
+
+Both come from the same process, so their difference is the init_db cost
+itself and not noise between interpreters. Two databases:
+
+  migrated  a scratch copy of data/finance.db, migrated once up front
+            (a normal start)
+  new       no file yet, so init_db creates the schema and runs every
+            migration (a first start)
+
+plus "services": importing src.services.core alone (scripts and tools).
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP = "import main; _mark(); from src.database import init_db; init_db()"
+SERVICES = "import src.services.core"
+
+_TIMER = (
+    "import time, sys; _t = time.perf_counter(); "
+    "_mark = lambda: sys.stderr.write(f'@@{{time.perf_counter() - _t}}\\n'); "
+    "{code}; _mark()"
+)
+
+
+def _time_once(code: str, env: dict) -> list:
+    """Seconds from interpreter start to each _mark() in `code`, and to its end."""
+    result = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(code=code)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return [float(l[2:]) for l in result.stderr.splitlines() if l.startswith("@@")]
+
+
+def _median_ms(code: str, env: dict, runs: int, fresh_path: str = None) -> list:
+    """Per-mark medians over `runs` starts; fresh_path is deleted before each one."""
+    timings = []
+    for _ in range(runs):
+        if fresh_path is not None:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(fresh_path + suffix):
+                    os.remove(fresh_path + suffix)
+        marks = _time_once(code, env)
+        timings.append(marks + [marks[-1] - marks[0]])
+    return [statistics.median(column) * 1000 for column in zip(*timings)]
+
+
+def main(runs: int = 5):
+    tmp_dir = tempfile.mkdtemp(prefix="mm_bench_")
+    db_path = os.path.join(tmp_dir, "finance.db")
+    new_path = os.path.join(tmp_dir, "new.db")
+    source = os.path.join(REPO_DIR, "data", "finance.db")
+    if os.path.exists(source):
+        shutil.copy(source, db_path)
+
+    env = dict(os.environ, MORNINGMONEY_DB=db_path, PYTHONPATH=REPO_DIR)
+    new_env = dict(env, MORNINGMONEY_DB=new_path)
+    # One untimed start so the scratch copy is migrated and the OS caches are warm
+    _time_once(STARTUP, env)
+
+    print(f"scratch dir: {tmp_dir}  ({runs} runs, median)")
+    print(f"  {'':<10} {'lazy init_db':>14} {'eager init_db':>14} {'init_db':>11}")
+    for name, run_env, fresh_path in (("migrated", env, None), ("new", new_env, new_path)):
+        lazy, eager, init = _median_ms(STARTUP, run_env, runs, fresh_path)
+        print(f"  {name:<10} {lazy:>11.1f} ms {eager:>11.1f} ms {init:>8.1f} ms")
+    print(f"  {'services':<10} {_median_ms(SERVICES, env, runs)[0]:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
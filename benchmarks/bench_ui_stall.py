@@ -0,0 +1,113 @@
+# benchmarks/bench_ui_stall.py
+"""
+Event-loop stalls while the tabs refresh, on a scratch database with
+500k transactions.
+
+Usage:
+    python -m benchmarks.bench_ui_stall [rows]
+
+One "refresh" runs the queries refresh_all triggers (balance, tag summary,
+total saved, monthly summary, investments + projected wealth, first diary
+page, a search). It is run two ways while a 60 Hz ticker measures how late
+the event loop gets (a frame is ~16.7 ms):
+
+  blocking  the svc_* functions called straight from async code, as the
+            tabs did before src/services/async_core.py
+  async     the svc_*_async counterparts, run on the DB executor
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "stall.db")
+
+from src.services import core
+from src.services import async_core
+
+FRAME_S = 1 / 60
+ROUNDS = 5
+
+
+def _fill(rows: int, batch: int = 100_000):
+    day0 = date(2010, 1, 1)
+    for start in range(0, rows, batch):
+        core.svc_add_transactions_bulk([
+            {
+                "date": day0 + timedelta(days=i // 100),
+                "category": "Groceries" if i % 4 else "Salary",
+                "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+                "description": f"bench row {i}",
+                "tags": "SPAR, Milk" if i % 7 == 0 else "",
+                "saved_amount": Decimal("1.00") if i % 9 == 0 else Decimal("0.00"),
+            }
+            for i in range(start, min(start + batch, rows))
+        ])
+    core.svc_add_or_update_investment("Bench ETF", Decimal("100000"), Decimal("5000"))
+
+
+async def refresh_blocking():
+    core.svc_get_balance()
+    core.svc_get_tag_summary()
+    core.svc_get_total_saved()
+    core.svc_get_monthly_summary()
+    core.svc_get_investments()
+    core.svc_get_total_projected_wealth()
+    core.svc_get_transactions_page(None, 50)
+    core.svc_search_transactions("milk")
+
+
+async def refresh_async():
+    # Tabs refresh one after another in refresh_all; each awaits its own query
+    await async_core.svc_get_balance_async()
+    await async_core.svc_get_tag_summary_async()
+    await async_core.svc_get_total_saved_async()
+    await async_core.svc_get_monthly_summary_async()
+    await async_core.svc_get_investments_async()
+    await async_core.svc_get_total_projected_wealth_async()
+    await async_core.svc_get_transactions_page_async(None, 50)
+    await async_core.svc_search_transactions_async("milk")
+
+
+async def _measure(refresh) -> dict:
+    lags, running = [], True
+
+    async def ticker():
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(FRAME_S)
+            lags.append(time.perf_counter() - before - FRAME_S)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(FRAME_S * 3)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await refresh()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    running = False
+    await tick
+    return {
+        "refresh_ms": elapsed * 1000,
+        "max_lag_ms": max(lags) * 1000,
+        "dropped": sum(int(lag // FRAME_S) for lag in lags),
+    }
+
+
+def main(rows: int = 500_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _fill(rows)
+    asyncio.run(refresh_async())  # warm caches and pools
+
+    print(f"  {rows:,} rows, {ROUNDS} refreshes each\n")
+    print(f"  {'mode':<10}{'refresh ms':>12}{'max loop lag ms':>17}{'frames dropped':>16}")
+    for name, refresh in (("blocking", refresh_blocking), ("async", refresh_async)):
+        m = asyncio.run(_measure(refresh))
+        print(f"  {name:<10}{m['refresh_ms']:>12.1f}{m['max_lag_ms']:>17.1f}{m['dropped']:>16}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
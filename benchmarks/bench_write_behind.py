@@ -0,0 +1,83 @@
+# benchmarks/bench_write_behind.py
+"""
+Rapid data entry: one row at a time, as fast as the caller can go, on a
+scratch database seeded with 100k rows.
+
+Usage:
+    python -m benchmarks.bench_write_behind [rows]
+
+  per-row       svc_add_transaction, one commit (and one UI refresh) per row
+  write-behind  svc_enqueue_transaction, rows journaled and committed in
+                batches by src/write_behind.py
+
+Reports the time until the caller got its acknowledgement (per row), the
+time until every row was committed, and how many batch commits (= UI
+refreshes) that took.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+_TMP_DIR = tempfile.mkdtemp(prefix="mm_bench_")
+os.environ["MORNINGMONEY_DB"] = os.path.join(_TMP_DIR, "entry.db")
+
+from src.services.core import (
+    svc_add_transaction,
+    svc_add_transactions_bulk,
+    svc_enqueue_transaction,
+    svc_flush_write_behind,
+    svc_on_write_behind_commit,
+)
+
+
+def _seed(rows: int = 100_000):
+    day0 = date(2020, 1, 1)
+    svc_add_transactions_bulk([
+        {
+            "date": day0 + timedelta(days=i // 50),
+            "category": "Groceries" if i % 4 else "Salary",
+            "amount": Decimal("-42.50") if i % 4 else Decimal("1500.00"),
+            "description": f"seed row {i}",
+        }
+        for i in range(rows)
+    ])
+
+
+def _run(add, rows: int) -> dict:
+    acks = []
+    started = time.perf_counter()
+    for i in range(rows):
+        before = time.perf_counter()
+        # Back-dated, so each commit also shifts later running balances
+        add(date(2024, 1, 1) + timedelta(days=i % 300), "Bench", Decimal("-1.00"), f"entry {i}", "Bench")
+        acks.append(time.perf_counter() - before)
+    acked = time.perf_counter() - started
+    svc_flush_write_behind()
+    return {"acked": acked, "committed": time.perf_counter() - started, "acks": acks}
+
+
+def main(rows: int = 2_000):
+    print(f"scratch db: {os.environ['MORNINGMONEY_DB']}")
+    _seed()
+    batches = []
+    svc_on_write_behind_commit(batches.append)
+
+    print(f"  {rows:,} entries\n")
+    print(f"  {'mode':<14}{'ack p50 ms':>12}{'ack p99 ms':>12}{'all acked s':>13}{'all committed s':>17}{'commits':>9}")
+    for name, add in (("per-row", svc_add_transaction), ("write-behind", svc_enqueue_transaction)):
+        batches.clear()
+        r = _run(add, rows)
+        commits = len(batches) if add is svc_enqueue_transaction else rows
+        q = statistics.quantiles(r["acks"], n=100)
+        print(
+            f"  {name:<14}{q[49] * 1000:>12.2f}{q[98] * 1000:>12.2f}"
+            f"{r['acked']:>13.2f}{r['committed']:>17.2f}{commits:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -10,13 +10,17 @@ def init_page_extensions(page: ft.Page):
     """
     Attach standardized helpers to `page`:
       - page.show_snack(message, bgcolor)
-      - page.safe_update() -> async wrapper around page.update()
+      - page.safe_update() -> async wrapper around page.update(); a no-op
+        while page.updates_deferred (a RefreshScheduler batch updates once at the end)
     """
     page.snack_bar = None
     page.bottom_sheet = None
     page.balance_updater = getattr(page, "balance_updater", None)
+    page.updates_deferred = False
 
     async def safe_update():
+        if page.updates_deferred:
+            return
         try:
             page.update()
         except Exception:
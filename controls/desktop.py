@@ -1,7 +1,7 @@
 # controls/desktop.py
 import flet as ft
 import logging
-from src.services.core import svc_get_balance
+from src.services.async_core import svc_get_balance_async
 
 def build_desktop_ui(
     page: ft.Page,
@@ -13,15 +13,16 @@ def build_desktop_ui(
     savings_brag_tab: ft.Control,
     graphs_tab: ft.Control,
     settings_tab: ft.Control,
+    on_tab_shown=None,
 ) -> None:
 
     # ---------------- BALANCE ---------------- #
 
     balance_text = ft.Text(size=32, weight=ft.FontWeight.BOLD)
 
-    def update_balance():
+    async def update_balance():
         try:
-            bal = svc_get_balance()
+            bal = await svc_get_balance_async()
 
             balance_text.value = f"R{bal:,.2f}"
             balance_text.color = "#94d494" if bal >= 0 else "red"
@@ -104,12 +105,18 @@ def build_desktop_ui(
         ],
     )
 
+    # Tell main.py which tab is on screen, so hidden ones can wait to refresh
+    def on_tab_change(e):
+        if on_tab_shown:
+            on_tab_shown(tab_contents.controls[e.control.selected_index])
+
     # Wrap in Tabs – this manages selection and syncing
     tabs_section = ft.Tabs(
         length=len(tab_bar.tabs),
         selected_index=0,
         animation_duration=300,
         expand=True,
+        on_change=on_tab_change,
         content=ft.Column(
             expand=True,
             controls=[
@@ -132,6 +139,8 @@ def build_desktop_ui(
     )
 
     page.add(layout)
+    if on_tab_shown:
+        on_tab_shown(tab_contents.controls[tabs_section.selected_index])
 
     # Initial balance
-    update_balance()
+    page.run_task(update_balance)
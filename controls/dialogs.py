@@ -5,17 +5,17 @@ from typing import TYPE_CHECKING
 from datetime import date
 from decimal import Decimal, InvalidOperation
 
-from src.services.core import (
-    svc_add_or_update_investment,
-    svc_delete_transaction,
-    svc_delete_investment,
-    svc_update_transaction,
+from src.services.async_core import (
+    svc_add_or_update_investment_async,
+    svc_delete_transaction_async,
+    svc_delete_investment_async,
+    svc_update_transaction_async,
 )
 
 print("===== CORRECT dialogs.py LOADED – TYPE_CHECKING is present =====")
 
 if TYPE_CHECKING:
-    from src.database import Transaction, Investment
+    from src.rows import TransactionRow, InvestmentRow
 
 
 def clean_decimal_input(value: str | None) -> Decimal:
@@ -42,7 +42,7 @@ def close_dialog(page: ft.Page):
 # ────────────────────────────────────────────────
 # TRANSACTION – Edit
 # ────────────────────────────────────────────────
-async def edit_transaction_dialog(page: ft.Page, transaction: Transaction, refresh_all):
+async def edit_transaction_dialog(page: ft.Page, transaction: TransactionRow, refresh_all):
     """
     Modern dialog using page.dialog + explicit open/close.
     Shows absolute amount + switch for income/expense.
@@ -70,7 +70,7 @@ async def edit_transaction_dialog(page: ft.Page, transaction: Transaction, refre
                 return
 
             # ── Save ─────────────────────────────────────────
-            svc_update_transaction(
+            await svc_update_transaction_async(
                 transaction_id=transaction.id,
                 category=category_dropdown.value,
                 amount=amount,
@@ -165,9 +165,9 @@ async def edit_transaction_dialog(page: ft.Page, transaction: Transaction, refre
 # ────────────────────────────────────────────────
 # TRANSACTION – Delete
 # ────────────────────────────────────────────────
-async def delete_transaction(page: ft.Page, transaction: Transaction, refresh_all):
+async def delete_transaction(page: ft.Page, transaction: TransactionRow, refresh_all):
     async def confirm_delete(e=None):
-        svc_delete_transaction(transaction.id)
+        await svc_delete_transaction_async(transaction.id)
         close_dialog(page)
         await page.show_snack("Transaction deleted", bgcolor="orange")
         if refresh_all:
@@ -196,10 +196,10 @@ async def delete_transaction(page: ft.Page, transaction: Transaction, refresh_al
 # ────────────────────────────────────────────────
 # INVESTMENT – Edit
 # ────────────────────────────────────────────────
-async def edit_investment_dialog(page: ft.Page, inv: Investment, refresh_all):
+async def edit_investment_dialog(page: ft.Page, inv: InvestmentRow, refresh_all):
     async def save_changes(e=None):
         try:
-            svc_add_or_update_investment(
+            await svc_add_or_update_investment_async(
                 name=name_field.value.strip() or "Unnamed Investment",
                 current_value=clean_decimal_input(current_field.value),
                 monthly=clean_decimal_input(monthly_field.value),
@@ -280,9 +280,9 @@ async def edit_investment_dialog(page: ft.Page, inv: Investment, refresh_all):
 # ────────────────────────────────────────────────
 # INVESTMENT – Delete
 # ────────────────────────────────────────────────
-async def delete_investment(page: ft.Page, inv: Investment, refresh_all):
+async def delete_investment(page: ft.Page, inv: InvestmentRow, refresh_all):
     async def confirm_delete(e=None):
-        svc_delete_investment(inv.id)
+        await svc_delete_investment_async(inv.id)
         close_dialog(page)
         await page.show_snack("Investment deleted", bgcolor="orange")
         if refresh_all:
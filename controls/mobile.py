@@ -1,6 +1,6 @@
 # controls/mobile.py
 import flet as ft
-from src.services.core import svc_get_balance
+from src.services.async_core import svc_get_balance_async
 
 def build_mobile_ui(page: ft.Page,
                     new_entry_tab,
@@ -10,14 +10,15 @@ def build_mobile_ui(page: ft.Page,
                     tags_insights_tab,
                     savings_brag_tab,
                     graphs_tab,
-                    settings_tab):
+                    settings_tab,
+                    on_tab_shown=None):
     balance_text = ft.Text(size=36, weight="bold", text_align="center")
 
-    def update_balance():
-        bal = svc_get_balance()
+    async def update_balance():
+        bal = await svc_get_balance_async()
         balance_text.value = f"R{bal:,.2f}"
         balance_text.color = "#07ff07" if bal >= 0 else "red"
-        page.update()
+        await page.safe_update()
 
     page.balance_updater = update_balance
 
@@ -61,6 +62,8 @@ def build_mobile_ui(page: ft.Page,
             content_stack.controls.append(graphs_tab)
         elif route == "/settings":
             content_stack.controls.append(settings_tab)
+        if on_tab_shown and content_stack.controls:
+            on_tab_shown(content_stack.controls[0])
         page.update()
 
     page.on_route_change = route_change
@@ -74,4 +77,4 @@ def build_mobile_ui(page: ft.Page,
 
     page.bottom_appbar = bottom_nav
     page.go(page.route or "/new")
-    update_balance()
+    page.run_task(update_balance)
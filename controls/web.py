@@ -1,6 +1,6 @@
 # controls/web.py
 import flet as ft
-from src.services.core import svc_get_balance
+from src.services.async_core import svc_get_balance_async
 
 def build_web_ui(page: ft.Page,
                  new_entry_tab,
@@ -10,14 +10,15 @@ def build_web_ui(page: ft.Page,
                  tags_insights_tab,
                  savings_brag_tab,
                  graphs_tab,
-                 settings_tab):
+                 settings_tab,
+                 on_tab_shown=None):
     balance_text = ft.Text(size=32, weight="bold")
 
-    def update_balance():
-        bal = svc_get_balance()
+    async def update_balance():
+        bal = await svc_get_balance_async()
         balance_text.value = f"R{bal:,.2f}"
         balance_text.color = "#07ff07" if bal >= 0 else "red"
-        page.update()
+        await page.safe_update()
 
     page.balance_updater = update_balance
 
@@ -27,10 +28,15 @@ def build_web_ui(page: ft.Page,
         balance_text,
     ], alignment="spaceBetween")
 
+    def on_tab_change(e):
+        if on_tab_shown:
+            on_tab_shown(tabs.tabs[e.control.selected_index].content)
+
     tabs = ft.Tabs(
         selected_index=0,
         expand=True,
         animation_duration=300,
+        on_change=on_tab_change,
         tabs=[
             ft.Tab(label="New", icon=ft.Icons.ADD_CIRCLE, content=new_entry_tab),
             ft.Tab(label="Diary", icon=ft.Icons.RECEIPT_LONG, content=diary_tab),
@@ -50,5 +56,7 @@ def build_web_ui(page: ft.Page,
             tabs,
         ], expand=True, spacing=0)
     )
+    if on_tab_shown:
+        on_tab_shown(tabs.tabs[tabs.selected_index].content)
 
-    update_balance()
+    page.run_task(update_balance)
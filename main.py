@@ -3,13 +3,22 @@ import flet as ft
 import logging
 import matplotlib
 import inspect
+import asyncio
+import threading
+import time
 
 matplotlib.use("Agg")
 
 from controls.common import init_page_extensions
 from src.services.settings import init_theme
-from ui.utils.flet_compat import pref_get, pref_set, safe_update
+from src.database import init_db
+from src.json_migration import start_json_migration
+from src.backup import start_backup_if_due
+from src.services.core import svc_on_write_behind_commit, svc_on_change
+from src.events import TransactionsChanged, DataReplaced
+from ui.utils.flet_compat import pref_get, pref_set
 from ui.utils.device_detect import detect_platform
+from ui.utils.refresh_scheduler import RefreshScheduler
 
 from controls.desktop import build_desktop_ui
 from controls.mobile import build_mobile_ui
@@ -23,6 +32,7 @@ from ui.sections.desktop.tags_insights_desktop import TagsInsightsTab
 from ui.sections.desktop.savings_brag_desktop import SavingsBragTab
 from ui.sections.desktop.graphs_desktop import GraphsTab
 from ui.sections.desktop.settings_desktop import SettingsTab
+from ui.components.lazy_tab import LazyTab
 
 
 # ---------------- LOGGING ---------------- #
@@ -41,15 +51,19 @@ def setup_logging():
 # ---------------- TABS ---------------- #
 
 def create_tabs(page, refresh_all=None):
+    # Placeholders: each tab is constructed when it is first shown (LazyTab)
     return [
-        NewEntryTab(page, refresh_all),
-        DiaryTab(page, refresh_all),
-        MonthlyTab(page, refresh_all),
-        InvestmentsTab(page, refresh_all),
-        TagsInsightsTab(page, refresh_all),
-        SavingsBragTab(page, refresh_all),
-        GraphsTab(page, refresh_all),
-        SettingsTab(page, refresh_all),
+        LazyTab(tab_class, page, refresh_all)
+        for tab_class in (
+            NewEntryTab,
+            DiaryTab,
+            MonthlyTab,
+            InvestmentsTab,
+            TagsInsightsTab,
+            SavingsBragTab,
+            GraphsTab,
+            SettingsTab,
+        )
     ]
 
 # ---------------- WINDOW ---------------- #
@@ -93,44 +107,100 @@ async def build_main_ui(page: ft.Page):
 
     await configure_window(page, layout_mode)
 
-    # Tabs
-    tabs_list = create_tabs(page)
-
-    # Refresh system
-    async def refresh_all():
-
-        if hasattr(page, "balance_updater"):
-            try:
-                page.balance_updater()
-            except Exception as ex:
-                logging.error(f"Balance update error: {ex}")
-
-        for tab in tabs_list:
-            if hasattr(tab, "refresh"):
-                try:
-                    result = tab.refresh()
-                    if inspect.isawaitable(result):
-                        await result
-                except Exception as ex:
-                    logging.error(f"Refresh error in {tab.__class__.__name__}: {ex}")
-
-        await safe_update(page)
-
+    # Refresh system: writes publish change events (src/events.py); each tab
+    # lists the ones it shows in CHANGE_EVENTS (no attribute: every event)
+    # and is marked stale when one arrives. Only the tab on screen refreshes
+    # straight away (refresh_all()); the others refresh when they are shown.
+    # The refreshes themselves are batched by the RefreshScheduler.
+    stale = {"balance": True, "tabs": set(), "since": None}
+    shown = {"tab": None}  # reported by the layout through on_tab_shown
+    stale_lock = threading.Lock()  # events arrive on the writer thread
+    scheduler = RefreshScheduler(page)
+    page.refresh_scheduler = scheduler  # for its stats in Settings
+
+    def on_change(event):
+        with stale_lock:
+            if stale["since"] is None:
+                stale["since"] = time.perf_counter()
+            if isinstance(event, (TransactionsChanged, DataReplaced)):
+                stale["balance"] = True
+            for tab in tabs_list:
+                if isinstance(event, getattr(tab, "CHANGE_EVENTS", object)):
+                    stale["tabs"].add(tab)
+
+    def take_stale(tab) -> bool:
+        # Caller holds stale_lock
+        if tab is None or tab not in stale["tabs"]:
+            return False
+        stale["tabs"].discard(tab)
+        return True
+
+    async def call(refresh):
+        result = refresh()
+        if inspect.isawaitable(result):
+            await result
+
+    def refresher(tab):
+        return lambda: call(getattr(tab, "refresh", lambda: None))
+
+    async def refresh_all(everything: bool = False):
+        with stale_lock:
+            if everything:
+                stale["balance"] = True
+                stale["tabs"].update(tabs_list)
+            targets = {}
+            if stale["balance"] and getattr(page, "balance_updater", None):
+                targets["balance"] = lambda: call(page.balance_updater)
+            stale["balance"] = False
+            if take_stale(shown["tab"]):
+                targets[shown["tab"]] = refresher(shown["tab"])
+            since, stale["since"] = stale["since"], None
+        await scheduler.request(targets, since)
+
+    async def show_tab(tab):
+        with stale_lock:
+            shown["tab"] = tab
+            due = take_stale(tab)
+        if due:
+            await scheduler.request({tab: refresher(tab)})
+
+    def on_tab_shown(tab):
+        page.run_task(show_tab, tab)
+
+    # Tabs, all stale until their first refresh (which constructs them)
     tabs_list = create_tabs(page, refresh_all)
+    stale["tabs"].update(tabs_list)
+    stop_listening = svc_on_change(on_change)
 
     # Platform UI
     if layout_mode == "mobile":
         page.route = "/diary"
-        build_mobile_ui(page, *tabs_list)
+        build_mobile_ui(page, *tabs_list, on_tab_shown=on_tab_shown)
 
     elif layout_mode == "desktop":
-        build_desktop_ui(page, *tabs_list)
+        build_desktop_ui(page, *tabs_list, on_tab_shown=on_tab_shown)
 
     else:
-        build_web_ui(page, *tabs_list)
+        build_web_ui(page, *tabs_list, on_tab_shown=on_tab_shown)
+
+    # Replays write-behind rows a crash left uncommitted before the first refresh;
+    # afterwards every batch commit refreshes the views it changed
+    stop_write_behind = await asyncio.to_thread(svc_on_write_behind_commit, lambda rows: page.run_task(refresh_all))
+
+    def on_close(e):
+        # web: the session ended; its page must not hear about later writes
+        stop_listening()
+        stop_write_behind()
+
+    page.on_close = on_close
 
     # Initial refresh
-    await refresh_all()
+    await refresh_all(everything=True)
+
+    # Old finance_diary.json import runs in the background; refresh once it added rows
+    start_json_migration(on_done=lambda inserted: inserted and page.run_task(refresh_all))
+    # Daily online backup, also off the event loop
+    start_backup_if_due()
 
     # Welcome
     if not pref_get(page, "seen_welcome", False):
@@ -146,10 +216,14 @@ async def build_main_ui(page: ft.Page):
 
 async def main(page: ft.Page):
 
+    # Open/migrate the database off the event loop while the window comes up
+    db_ready = asyncio.create_task(asyncio.to_thread(init_db))
+
     init_page_extensions(page)
 
     await init_theme(page)
 
+    await db_ready
     await build_main_ui(page)
 
 if __name__ == "__main__":
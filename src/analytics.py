@@ -0,0 +1,219 @@
+# src/analytics.py
+"""
+Time-series reports on pandas: spending per period, category x month
+pivots, rolling averages and year-on-year comparisons.
+
+pandas is imported on first use, not with this module, so importing the
+services (and starting the app) does not pay for it.
+
+transactions_frame() reads the rows with pd.read_sql in chunks, straight
+from storage values (ISO dates, integer cents), turns category and tags
+into categoricals per chunk and merges the categories at the end, so a
+long range never holds the whole table as Python strings. Money stays in
+integer cents inside the frames; the report functions at the bottom hand
+the UI Decimals in the usual row tuples.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy import Integer, String, func, select, type_coerce
+
+from .archive import archive_session
+from .database import ReadSession, Transaction, MonthlyRollup, archived_year_list
+from .rows import MonthTrend
+
+CHUNK_ROWS = 50_000
+ROLLING_MONTHS = 3
+
+
+def _pd():
+    import pandas as pd
+    return pd
+
+
+def _cents(value) -> Decimal:
+    return Decimal(int(round(value))).scaleb(-2)
+
+
+def _frame_query(from_date: date = None, to_date: date = None):
+    query = select(
+        type_coerce(Transaction.date, String).label("date"),
+        Transaction.category.label("category"),
+        type_coerce(Transaction.amount, Integer).label("amount"),
+        func.coalesce(type_coerce(Transaction.saved_amount, Integer), 0).label("saved"),
+        func.coalesce(Transaction.tags, "").label("tags"),
+    )
+    if from_date:
+        query = query.where(Transaction.date >= from_date)
+    if to_date:
+        query = query.where(Transaction.date <= to_date)
+    return query
+
+
+def _read_chunks(conn, statement, chunksize: int) -> list:
+    pd = _pd()
+    chunks = []
+    for chunk in pd.read_sql(statement, conn, chunksize=chunksize):
+        if chunk.empty:
+            # An empty result still yields one chunk, with untyped columns
+            continue
+        chunk["date"] = pd.to_datetime(chunk["date"], format="ISO8601")
+        chunk["category"] = chunk["category"].astype("category")
+        chunk["tags"] = chunk["tags"].astype("category")
+        chunks.append(chunk)
+    return chunks
+
+
+def transactions_frame(from_date: date = None, to_date: date = None, chunksize: int = CHUNK_ROWS):
+    """
+    Transactions in [from_date, to_date] (live and archived) as a DataFrame
+    with columns date, category, amount and saved (cents), tags; sorted by date.
+    """
+    pd = _pd()
+    statement = _frame_query(from_date, to_date)
+    with ReadSession() as db:
+        conn = db.connection()
+        chunks = _read_chunks(conn, statement, chunksize)
+        years = [
+            year for year in archived_year_list(conn)
+            if (not from_date or year >= from_date.year) and (not to_date or year <= to_date.year)
+        ]
+    for year in years:
+        with archive_session(year) as adb:
+            chunks.extend(_read_chunks(adb.connection(), statement, chunksize))
+    if not chunks:
+        return pd.DataFrame({
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "category": pd.Series(dtype="category"),
+            "amount": pd.Series(dtype="int64"),
+            "saved": pd.Series(dtype="int64"),
+            "tags": pd.Series(dtype="category"),
+        })
+
+    # Chunks carry their own category sets; merge them so concat keeps the dtype
+    for column in ("category", "tags"):
+        merged = pd.api.types.union_categoricals([c[column] for c in chunks]).categories
+        for chunk in chunks:
+            chunk[column] = chunk[column].cat.set_categories(merged)
+    frame = pd.concat(chunks, ignore_index=True)
+    return frame.sort_values("date", kind="stable", ignore_index=True)
+
+
+# -------------------------
+# Frame -> frame
+# -------------------------
+
+def period_totals(frame, freq: str = "MS"):
+    """
+    Income, expenses (positive), saved, net and row count per period
+    ("W", "MS", "QS", "YS", ... as for DataFrame.resample), in cents.
+    """
+    amounts = frame.set_index("date")["amount"]
+    periods = frame.assign(
+        income=amounts.clip(lower=0).to_numpy(),
+        expenses=(-amounts).clip(lower=0).to_numpy(),
+    ).set_index("date")
+    totals = periods.resample(freq).agg({"income": "sum", "expenses": "sum", "saved": "sum", "amount": "count"})
+    totals = totals.rename(columns={"amount": "count"})
+    totals["net"] = totals["income"] - totals["expenses"]
+    return totals
+
+
+def category_month_pivot(frame):
+    """Expenses (positive cents) per category x month; months as 'YYYY-MM' columns."""
+    expenses = frame[frame["amount"] < 0]
+    return expenses.pivot_table(
+        index="category",
+        columns=expenses["date"].dt.strftime("%Y-%m"),
+        values="amount",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,
+    ).mul(-1)
+
+
+def rolling_average(series, window: int = ROLLING_MONTHS):
+    """Mean over the last `window` periods (fewer at the start)."""
+    return series.rolling(window, min_periods=1).mean()
+
+
+def year_on_year(monthly):
+    """
+    For a month-start indexed series: the value 12 months earlier and the
+    change in percent (NaN where there is no earlier month or it was 0).
+    """
+    last_year = monthly.shift(12, freq="MS").reindex(monthly.index)
+    change = (monthly - last_year) / last_year.where(last_year != 0) * 100
+    return last_year, change
+
+
+# -------------------------
+# Reports for the UI
+# -------------------------
+
+def _months_back(today: date, months: int) -> date:
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _first_month() -> str | None:
+    """'YYYY-MM' of the oldest transaction, live or archived (the rollup keeps both)."""
+    with ReadSession() as db:
+        return db.scalar(select(func.min(MonthlyRollup.month)).where(MonthlyRollup.count > 0))
+
+
+def monthly_trends(months: int = 12, today: date = None) -> List[MonthTrend]:
+    """
+    The last `months` months, newest first: expenses, their rolling
+    ROLLING_MONTHS-month average, the same month a year earlier and the
+    change against it (None before the first month with transactions).
+    """
+    pd = _pd()
+    today = today or date.today()
+    # A year more than shown, for the comparison and the average's run-up
+    frame = transactions_frame(_months_back(today, months + 11), today)
+    if frame.empty:
+        return []
+    index = pd.date_range(end=pd.Timestamp(today.year, today.month, 1), periods=months + 12, freq="MS")
+    # A month without expenses is a 0 from the first month with any
+    # transactions on; before that it is missing (NaN), so last year's
+    # figure and the change stay None instead of comparing against 0
+    first = pd.Timestamp(f"{_first_month() or frame['date'].min().strftime('%Y-%m')}-01")
+    expenses = period_totals(frame, "MS")["expenses"].reindex(index)
+    expenses = expenses.where(index < first, expenses.fillna(0))
+    average = rolling_average(expenses).fillna(0)
+    last_year, change = year_on_year(expenses)
+    expenses = expenses.fillna(0)
+
+    trends = []
+    for month in index[-months:][::-1]:
+        previous = last_year[month]
+        trends.append(MonthTrend(
+            month.strftime("%Y-%m"),
+            _cents(expenses[month]),
+            _cents(average[month]),
+            None if pd.isna(previous) else _cents(previous),
+            None if pd.isna(change[month]) else round(float(change[month]), 1),
+        ))
+    return trends
+
+
+def category_pivot(months: int = 6, today: date = None) -> dict:
+    """
+    {"months": ['YYYY-MM', ...] oldest first,
+     "rows": [(category, [Decimal per month]), ...] by total, largest first}
+    for the last `months` months.
+    """
+    pd = _pd()
+    today = today or date.today()
+    frame = transactions_frame(_months_back(today, months - 1), today)
+    labels = [m.strftime("%Y-%m") for m in pd.date_range(end=pd.Timestamp(today.year, today.month, 1), periods=months, freq="MS")]
+    if frame.empty:
+        return {"months": labels, "rows": []}
+    pivot = category_month_pivot(frame).reindex(columns=labels, fill_value=0)
+    pivot = pivot.loc[pivot.sum(axis=1).sort_values(ascending=False, kind="stable").index]
+    return {
+        "months": labels,
+        "rows": [(str(category), [_cents(v) for v in values]) for category, values in zip(pivot.index, pivot.to_numpy())],
+    }
@@ -0,0 +1,208 @@
+# src/archive.py
+"""
+Cold-year archival.
+
+archive_year(year) moves every transaction of a closed year out of the live
+transactions table into data/archive/finance_<year>.db, which has the same
+tables (transactions, tags, transaction_tags) plus its own FTS index. Years
+are archived oldest first, so the live table always holds a suffix of the
+history and archive files never interleave with it.
+
+What stays live, so day-to-day queries never open an archive file:
+  - monthly_rollup rows of archived months (monthly summary, graphs);
+  - archived_years: row count, closing balance and saved total per year.
+    The closing balance of the newest archived year is the opening balance
+    of the live running balances; live rows keep their stored balances.
+
+Reads that cover an archived year (diary paging past the live rows, date
+ranges, balance as of an old date, tag summary of an old month, search)
+attach just that year's file with archive_session(). Archived rows are
+read-only: writes dated in or before the last archived year are refused.
+"""
+import os
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import events
+from .database import (
+    DB_PATH,
+    Base,
+    Transaction,
+    Tag,
+    ArchivedYear,
+    transaction_tags,
+    archived_year_list,
+    init_db,
+    get_read_engine,
+)
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "archive")
+ARCHIVE_TABLES = [Transaction.__table__, Tag.__table__, transaction_tags]
+_COLUMNS = "id, date, category, amount, description, account, tags, saved_amount, running_balance"
+
+
+def archive_path(year: int) -> str:
+    return os.path.join(ARCHIVE_DIR, f"finance_{year}.db")
+
+
+def _year_bounds(year: int) -> dict:
+    return {"start": date(year, 1, 1).isoformat(), "end": date(year + 1, 1, 1).isoformat()}
+
+
+@contextmanager
+def archive_session(year: int):
+    """
+    Read-only Session over one archived year. The file is ATTACHed to a
+    connection from the read pool for the duration and every table the ORM
+    or a query builder names is redirected to it, so the usual queries work
+    unchanged.
+    """
+    path = archive_path(year)
+    if not os.path.exists(path):
+        # ATTACH would quietly create an empty file instead
+        raise FileNotFoundError(f"Archive for {year} is missing: {path}")
+
+    alias = f"archive_{year}"
+    init_db()
+    with get_read_engine().connect() as conn:
+        conn.exec_driver_sql(f"ATTACH DATABASE ? AS {alias}", (path,))
+        try:
+            with Session(bind=conn.execution_options(schema_translate_map={None: alias})) as db:
+                yield db
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"DETACH DATABASE {alias}")
+
+
+def archive_year(year: int) -> dict:
+    """
+    Move `year`'s transactions into its archive file. The year must be over
+    and be the oldest year still in the live table. The file is written and
+    committed first; the live rows are only deleted, and archived_years
+    filled in, once it is complete, so an interrupted run can simply be
+    repeated. Returns the archived_years row as a dict.
+    """
+    if year >= date.today().year:
+        raise ValueError(f"{year} is not over yet")
+
+    engine = init_db()
+    bounds = _year_bounds(year)
+    with engine.connect() as conn:
+        if year in archived_year_list(conn):
+            raise ValueError(f"{year} is already archived")
+        oldest = conn.execute(text("SELECT MIN(date) FROM transactions")).scalar()
+        if oldest is None or oldest >= bounds["end"]:
+            raise ValueError(f"No live transactions in {year}")
+        if oldest < bounds["start"]:
+            raise ValueError(f"Archive {oldest[:4]} first: years are archived oldest first")
+
+    # Rows the write-behind queue acknowledged for this year go in first
+    from .write_behind import get_write_behind_queue  # it imports models, which imports this module
+    with get_write_behind_queue().held_back(year):
+        _move_rows(engine, year, bounds)
+    events.publish(events.TransactionsChanged(frozenset(f"{year:04d}-{month:02d}" for month in range(1, 13))))
+
+    with Session(engine) as db:
+        row = db.get(ArchivedYear, year)
+        return {
+            "year": row.year,
+            "file": row.file,
+            "row_count": row.row_count,
+            "closing_balance": row.closing_balance,
+            "saved": row.saved,
+        }
+
+
+def _move_rows(engine, year: int, bounds: dict):
+    """archive_year's two transactions: write the archive file, then drop the live rows."""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    # AUTOCOMMIT: explicit BEGIN/COMMIT, so the archive DDL is transactional too
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (archive_path(year),))
+        try:
+            # 1 Write the archive file (replacing whatever a failed run left)
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                archive_conn = conn.execution_options(schema_translate_map={None: "archive"})
+                Base.metadata.create_all(archive_conn, tables=ARCHIVE_TABLES)
+                conn.exec_driver_sql("DROP TABLE IF EXISTS archive.transactions_fts")
+                for table in ("transaction_tags", "transactions", "tags"):
+                    conn.exec_driver_sql(f"DELETE FROM archive.{table}")
+
+                conn.execute(text(f"""
+                    INSERT INTO archive.transactions ({_COLUMNS})
+                    SELECT {_COLUMNS} FROM main.transactions
+                    WHERE date >= :start AND date < :end
+                """), bounds)
+                conn.exec_driver_sql("""
+                    INSERT INTO archive.tags (id, name)
+                    SELECT id, name FROM main.tags WHERE id IN (
+                        SELECT tag_id FROM main.transaction_tags
+                        WHERE transaction_id IN (SELECT id FROM archive.transactions)
+                    )
+                """)
+                conn.exec_driver_sql("""
+                    INSERT INTO archive.transaction_tags (transaction_id, tag_id, position)
+                    SELECT transaction_id, tag_id, position FROM main.transaction_tags
+                    WHERE transaction_id IN (SELECT id FROM archive.transactions)
+                """)
+                # Same index definition as the live one; nothing writes to the file
+                # afterwards, so it needs no triggers
+                conn.exec_driver_sql("""
+                    CREATE VIRTUAL TABLE archive.transactions_fts USING fts5(
+                        description, category, tags,
+                        content='transactions', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                conn.exec_driver_sql("INSERT INTO archive.transactions_fts (transactions_fts) VALUES ('rebuild')")
+                conn.exec_driver_sql("COMMIT")
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+
+            # 2 Drop the rows from the live database and record the year
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                row_count, saved, live_count = conn.execute(text("""
+                    SELECT COUNT(*), COALESCE(SUM(saved_amount), 0),
+                           (SELECT COUNT(*) FROM main.transactions WHERE date >= :start AND date < :end)
+                    FROM archive.transactions
+                """), bounds).one()
+                if row_count != live_count:
+                    raise RuntimeError(f"Archive for {year} has {row_count} rows, live table {live_count}")
+                closing = conn.exec_driver_sql(
+                    "SELECT running_balance FROM archive.transactions ORDER BY date DESC, id DESC LIMIT 1"
+                ).scalar()
+
+                # Tag links explicitly, so this does not depend on the
+                # connection enforcing foreign keys (a per-connection pragma)
+                # for the ON DELETE CASCADE. FTS entries go with the rows (trigger).
+                conn.execute(text("""
+                    DELETE FROM main.transaction_tags WHERE transaction_id IN (
+                        SELECT id FROM main.transactions WHERE date >= :start AND date < :end
+                    )
+                """), bounds)
+                conn.execute(text(
+                    "DELETE FROM main.transactions WHERE date >= :start AND date < :end"
+                ), bounds)
+                record = {
+                    "year": year,
+                    "file": os.path.basename(archive_path(year)),
+                    "row_count": row_count,
+                    "closing_balance": closing,
+                    "saved": saved,
+                }
+                conn.execute(text("""
+                    INSERT INTO main.archived_years (year, file, row_count, closing_balance, saved)
+                    VALUES (:year, :file, :row_count, :closing_balance, :saved)
+                """), record)
+                conn.exec_driver_sql("COMMIT")
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+        finally:
+            conn.exec_driver_sql("DETACH DATABASE archive")
@@ -0,0 +1,226 @@
+# src/backup.py
+"""
+Online backups of the app database.
+
+A plain file copy of data/finance.db can tear while the app is writing (and
+misses whatever still sits in the -wal file). backup_database() uses
+SQLite's online backup API instead: it copies PAGES_PER_STEP pages at a
+time, releasing the database (and the GIL) between steps, so it can run on
+a background thread while the app keeps reading and writing. Every backup
+is written to a .tmp file, checked with PRAGMA integrity_check and only then
+renamed into data/backups/, so a file there is always complete. The newest
+KEEP_BACKUPS are kept.
+
+If another connection writes while a backup is under way SQLite restarts it
+from the first page; after MAX_RESTARTS the rest is copied in a single step
+(one read transaction, which in WAL mode does not block writers).
+
+The per-year archive files (src/archive.py) never change once written, so
+each is copied into data/backups/archive/ the first time a backup sees it.
+
+restore_backup() checks the chosen backup, takes a "pre-restore" backup of
+the current database, then copies the backup over it with the same API.
+"""
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+from urllib.request import pathname2url
+
+from . import columnar, events
+from .archive import ARCHIVE_DIR
+from .database import DB_PATH, reset_db
+
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "backups")
+KEEP_BACKUPS = 7
+BACKUP_INTERVAL_S = 24 * 3600     # start_backup_if_due: at most one automatic backup a day
+PAGES_PER_STEP = 1024             # 4 MB with the default 4 KB page size
+STEP_SLEEP_S = 0.001              # pause between steps, lets writers in
+MAX_RESTARTS = 3
+BUSY_TIMEOUT_S = 5
+
+_lock = threading.Lock()
+
+
+class _Restarted(Exception):
+    pass
+
+
+def _copy(source_path: str, dest_path: str, pages: int, sleep: float,
+          progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Copy source_path onto dest_path with the backup API. Returns how many
+    times SQLite restarted the copy because the source changed.
+    """
+    restarts, last_remaining = 0, None
+
+    def on_step(_status, remaining, total):
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts >= MAX_RESTARTS:
+                raise _Restarted()
+        last_remaining = remaining
+        if progress is not None:
+            progress(total - remaining, total)
+
+    source = sqlite3.connect(source_path, timeout=BUSY_TIMEOUT_S)
+    dest = sqlite3.connect(dest_path, timeout=BUSY_TIMEOUT_S)
+    try:
+        try:
+            source.backup(dest, pages=pages, progress=on_step, sleep=sleep)
+        except _Restarted:
+            logging.info(f"Backup of {source_path} kept restarting; copying the rest in one step")
+            source.backup(dest, pages=-1)
+    finally:
+        dest.close()
+        source.close()
+    return restarts
+
+
+def integrity_check(path: str) -> str:
+    """PRAGMA integrity_check of `path`: "ok", or the first problems it reports."""
+    # Percent-encoded, or a '?', '#' or '%' in the path would open another file
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return "\n".join(r[0] for r in rows[:10])
+
+
+def _backup_name(label: str = "") -> str:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"finance-{stamp}{'-' + label if label else ''}.db"
+
+
+def list_backups() -> List[dict]:
+    """Backups in BACKUP_DIR, newest first."""
+    paths = glob.glob(os.path.join(BACKUP_DIR, "finance-*.db"))
+    return [
+        {
+            "path": path,
+            "created": datetime.fromtimestamp(os.path.getmtime(path)),
+            "size": os.path.getsize(path),
+        }
+        for path in sorted(paths, key=os.path.getmtime, reverse=True)
+    ]
+
+
+def rotate_backups(keep: int = KEEP_BACKUPS) -> List[str]:
+    """Delete all but the newest `keep` backups. Returns the deleted paths."""
+    removed = [b["path"] for b in list_backups()[keep:]]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def _backup_archives():
+    target_dir = os.path.join(BACKUP_DIR, "archive")
+    for path in glob.glob(os.path.join(ARCHIVE_DIR, "finance_*.db")):
+        target = os.path.join(target_dir, os.path.basename(path))
+        if os.path.exists(target):
+            continue
+        os.makedirs(target_dir, exist_ok=True)
+        _copy(path, target + ".tmp", -1, 0)
+        os.replace(target + ".tmp", target)
+
+
+def backup_database(
+    label: str = "",
+    pages_per_step: int = PAGES_PER_STEP,
+    sleep: float = STEP_SLEEP_S,
+    keep: Optional[int] = KEEP_BACKUPS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Write a verified backup of DB_PATH into BACKUP_DIR, then keep only the
+    newest `keep` (None: delete nothing).
+    progress(done_pages, total_pages) is called after every step.
+    Returns {"path", "size", "seconds", "restarts"}. Raises RuntimeError when
+    the copy fails integrity_check (the copy is deleted).
+    """
+    with _lock:
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        path = os.path.join(BACKUP_DIR, _backup_name(label))
+        tmp_path = path + ".tmp"
+
+        started = time.perf_counter()
+        try:
+            restarts = _copy(DB_PATH, tmp_path, pages_per_step, sleep, progress)
+            result = integrity_check(tmp_path)
+            if result != "ok":
+                raise RuntimeError(f"Backup failed integrity_check: {result}")
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        seconds = time.perf_counter() - started
+
+        _backup_archives()
+        if keep is not None:
+            rotate_backups(keep)
+
+    logging.info(f"Backup written: {path} ({seconds:.1f}s)")
+    return {"path": path, "size": os.path.getsize(path), "seconds": seconds, "restarts": restarts}
+
+
+def restore_backup(path: str) -> dict:
+    """
+    Replace the app database with the backup at `path`. The current database
+    is backed up first (label "pre-restore"); returns that backup's dict.
+    The engine is reset, so the next query re-runs the schema migrations
+    (the backup may be from an older version).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No backup at {path}")
+    result = integrity_check(path)
+    if result != "ok":
+        raise RuntimeError(f"{path} failed integrity_check: {result}")
+
+    # No rotation here: it could delete the very backup being restored
+    safety = backup_database(label="pre-restore", keep=None)
+    with _lock:
+        _copy(path, DB_PATH, -1, 0)
+        reset_db()
+        columnar.invalidate()
+    events.publish(events.DataReplaced())
+    logging.info(f"Database restored from {path}")
+    return safety
+
+
+def last_backup_time() -> Optional[datetime]:
+    backups = list_backups()
+    return backups[0]["created"] if backups else None
+
+
+def start_backup(on_done: Optional[Callable[[dict], None]] = None) -> threading.Thread:
+    """
+    Run backup_database on a daemon thread. `on_done(result)` is called from
+    that thread when it finishes; failures are logged.
+    """
+    def run():
+        try:
+            result = backup_database()
+        except Exception as ex:
+            logging.error(f"Backup failed: {ex}")
+            return
+        if on_done is not None:
+            on_done(result)
+
+    thread = threading.Thread(target=run, name="db-backup", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_backup_if_due(on_done: Optional[Callable[[dict], None]] = None) -> Optional[threading.Thread]:
+    """start_backup() when the newest backup is older than BACKUP_INTERVAL_S (or there is none)."""
+    last = last_backup_time()
+    if last is not None and (datetime.now() - last).total_seconds() < BACKUP_INTERVAL_S:
+        return None
+    return start_backup(on_done)
@@ -0,0 +1,359 @@
+# src/columnar.py
+"""
+Optional in-memory columnar copy of the transactions, for analytics.
+
+Every transaction (live and archived) is held once as NumPy columns sorted
+by (date, id):
+
+    ids         int64
+    days        int32, days since 1970-01-01
+    months      int32, months since 1970-01
+    amounts     int64 cents
+    saved       int64 cents
+    categories  int32 code into category_names
+    tags        uint64 bitset per row; bit k of word k // 64 is tag_names[k]
+
+Balance, balance as of a date, total saved, the monthly summary and the
+tag/category summaries are then a searchsorted, a cumulative sum or a
+reduceat over those arrays instead of an SQL round trip each.
+
+The store is loaded once, on a background thread, by the first get_store()
+call; until it is ready get_store() returns None and callers use their SQL
+path. Afterwards the write functions in src/models.py report what they
+changed with track_insert()/track_delete(), and the changes are applied to
+the arrays when their session commits (dropped on rollback), so the copy
+never needs a reload. Replacing the database file (backup restore) calls
+invalidate().
+
+The store is opt-in: MORNINGMONEY_COLUMNAR=1 turns it on (NumPy required).
+Otherwise get_store() always returns None and the reads use monthly_rollup
+and the stored running balances as usual. It is off by default because it
+holds the archived years too: loading it opens every archive file, which
+day-to-day queries otherwise never do (src/archive.py).
+"""
+import logging
+import os
+import threading
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Integer, String, event, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from .archive import archive_session
+from .database import ReadSession, Transaction, archived_year_list, split_tags
+from .rows import MonthSummary, TagTotal, CategoryTotal
+
+try:
+    import numpy as np
+except ImportError:  # analytics stay on SQL
+    np = None
+
+ENABLED = np is not None and os.environ.get("MORNINGMONEY_COLUMNAR", "0") == "1"
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _day(value: date) -> int:
+    return value.toordinal() - _EPOCH
+
+
+def _month_label(month: int) -> str:
+    return f"{1970 + month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def _cents(value) -> Decimal:
+    return Decimal(int(value)).scaleb(-2)
+
+
+class ColumnarStore:
+    """The column arrays plus the code tables; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ids = np.empty(0, np.int64)
+        self.days = np.empty(0, np.int32)
+        self.months = np.empty(0, np.int32)
+        self.amounts = np.empty(0, np.int64)
+        self.saved = np.empty(0, np.int64)
+        self.categories = np.empty(0, np.int32)
+        self.tags = np.zeros((0, 1), np.uint64)
+        self.category_names: List[str] = []
+        self.tag_names: List[str] = []
+        self._category_codes = {}
+        self._tag_bits = {}
+        self._cache = {}  # derived arrays (running sum, per-month totals), rebuilt after a change
+
+    # ---- building ----
+
+    @classmethod
+    def load(cls) -> "ColumnarStore":
+        """Read every live and archived transaction into a new store."""
+        statement = select(
+            Transaction.id,
+            # Raw storage values: ISO text and integer cents, no Decimal/date processing
+            type_coerce(Transaction.date, String),
+            type_coerce(Transaction.amount, Integer),
+            func.coalesce(type_coerce(Transaction.saved_amount, Integer), 0),
+            Transaction.category,
+            Transaction.tags,
+        )
+        # Core execution on the connection: plain tuples, no ORM result processing
+        with ReadSession() as db:
+            conn = db.connection()
+            rows = conn.execute(statement).fetchall()
+            years = archived_year_list(conn)
+        for year in years:
+            with archive_session(year) as adb:
+                rows.extend(adb.connection().execute(statement))
+        store = cls()
+        store._insert(rows)
+        return store
+
+    def _encode(self, rows) -> dict:
+        """Raw rows (id, ISO date, cents, saved cents, category, tags) -> column arrays."""
+        ids, dates, amounts, saved, categories, tags = zip(*rows)
+        days = np.array(dates, dtype="datetime64[D]")
+
+        # Category and tag strings repeat a lot: encode each distinct one once
+        codes = {name: self._category_code(name) for name in set(categories)}
+        distinct_tags = {raw: split_tags(raw) for raw in set(tags)}
+        for names in distinct_tags.values():
+            for name in names:
+                self._tag_bit(name)
+        words = {}
+        for raw, names in distinct_tags.items():
+            row = [0] * self.tags.shape[1]
+            for name in names:
+                bit = self._tag_bits[name]
+                row[bit >> 6] |= 1 << (bit & 63)
+            words[raw] = row
+
+        return {
+            "ids": np.array(ids, np.int64),
+            "days": days.astype(np.int32),
+            "months": days.astype("datetime64[M]").astype(np.int32),
+            "amounts": np.array(amounts, np.int64),
+            "saved": np.array([value or 0 for value in saved], np.int64),
+            "categories": np.array([codes[name] for name in categories], np.int32),
+            "tags": np.array([words[raw] for raw in tags], np.uint64).reshape(len(rows), self.tags.shape[1]),
+        }
+
+    def _category_code(self, name: str) -> int:
+        code = self._category_codes.get(name)
+        if code is None:
+            code = self._category_codes[name] = len(self.category_names)
+            self.category_names.append(name)
+        return code
+
+    def _tag_bit(self, name: str) -> int:
+        bit = self._tag_bits.get(name)
+        if bit is None:
+            bit = self._tag_bits[name] = len(self.tag_names)
+            self.tag_names.append(name)
+            if bit >> 6 >= self.tags.shape[1]:
+                self.tags = np.hstack([self.tags, np.zeros((len(self.tags), 1), np.uint64)])
+        return bit
+
+    def _keys(self, days, ids):
+        return (days.astype(np.int64) << 32) | ids
+
+    def _insert(self, rows):
+        if not rows:
+            return
+        new = self._encode(rows)
+        order = np.lexsort((new["ids"], new["days"]))
+        new = {name: column[order] for name, column in new.items()}
+        names = ("ids", "days", "months", "amounts", "saved", "categories", "tags")
+        if not len(self.ids) or self._keys(new["days"][:1], new["ids"][:1])[0] > self._keys(self.days[-1:], self.ids[-1:])[0]:
+            # The usual case: newer than everything held, so just append
+            for name in names:
+                setattr(self, name, np.concatenate([getattr(self, name), new[name]]))
+        else:
+            at = np.searchsorted(self._keys(self.days, self.ids), self._keys(new["days"], new["ids"]))
+            for name in names:
+                setattr(self, name, np.insert(getattr(self, name), at, new[name], axis=0))
+        self._cache.clear()
+
+    def _delete(self, ids):
+        keep = ~np.isin(self.ids, np.fromiter(ids, np.int64))
+        for name in ("ids", "days", "months", "amounts", "saved", "categories", "tags"):
+            setattr(self, name, getattr(self, name)[keep])
+        self._cache.clear()
+
+    def apply(self, changes):
+        """Apply tracked ("insert", rows) / ("delete", ids) changes in order."""
+        with self._lock:
+            for kind, payload in changes:
+                if kind == "insert":
+                    self._insert(payload)
+                else:
+                    self._delete(payload)
+
+    # ---- queries ----
+
+    def _search(self, value: date, side: str = "left") -> int:
+        # An int32 needle, or NumPy would cast the whole column to int64 first
+        return int(np.searchsorted(self.days, np.int32(_day(value)), side=side))
+
+    def _range(self, start: date = None, end: date = None) -> slice:
+        """Rows with start <= date < end (either bound optional)."""
+        return slice(self._search(start) if start else 0, self._search(end) if end else len(self.days))
+
+    def _cached(self, name: str, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def balance(self, as_of: date = None) -> Decimal:
+        with self._lock:
+            cumulative = self._cached("cumulative", lambda: np.cumsum(self.amounts))
+            n = len(self.days) if as_of is None else self._search(as_of, "right")
+            return _cents(cumulative[n - 1]) if n else Decimal("0.00")
+
+    def total_saved(self) -> Decimal:
+        with self._lock:
+            return _cents(self._cached("saved", self.saved.sum))
+
+    def _monthly(self) -> List[MonthSummary]:
+        """Every month, newest first."""
+        if not len(self.months):
+            return []
+        # Rows are in date order, so every month is one contiguous run
+        starts = np.flatnonzero(np.diff(self.months, prepend=self.months[0] - 1))
+        income = np.add.reduceat(np.maximum(self.amounts, 0), starts)
+        expenses = np.add.reduceat(np.maximum(-self.amounts, 0), starts)
+        saved = np.add.reduceat(self.saved, starts)
+        counts = np.diff(np.append(starts, len(self.months)))
+        months = self.months[starts]
+        return [
+            MonthSummary(_month_label(months[i]), _cents(income[i]), _cents(expenses[i]), _cents(saved[i]), int(counts[i]))
+            for i in range(len(starts) - 1, -1, -1)
+        ]
+
+    def monthly_summary(self, limit: int | None = 24) -> List[MonthSummary]:
+        """Newest month first, like get_monthly_summary."""
+        with self._lock:
+            months = self._cached("monthly", self._monthly)
+        return months[:limit] if limit else list(months)
+
+    def _month_expenses(self, start: date, end: date):
+        rows = self._range(start, end)
+        expense = self.amounts[rows] < 0
+        return -self.amounts[rows][expense], rows, expense
+
+    def tag_summary(self, start: date, end: date) -> List[TagTotal]:
+        """Expenses per tag for start <= date < end, largest first (like get_tag_summary)."""
+        with self._lock:
+            spent, rows, expense = self._month_expenses(start, end)
+            bits = self.tags[rows][expense]
+            totals = []
+            for name, bit in self._tag_bits.items():
+                tagged = (bits[:, bit >> 6] >> np.uint64(bit & 63)) & np.uint64(1)
+                if tagged.any():
+                    totals.append(TagTotal(name, _cents(spent[tagged.astype(bool)].sum())))
+        return sorted(totals, key=lambda t: (-t.total, t.tag))
+
+    def category_summary(self, start: date, end: date) -> List[CategoryTotal]:
+        """Expenses per category for start <= date < end, largest first."""
+        with self._lock:
+            spent, rows, expense = self._month_expenses(start, end)
+            codes = self.categories[rows][expense]
+            totals = np.zeros(len(self.category_names), np.int64)
+            np.add.at(totals, codes, spent)
+            present = np.bincount(codes, minlength=len(self.category_names)) > 0
+            names = self.category_names
+        return sorted(
+            (CategoryTotal(names[code], _cents(totals[code])) for code in np.flatnonzero(present)),
+            key=lambda c: (-c.total, c.category),
+        )
+
+
+# ---- the app's store ----
+
+_store: Optional[ColumnarStore] = None
+_loading = False
+_stale = False  # a commit landed while loading; load again
+_state_lock = threading.Lock()
+
+
+def get_store() -> Optional[ColumnarStore]:
+    """The loaded store, or None (disabled, or still loading: use SQL)."""
+    if not ENABLED:
+        return None
+    if _store is not None:
+        return _store
+    _start_loading()
+    return None
+
+
+def _start_loading():
+    global _loading, _stale
+    with _state_lock:
+        if _loading or _store is not None:
+            return
+        _loading, _stale = True, False
+    threading.Thread(target=_load, name="columnar-load", daemon=True).start()
+
+
+def _load():
+    global _store, _loading, _stale
+    while True:
+        try:
+            store = ColumnarStore.load()
+        except Exception as ex:
+            logging.error(f"Columnar store load failed: {ex}")
+            with _state_lock:
+                _loading = False
+            return
+        with _state_lock:
+            if not _stale:
+                _store, _loading = store, False
+                return
+            _stale = False
+
+
+def invalidate():
+    """Drop the store (the database file was replaced); the next get_store() reloads."""
+    global _store, _stale
+    with _state_lock:
+        _store = None
+        _stale = True
+
+
+def _track(db, change):
+    if ENABLED:
+        db.info.setdefault("columnar", []).append(change)
+
+
+def track_insert(db, rows: Iterable[tuple]):
+    """Record rows (id, ISO date, cents, saved cents, category, tags) inserted in `db`."""
+    if ENABLED:
+        _track(db, ("insert", list(rows)))
+
+
+def track_delete(db, ids: Iterable[int]):
+    """Record transactions deleted in `db`."""
+    _track(db, ("delete", list(ids)))
+
+
+# First in line, so the copy is current before change events go out (src/events.py)
+@event.listens_for(Session, "after_commit", insert=True)
+def _apply_tracked(session):
+    global _stale
+    changes = session.info.pop("columnar", None)
+    if not changes:
+        return
+    with _state_lock:
+        store = _store
+        if store is None:
+            # A load in progress may have read before this commit
+            _stale = _stale or _loading
+            return
+    store.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_tracked(session):
+    session.info.pop("columnar", None)
@@ -1,39 +1,270 @@
 # src/database.py
 import os
+import sqlite3
+import threading
 from datetime import date
-from decimal import Decimal
-# Import TypeDecorator to ensure SQLite handles Decimals as strings/floats correctly
-# SQLite does not have a native DECIMAL type. Defaults to storing values as floats anyway.
-from sqlalchemy.types import Numeric
-from sqlalchemy import create_engine, Column, Integer, String, Date
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy.types import Numeric, TypeDecorator
+from sqlalchemy import create_engine, event, text, Column, Integer, String, Date, Index, Table, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, relationship
+from urllib.request import pathname2url
 
 # A Quick Tip on SQLite
-# SQLite is "type-less." It will store these numbers as floating-point values internally.
-# However, because you are now using SQLAlchemy's Numeric type, the library will automatically 
-# convert those values back into Python Decimal objects whenever you query the database, 
-# preserving your precision during calculations in your app.
+# SQLite is "type-less" and has no DECIMAL: Numeric columns end up stored as
+# floats. Transaction money is therefore stored as integer cents (see Cents
+# below), so SUMs are exact integer maths inside SQLite and values only turn
+# into Decimal when they leave the database.
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-DB_PATH = os.path.join(BASE_DIR, "data", "finance.db")
-os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+# MORNINGMONEY_DB lets scripts and benchmarks point the app at a scratch database
+DB_PATH = os.environ.get("MORNINGMONEY_DB") or os.path.join(BASE_DIR, "data", "finance.db")
 
-engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
-SessionLocal = sessionmaker(bind=engine, future=True)
+# Engine profiles
+# Each profile is a set of PRAGMAs applied to every new SQLite connection plus
+# the pool settings for the engine. "tuned" is the default; "legacy" keeps
+# SQLite's stock settings and is only kept around as a benchmark baseline.
+# REQUIRED_PRAGMAS are not tuning and apply under every profile.
+REQUIRED_PRAGMAS = {
+    # SQLite leaves foreign keys unenforced unless asked, per connection; the
+    # ON DELETE CASCADEs (transaction_tags) depend on it
+    "foreign_keys": "ON",
+}
+ENGINE_PROFILES = {
+    "tuned": {
+        "pragmas": {
+            # WAL lets readers keep going while a writer commits (web mode has several sessions)
+            "journal_mode": "WAL",
+            # NORMAL is durable in WAL mode except for the last commit on power loss
+            "synchronous": "NORMAL",
+            "cache_size": -64000,       # negative = KiB, so ~64 MB page cache per connection
+            "mmap_size": 268435456,     # 256 MB memory-mapped reads
+            "temp_store": "MEMORY",
+        },
+        "busy_timeout_ms": 5000,
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "legacy": {
+        "pragmas": {},
+        "busy_timeout_ms": 5000,
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+}
+DEFAULT_ENGINE_PROFILE = os.environ.get("MORNINGMONEY_DB_PROFILE", "tuned")
+
+
+def make_engine(db_path: str = DB_PATH, profile: str = DEFAULT_ENGINE_PROFILE, read_only: bool = False):
+    """
+    Build an engine for `db_path` using one of ENGINE_PROFILES.
+    PRAGMAs are per-connection in SQLite, so they are applied on every connect.
+    read_only: open the file with mode=ro and PRAGMA query_only, for the read
+    pool; the database must already exist (and be in WAL mode to read while
+    the writer commits).
+    """
+    settings = ENGINE_PROFILES[profile]
+    busy_timeout_ms = settings["busy_timeout_ms"]
+    pragmas = {**REQUIRED_PRAGMAS, **settings["pragmas"]}
+    url = f"sqlite:///{db_path}"
+    # Pooled connections are shared between the Flet event loop and worker threads
+    connect_args = {"check_same_thread": False, "timeout": busy_timeout_ms / 1000}
+    options = {}
+    if read_only:
+        # journal_mode is a property of the file; a read-only connection cannot set it
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+        # mode=ro needs a file: URI. The path goes in percent-encoded, or a
+        # '#', '?', '%' or space in it would point SQLite at another file; a
+        # creator keeps SQLAlchemy's URL parsing from decoding it again.
+        uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+        options["creator"] = lambda: sqlite3.connect(uri, uri=True, **connect_args)
+
+    new_engine = create_engine(
+        url,
+        future=True,
+        connect_args=connect_args,
+        **options,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_pre_ping=False,
+    )
+
+    @event.listens_for(new_engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return new_engine
+
+
+# Nothing touches the disk at import time. The engine is built and the schema
+# checked/migrated on first use (get_engine / init_db / SessionLocal), or up
+# front from a background startup task (see main.py).
+# Two engines share the file: get_engine() for writes, which src/db_writer.py
+# runs one at a time on its own thread, and get_read_engine(), a pool of
+# read-only connections for queries (ReadSession).
+_engine = None
+_read_engine = None
+_db_ready = False
+_init_lock = threading.RLock()
+_Session = sessionmaker(future=True)
+
+def get_engine():
+    """The app engine for DB_PATH, created on first call. Does not touch the schema."""
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
+                _engine = make_engine()
+    return _engine
+
+def get_read_engine():
+    """The read-only query pool for DB_PATH, created on first call (after init_db)."""
+    global _read_engine
+    if _read_engine is None:
+        with _init_lock:
+            if _read_engine is None:
+                _read_engine = make_engine(read_only=True)
+    return _read_engine
+
+def init_db():
+    """
+    Bring the schema up to date (src/migrations.py), once per process.
+    Thread-safe; later calls return immediately.
+    """
+    global _db_ready
+    if _db_ready:
+        return get_engine()
+    with _init_lock:
+        if not _db_ready:
+            from .migrations import migrate  # the steps import the models below
+            migrate(get_engine())
+            _db_ready = True
+    return get_engine()
+
+def SessionLocal():
+    """New ORM session on the initialized app database, for writes."""
+    return _Session(bind=init_db())
+
+def ReadSession():
+    """New ORM session on the read-only pool. Anything that writes raises."""
+    init_db()
+    return _Session(bind=get_read_engine())
+
+def reset_db():
+    """
+    Close the pooled connections and forget that the schema was checked, so
+    the next init_db() migrates again. Used after the file was replaced
+    underneath the engine (src/backup.py restore).
+    """
+    global _db_ready
+    with _init_lock:
+        for pooled in (_engine, _read_engine):
+            if pooled is not None:
+                pooled.dispose()
+        _db_ready = False
+# Schema changes to these models also need a step in src/migrations.py;
+# nothing calls create_all on the app database.
 Base = declarative_base()
 
+class Cents(TypeDecorator):
+    """
+    Money column stored as an INTEGER number of cents.
+    Python side it is always a 2-place Decimal: Decimal("28.99") <-> 2899.
+    Works for SUM()/CASE expressions too, since SQLAlchemy carries the type.
+    """
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(int(value)).scaleb(-2)
+
+def split_tags(raw: str | None) -> list[str]:
+    """'Milk, SPAR,,Milk' -> ['Milk', 'SPAR'] (stripped, de-duplicated, order kept)."""
+    names = []
+    for part in (raw or "").split(","):
+        name = part.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+# Join table: one row per (transaction, tag). `position` keeps the order the
+# user typed the tags in, which is the order the tiles show them.
+transaction_tags = Table(
+    "transaction_tags",
+    Base.metadata,
+    Column("transaction_id", Integer, ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("position", Integer, nullable=False, default=0),
+    # Lookups by tag (e.g. "all transactions tagged SPAR")
+    Index("ix_transaction_tags_tag_id", "tag_id", "transaction_id"),
+)
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
 class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)
     category = Column(String, nullable=False)
-    amount = Column(Numeric(precision=10, scale=2), nullable=False)
+    amount = Column(Cents, nullable=False)
     description = Column(String)
     account = Column(String, default="Cash")
     tags = Column(String)
-    saved_amount = Column(Numeric(precision=15, scale=2), default=Decimal('0.00'))
+    saved_amount = Column(Cents, default=Decimal('0.00'))
+    # Balance after this row in (date, id) order. Maintained by the write
+    # functions in src/models.py, so the diary never re-sums the table.
+    running_balance = Column(Cents, nullable=False, default=Decimal('0.00'), server_default="0")
+
+    # `tags` above stays as the text the user typed (edit dialog, display);
+    # the normalized rows are what aggregation queries use. selectin loading
+    # fetches the tags of a whole result set in one extra query, so they are
+    # still available after the session closes.
+    tag_objects = relationship(
+        Tag,
+        secondary=transaction_tags,
+        order_by=transaction_tags.c.position,
+        lazy="selectin",
+    )
+
+    # True on rows loaded from a per-year archive file (src/archive.py); those are read-only
+    archived = False
+
+    @property
+    def tag_names(self) -> list[str]:
+        return [tag.name for tag in self.tag_objects]
+
+    __table_args__ = (
+        # Diary ordering (date, id) + covers balance, saved and monthly aggregates
+        Index("ix_transactions_date_id", "date", "id", "amount", "saved_amount"),
+        # Per-month expense range in get_tag_summary (rowid rides along for the tag join)
+        Index("ix_transactions_date_amount_tags", "date", "amount", "tags"),
+        # Ids are never reused, not even those of rows moved to an archive
+        # file (src/archive.py): plain rowids would hand out MAX(id) + 1
+        {"sqlite_autoincrement": True},
+    )
 
 class Investment(Base):
     __tablename__ = "investments"
@@ -47,56 +278,170 @@ class Investment(Base):
     target_year = Column(Integer, default=2050)
     notes = Column(String)
 
-Base.metadata.create_all(engine)
+def rebuild_running_balances(conn, from_date: date = None):
+    """
+    Recompute transactions.running_balance for every row dated on/after
+    `from_date` (every row when None) with one windowed UPDATE. Rows before
+    `from_date` are trusted and provide the opening balance; with no such
+    row it is the closing balance of the archived years.
+    `conn` may be a Connection or a Session.
+    """
+    params = {"opening": archived_closing_balance(conn), "from_date": None}
+    where = ""
+    if from_date is not None:
+        params["from_date"] = from_date.isoformat()
+        previous = conn.execute(text("""
+            SELECT running_balance FROM transactions
+            WHERE date < :from_date ORDER BY date DESC, id DESC LIMIT 1
+        """), params).scalar()
+        if previous is not None:
+            params["opening"] = previous
+        where = "WHERE date >= :from_date"
 
-# Migration Logic
-_migration_done = False
+    conn.execute(text(f"""
+        UPDATE transactions SET running_balance = r.balance
+        FROM (
+            SELECT id, :opening + SUM(amount) OVER (ORDER BY date, id) AS balance
+            FROM transactions {where}
+        ) AS r
+        WHERE transactions.id = r.id
+    """), params)
 
-def _auto_migrate():
-    global _migration_done
-    if _migration_done:
-        return
-    import json
-    json_path = os.path.join(BASE_DIR, "data", "finance_diary.json")
-    if not os.path.exists(json_path):
-        _migration_done = True
-        return
+class ArchivedYear(Base):
+    """
+    A closed year whose transactions were moved to data/archive/finance_<year>.db
+    (src/archive.py). The totals stay here so live queries never open the file.
+    """
+    __tablename__ = "archived_years"
 
-    with open(json_path, "r") as f:
-        old_entries = json.load(f)
-    
-    with SessionLocal() as db:
-        for entry in old_entries:
-            try:
-                entry_date = date.fromisoformat(entry["date"])
-            except:
-                continue
-
-            # Handle Income
-            income_val = entry.get("income", 0)
-            if income_val and float(income_val) > 0:
-                db.add(
-                    Transaction(
-                        date=entry_date,
-                        category="Salary",
-                        amount=Decimal(str(income_val)), # Convert via string for safety
-                        description=entry.get("notes","")
-                    )
-                )
-
-            # Handle Expense
-            expense_val = entry.get("expense", 0)
-            if expense_val and float(expense_val) > 0:
-                db.add(
-                    Transaction(
-                        date=entry_date,
-                        category="Expense",
-                        # Multiply by -1 using Decimal to maintain type consistency
-                        amount=Decimal(str(expense_val)) * Decimal("-1.00"),
-                        description=entry.get("notes","")
-                    )
-                )
-        db.commit()
-    _migration_done = True
-
-_auto_migrate()
\ No newline at end of file
+    year = Column(Integer, primary_key=True)
+    file = Column(String, nullable=False)          # file name inside the archive directory
+    row_count = Column(Integer, nullable=False)
+    closing_balance = Column(Cents, nullable=False)  # running balance after the year's last row
+    saved = Column(Cents, nullable=False)            # SUM(saved_amount) of the year
+
+def _has_table(conn, name: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}
+    ).first() is not None
+
+def archived_closing_balance(conn) -> int:
+    """
+    Balance in cents carried over from the archived years: the opening
+    balance of the live table. 0 before any archiving (or before schema
+    step 9 created archived_years).
+    """
+    if not _has_table(conn, "archived_years"):
+        return 0
+    return conn.execute(text(
+        "SELECT closing_balance FROM archived_years ORDER BY year DESC LIMIT 1"
+    )).scalar() or 0
+
+def next_transaction_id(conn) -> int:
+    """
+    The id SQLite will give the next transaction (AUTOINCREMENT: above every
+    id ever used). Only stable inside a write transaction. `conn` may be a
+    Connection or a Session.
+    """
+    used = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'transactions'")).scalar()
+    live = conn.execute(text("SELECT MAX(id) FROM transactions")).scalar()
+    return max(used or 0, live or 0) + 1
+
+def archived_year_list(conn) -> list[int]:
+    """Archived years, oldest first."""
+    if not _has_table(conn, "archived_years"):
+        return []
+    return [r[0] for r in conn.execute(text("SELECT year FROM archived_years ORDER BY year"))]
+
+class MonthlyRollup(Base):
+    """
+    Per-month totals, kept current by the transaction write functions in the
+    same DB transaction as the write. get_monthly_summary reads only this.
+    """
+    __tablename__ = "monthly_rollup"
+
+    month = Column(String, primary_key=True)  # 'YYYY-MM'
+    income = Column(Cents, nullable=False, default=Decimal('0.00'))
+    expenses = Column(Cents, nullable=False, default=Decimal('0.00'))  # positive number
+    saved = Column(Cents, nullable=False, default=Decimal('0.00'))
+    count = Column(Integer, nullable=False, default=0)
+
+class JsonImportProgress(Base):
+    """
+    How far the streaming finance_diary.json import got (see
+    src/json_migration.py). `offset` is the byte offset just past the last
+    committed entry and `entries` the number of entries up to there, so a
+    crashed import resumes there. Offset 0 with entries > 0: the file changed,
+    count that many entries off from the top.
+    """
+    __tablename__ = "json_import_progress"
+
+    source = Column(String, primary_key=True)  # file name, e.g. 'finance_diary.json'
+    file_size = Column(Integer, nullable=False)
+    offset = Column(Integer, nullable=False, default=0)
+    entries = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+
+class JsonImportEntry(Base):
+    """
+    sha256 of each diary entry imported before the import went by position
+    (JsonImportProgress). No longer written or read; kept so schema step 7
+    still applies.
+    """
+    __tablename__ = "json_import_entries"
+
+    hash = Column(String, primary_key=True)
+
+class WriteBehindProgress(Base):
+    """
+    Highest journal sequence number committed by the write-behind queue
+    (src/write_behind.py). Journal entries above it are replayed on start.
+    """
+    __tablename__ = "write_behind_progress"
+
+    journal = Column(String, primary_key=True)   # journal file name
+    committed_seq = Column(Integer, nullable=False, default=0)
+
+# Same aggregation the rollup is maintained with, straight off the table.
+# Used to (re)build the rollup and to verify it.
+MONTHLY_ROLLUP_SOURCE_SQL = """
+    SELECT substr(date, 1, 7) AS month,
+           SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) AS income,
+           SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END) AS expenses,
+           COALESCE(SUM(saved_amount), 0) AS saved,
+           COUNT(*) AS count
+    FROM transactions
+    GROUP BY substr(date, 1, 7)
+"""
+
+def rebuild_monthly_rollup(conn):
+    """
+    Throw away monthly_rollup and rebuild it from transactions. Months of
+    archived years are kept: their rows are no longer in the table.
+    `conn` may be a Connection or a Session.
+    """
+    # Archived years are always the oldest ones
+    archived = archived_year_list(conn)
+    conn.execute(
+        text("DELETE FROM monthly_rollup WHERE month > :last_archived"),
+        {"last_archived": f"{archived[-1]}-12" if archived else ""},
+    )
+    conn.execute(text(
+        f"INSERT INTO monthly_rollup (month, income, expenses, saved, count) {MONTHLY_ROLLUP_SOURCE_SQL}"
+    ))
+
+def verify_monthly_rollup(conn) -> list[str]:
+    """Return the months where monthly_rollup disagrees with the transactions table (archived years are skipped)."""
+    archived = archived_year_list(conn)
+    last_archived = f"{archived[-1]}-12" if archived else ""
+    expected = {r[0]: tuple(r[1:]) for r in conn.execute(text(MONTHLY_ROLLUP_SOURCE_SQL))}
+    stored = {
+        r[0]: tuple(r[1:])
+        for r in conn.execute(text("SELECT month, income, expenses, saved, count FROM monthly_rollup"))
+        if r[0] > last_archived
+    }
+    return sorted(m for m in expected.keys() | stored.keys() if expected.get(m) != stored.get(m))
+
+def rebuild_search_index(conn):
+    """Re-index every transaction in transactions_fts. `conn` may be a Connection or a Session."""
+    conn.execute(text("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')"))
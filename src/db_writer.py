@@ -0,0 +1,92 @@
+# src/db_writer.py
+"""
+Single writer thread for every database mutation.
+
+SQLite allows one writer at a time. When several threads each open a session
+and write (the event loop, asyncio.to_thread workers, several web sessions,
+the JSON import), the losers wait on the busy timeout, and a session that
+read before it wrote can fail straight away with "database is locked"
+because its snapshot went stale. Queuing every write onto one thread removes
+the contention: writes run one after another on the write engine, and
+queries use the read-only pool (database.ReadSession) alongside.
+
+    future = submit_write(fn, *args)      # concurrent.futures.Future
+    result = await write_async(fn, *args)  # from the event loop
+    result = run_write(fn, *args)          # blocking, for sync callers
+
+fn runs on the writer thread and opens its own SessionLocal as usual. A
+write started from inside another write runs inline, so write functions can
+call each other without deadlocking the queue.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+
+class DatabaseWriter:
+    """A daemon thread draining a FIFO of write jobs, started on first submit."""
+
+    def __init__(self, name: str = "db-writer"):
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def in_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        if self.in_writer_thread():
+            self._run(future, fn, args, kwargs)
+            return future
+        self._ensure_started()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                thread.start()
+                self._thread = thread
+
+    @staticmethod
+    def _run(future: Future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as ex:
+            future.set_exception(ex)
+
+    def _loop(self):
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            try:
+                self._run(future, fn, args, kwargs)
+            except Exception as ex:  # set_result/set_exception itself failing; keep the thread alive
+                logging.error(f"Database writer: {ex}")
+
+
+_writer = DatabaseWriter()
+
+
+def submit_write(fn: Callable, *args, **kwargs) -> Future:
+    """Queue fn(*args, **kwargs) on the writer thread."""
+    return _writer.submit(fn, *args, **kwargs)
+
+
+def run_write(fn: Callable, *args, **kwargs):
+    """Run fn on the writer thread and wait for it. Re-raises its exception."""
+    return submit_write(fn, *args, **kwargs).result()
+
+
+async def write_async(fn: Callable, *args, **kwargs):
+    """Await fn on the writer thread without blocking the event loop."""
+    return await asyncio.wrap_future(submit_write(fn, *args, **kwargs))
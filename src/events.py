@@ -0,0 +1,112 @@
+# src/events.py
+"""
+Typed change events, published after the write that caused them commits.
+
+    TransactionsChanged(months)  rows added, edited or deleted in those 'YYYY-MM' months
+    InvestmentsChanged(ids)      those investments were added, edited or deleted
+    DataReplaced()               the database file was swapped (backup restore)
+
+The write functions in src/models.py record what they changed on their
+session with record(); when the session commits, the recorded events are
+merged (one TransactionsChanged with every month touched, and so on) and
+published, and on rollback they are dropped, the same way src/columnar.py
+tracks its changes. Writes that do not go through a Session (archiving a
+year, restoring a backup) call publish() themselves once they are done.
+
+Subscribers run on the publishing thread, usually the database writer
+thread, in the order they subscribed: keep them short (mark something
+stale, schedule a task) and never block on the database there.
+"""
+import logging
+import threading
+from typing import Callable, Iterable, NamedTuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TransactionsChanged(NamedTuple):
+    months: frozenset  # 'YYYY-MM'
+
+
+class InvestmentsChanged(NamedTuple):
+    ids: frozenset
+
+
+class DataReplaced(NamedTuple):
+    """Everything may have changed; reload whatever is shown."""
+
+
+ChangeEvent = Union[TransactionsChanged, InvestmentsChanged, DataReplaced]
+
+_subscribers = []  # (callback, event types or None for every type)
+_lock = threading.Lock()
+
+
+def subscribe(callback: Callable[[ChangeEvent], None], *event_types) -> Callable[[], None]:
+    """
+    callback(event) for every published event of one of `event_types`
+    (every event if none are given). Returns a function that unsubscribes it.
+    """
+    entry = (callback, tuple(event_types) or None)
+    with _lock:
+        _subscribers.append(entry)
+
+    def unsubscribe():
+        with _lock:
+            if entry in _subscribers:
+                _subscribers.remove(entry)
+
+    return unsubscribe
+
+
+def publish(change: ChangeEvent):
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback, types in subscribers:
+        if types is None or isinstance(change, types):
+            try:
+                callback(change)
+            except Exception as ex:
+                logging.error(f"Change event subscriber failed: {ex}")
+
+
+def months_of(dates: Iterable) -> frozenset:
+    """'YYYY-MM' of each date (or ISO date string)."""
+    return frozenset(str(d)[:7] for d in dates)
+
+
+def record(db: Session, change: ChangeEvent):
+    """Publish `change` once `db` commits."""
+    db.info.setdefault("events", []).append(change)
+
+
+def _merge(changes) -> list:
+    months, ids, replaced = set(), set(), False
+    for change in changes:
+        if isinstance(change, TransactionsChanged):
+            months |= change.months
+        elif isinstance(change, InvestmentsChanged):
+            ids |= change.ids
+        else:
+            replaced = True
+    if replaced:
+        return [DataReplaced()]
+    merged = []
+    if months:
+        merged.append(TransactionsChanged(frozenset(months)))
+    if ids:
+        merged.append(InvestmentsChanged(frozenset(ids)))
+    return merged
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_recorded(session):
+    changes = session.info.pop("events", None)
+    for change in _merge(changes or ()):
+        publish(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_recorded(session):
+    session.info.pop("events", None)
@@ -9,10 +9,12 @@ def generate_chart():
     summaries = svc_get_monthly_summary()
     if not summaries:
         return "No data yet!"
-    
-    months = [s['month'] for s in summaries]
-    incomes = [s['income'] for s in summaries]
-    expenses = [s['expenses'] for s in summaries]
+
+    # The rollup comes back newest first; plot oldest -> newest
+    summaries = list(reversed(summaries))
+    months = [s.month for s in summaries]
+    incomes = [s.income for s in summaries]
+    expenses = [s.expenses for s in summaries]
 
     plt.figure(figsize=(10, 5))
     plt.plot(months, incomes, label='Income', color='green')
@@ -0,0 +1,259 @@
+# src/json_migration.py
+"""
+Streaming import of the old finance_diary.json into the database.
+
+The file is a JSON array of daily entries ({"date", "income", "expense",
+"notes"}). It is parsed incrementally, so memory stays flat however big it
+is, and written in batches through the bulk insert path. Each batch commits
+together with its position in the file (json_import_progress): the byte
+offset just past its last entry and the number of entries read so far. An
+interrupted import resumes at that offset, so no entry is imported twice;
+entries are told apart by where they are, not by what they say, so two
+identical entries (the same coffee twice on one day) are both imported.
+
+When the file has changed size since (the diary grew), it is read again
+from the top and the entries already counted are skipped.
+
+start_json_migration() runs it on a daemon thread so app startup does not
+wait for it.
+"""
+import codecs
+import json
+import logging
+import os
+import threading
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+
+from .database import BASE_DIR, SessionLocal, JsonImportProgress
+from .db_writer import run_write
+from .models import _validate_bulk_row, _insert_validated
+
+JSON_DIARY_PATH = os.path.join(BASE_DIR, "data", "finance_diary.json")
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder(parse_float=Decimal)
+_lock = threading.Lock()
+
+
+def iter_json_array(fp, offset: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[object, int]]:
+    """
+    Yield (element, end_offset) for each element of the top-level JSON array
+    in the binary file `fp`. end_offset is the byte offset just past the
+    element; pass it back as `offset` to continue after that element.
+    """
+    fp.seek(offset)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, pos_bytes, eof = "", 0, offset, False
+    # Resuming lands just after an element, where a ',' or ']' comes next
+    state = "start" if offset == 0 else "after_value"
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+        return True
+
+    def advance(end: int):
+        nonlocal pos, pos_bytes
+        pos_bytes += len(buf[pos:end].encode("utf-8"))
+        pos = end
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            advance(pos + 1)
+        if pos == len(buf):
+            if fill():
+                continue
+            raise ValueError("finance_diary.json ends before the closing ']'")
+
+        char = buf[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError("finance_diary.json is not a JSON array")
+            advance(pos + 1)
+            state = "first_value"
+        elif char == "]" and state in ("first_value", "after_value"):
+            return
+        elif state == "after_value":
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at byte {pos_bytes}")
+            advance(pos + 1)
+            state = "value"
+        else:
+            try:
+                element, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A number or literal cut off at the chunk edge still decodes; read more first
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            advance(end)
+            state = "after_value"
+            yield element, pos_bytes
+
+
+def entry_rows(entry) -> list:
+    """Transactions for one diary entry: income -> Salary, expense -> Expense. Bad entries give []."""
+    if not isinstance(entry, dict):
+        return []
+    try:
+        entry_date = date.fromisoformat(entry["date"])
+    except (KeyError, TypeError, ValueError):
+        return []
+
+    rows = []
+    for key, category, sign in (("income", "Salary", 1), ("expense", "Expense", -1)):
+        try:
+            value = Decimal(str(entry.get(key) or 0))
+            if not value.is_finite():
+                logging.warning(f"finance_diary.json: skipping {key} {value} on {entry_date}")
+                continue
+        except InvalidOperation:
+            continue
+        if value > 0:
+            rows.append({
+                "date": entry_date,
+                "category": category,
+                "amount": sign * value,
+                "description": entry.get("notes", ""),
+            })
+    return rows
+
+
+def _legacy_keys(db, batch_rows) -> set:
+    """
+    (date, category, cents, description) of Salary/Expense rows already in
+    the batch's date range. The old import-time migrator left no progress
+    row behind, so on a first run this is how its rows are recognised.
+    """
+    dates = [row[0] for row in batch_rows]
+    return set(db.execute(text("""
+        SELECT date, category, amount, COALESCE(description, '') FROM transactions
+        WHERE category IN ('Salary', 'Expense') AND date BETWEEN :first AND :last
+    """), {"first": min(dates), "last": max(dates)}).tuples())
+
+
+def _commit_batch(source: str, entries, offset: int, legacy: bool) -> int:
+    with SessionLocal() as db:
+        batch = []
+        for entry in entries:
+            for row in entry_rows(entry):
+                batch.append(_validate_bulk_row(len(batch), row))
+
+        if batch and legacy:
+            existing = _legacy_keys(db, batch)
+            batch = [row for row in batch if (row[0], row[1], row[2], row[3]) not in existing]
+        if batch:
+            _insert_validated(db, batch)
+
+        progress = db.get(JsonImportProgress, source)
+        progress.offset = offset
+        progress.entries += len(entries)
+        db.commit()
+    return len(batch)
+
+
+def _start_import(source: str, file_size: int):
+    """
+    Load or create the progress row. Returns (offset to resume from, entries
+    to skip from there, legacy), or None when this file was already imported
+    completely.
+    """
+    with SessionLocal() as db:
+        progress = db.get(JsonImportProgress, source)
+        legacy = progress is None and db.execute(text("SELECT 1 FROM transactions LIMIT 1")).first() is not None
+        if progress is None:
+            progress = JsonImportProgress(source=source, file_size=file_size, offset=0, entries=0, completed=0)
+            db.add(progress)
+        elif progress.file_size != file_size:
+            # The file changed: read it again from the top, skipping the entries
+            # already imported (offset 0 with entries > 0 means "count them off")
+            progress.file_size, progress.offset, progress.completed = file_size, 0, 0
+        elif progress.completed:
+            return None
+        db.commit()
+        skip = progress.entries if progress.offset == 0 else 0
+        return progress.offset, skip, legacy
+
+
+def _finish_import(source: str):
+    with SessionLocal() as db:
+        db.get(JsonImportProgress, source).completed = 1
+        db.commit()
+
+
+def migrate_json_diary(json_path: str = JSON_DIARY_PATH, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Import (or finish importing) `json_path`. Safe to call any number of
+    times; returns the number of transactions inserted by this call.
+    Parsing happens on the calling thread; each batch is one job on the
+    database writer (src/db_writer.py), so app writes interleave with it.
+    """
+    if not os.path.exists(json_path):
+        return 0
+
+    source = os.path.basename(json_path)
+    file_size = os.path.getsize(json_path)
+    inserted = 0
+
+    with _lock:
+        started = run_write(_start_import, source, file_size)
+        if started is None:
+            return 0
+        start_offset, skip, legacy = started
+
+        entries, offset = [], start_offset
+        with open(json_path, "rb") as fp:
+            for entry, offset in iter_json_array(fp, start_offset):
+                if skip:
+                    skip -= 1
+                    continue
+                entries.append(entry)
+                if len(entries) >= batch_size:
+                    inserted += run_write(_commit_batch, source, entries, offset, legacy)
+                    entries = []
+        if entries:
+            inserted += run_write(_commit_batch, source, entries, offset, legacy)
+
+        run_write(_finish_import, source)
+
+    logging.info(f"finance_diary.json import done: {inserted} transactions added")
+    return inserted
+
+
+def start_json_migration(
+    json_path: str = JSON_DIARY_PATH,
+    on_done: Optional[Callable[[int], None]] = None,
+) -> Optional[threading.Thread]:
+    """
+    Run migrate_json_diary on a daemon thread. `on_done(inserted)` is called
+    from that thread when it finishes. Returns None when there is no file.
+    """
+    if not os.path.exists(json_path):
+        return None
+
+    def run():
+        try:
+            inserted = migrate_json_diary(json_path)
+        except Exception as ex:
+            logging.error(f"finance_diary.json import failed: {ex}")
+            return
+        if on_done is not None:
+            on_done(inserted)
+
+    thread = threading.Thread(target=run, name="json-diary-import", daemon=True)
+    thread.start()
+    return thread
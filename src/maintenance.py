@@ -0,0 +1,139 @@
+# src/maintenance.py
+"""
+Maintenance commands for the derived data kept next to the transactions table.
+
+    python -m src.maintenance verify-rollup     # exit 1 if monthly_rollup is out of sync
+    python -m src.maintenance rebuild-rollup    # recompute monthly_rollup from transactions
+    python -m src.maintenance rebuild-balances  # recompute transactions.running_balance
+    python -m src.maintenance import-json       # run/resume the finance_diary.json import now
+    python -m src.maintenance rebuild-search    # re-index transactions_fts from transactions
+    python -m src.maintenance schema-version    # PRAGMA user_version vs the latest migration
+    python -m src.maintenance archive-year YEAR # move a closed year into data/archive/
+    python -m src.maintenance backup            # verified online backup into data/backups/
+    python -m src.maintenance list-backups      # backups, newest first
+    python -m src.maintenance restore PATH      # replace the database with a backup
+"""
+import sys
+
+from .database import (
+    init_db,
+    rebuild_monthly_rollup,
+    verify_monthly_rollup,
+    rebuild_running_balances,
+    rebuild_search_index,
+)
+from .archive import archive_year
+from .backup import backup_database, list_backups, restore_backup
+from .json_migration import migrate_json_diary
+from .migrations import MIGRATIONS, schema_version
+
+
+def verify_rollup() -> int:
+    with init_db().connect() as conn:
+        bad_months = verify_monthly_rollup(conn)
+    if bad_months:
+        print(f"monthly_rollup out of sync for: {', '.join(bad_months)}")
+        return 1
+    print("monthly_rollup ok")
+    return 0
+
+
+def rebuild_rollup() -> int:
+    with init_db().begin() as conn:
+        rebuild_monthly_rollup(conn)
+    print("monthly_rollup rebuilt")
+    return 0
+
+
+def rebuild_balances() -> int:
+    with init_db().begin() as conn:
+        rebuild_running_balances(conn)
+    print("running balances rebuilt")
+    return 0
+
+
+def rebuild_search() -> int:
+    with init_db().begin() as conn:
+        rebuild_search_index(conn)
+    print("search index rebuilt")
+    return 0
+
+
+def show_schema_version() -> int:
+    # init_db() migrates first, so this reports the version after any pending steps ran
+    with init_db().connect() as conn:
+        version = schema_version(conn)
+    print(f"schema version {version} of {len(MIGRATIONS)}")
+    for step in MIGRATIONS:
+        print(f"  {step['version']:>3}  {step['name']}")
+    return 0
+
+
+def import_json() -> int:
+    inserted = migrate_json_diary()
+    print(f"finance_diary.json: {inserted} transactions imported")
+    return 0
+
+
+def archive(year: str = None) -> int:
+    if year is None or not year.isdigit():
+        print("usage: python -m src.maintenance archive-year YEAR")
+        return 2
+    try:
+        record = archive_year(int(year))
+    except ValueError as ex:
+        print(f"not archived: {ex}")
+        return 1
+    print(f"{record['year']}: {record['row_count']} transactions moved to {record['file']}")
+    return 0
+
+
+def backup() -> int:
+    result = backup_database()
+    print(f"backup written: {result['path']} ({result['size'] / 1e6:.1f} MB, {result['seconds']:.1f}s)")
+    return 0
+
+
+def show_backups() -> int:
+    for b in list_backups():
+        print(f"{b['created']:%Y-%m-%d %H:%M:%S}  {b['size'] / 1e6:>8.1f} MB  {b['path']}")
+    return 0
+
+
+def restore(path: str = None) -> int:
+    if path is None:
+        print("usage: python -m src.maintenance restore PATH")
+        return 2
+    try:
+        safety = restore_backup(path)
+    except (FileNotFoundError, RuntimeError) as ex:
+        print(f"not restored: {ex}")
+        return 1
+    print(f"restored {path}; the previous database was saved as {safety['path']}")
+    return 0
+
+
+COMMANDS = {
+    "verify-rollup": verify_rollup,
+    "rebuild-rollup": rebuild_rollup,
+    "rebuild-balances": rebuild_balances,
+    "import-json": import_json,
+    "rebuild-search": rebuild_search,
+    "schema-version": show_schema_version,
+    "archive-year": archive,
+    "backup": backup,
+    "list-backups": show_backups,
+    "restore": restore,
+}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__)
+        return 2
+    return COMMANDS[argv[0]](*argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+# src/migrations.py
+"""
+Versioned schema migrations.
+
+The schema version of a database is its PRAGMA user_version. MIGRATIONS is
+the ordered list of steps; migrate() runs every step above the current
+version, in order, and records the new version in the same transaction as
+the step's last write, so a step is either fully applied or not at all.
+
+A step is a function taking a SQLAlchemy Connection:
+  - a plain function runs in one transaction;
+  - a generator function commits at every `yield`, so big rewrites go in
+    batches and other connections get the database between them. The
+    version only moves once the generator is exhausted, and an interrupted
+    step starts over on the next run, so batched steps must skip work that
+    is already done.
+
+Steps 1-8 fold in the ad-hoc upgrades older versions ran on every start;
+databases from before the registry (user_version 0) can be in any of those
+intermediate states, so those steps check before they change anything.
+New schema changes get a new step at the end. Never edit a released step.
+"""
+import inspect as pyinspect
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from urllib.request import pathname2url
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateTable
+
+from .database import (
+    Cents,
+    Transaction,
+    Investment,
+    Tag,
+    transaction_tags,
+    MonthlyRollup,
+    ArchivedYear,
+    JsonImportProgress,
+    JsonImportEntry,
+    WriteBehindProgress,
+    split_tags,
+    archived_year_list,
+    rebuild_running_balances,
+    rebuild_monthly_rollup,
+    rebuild_search_index,
+)
+
+BATCH_SIZE = 5000
+
+# [{"version", "name", "apply", "foreign_keys_off"}], in version order
+MIGRATIONS = []
+
+
+def migration(version: int, name: str, foreign_keys_off: bool = False):
+    """
+    Register the decorated function as schema step `version`.
+    foreign_keys_off: run the step with PRAGMA foreign_keys=OFF (needed to
+    drop and recreate a table others reference); the pragma cannot change
+    inside a transaction, so the runner sets it around the step and runs
+    PRAGMA foreign_key_check before committing.
+    """
+    def register(apply):
+        assert version == len(MIGRATIONS) + 1, f"migration {version} registered out of order"
+        MIGRATIONS.append({
+            "version": version,
+            "name": name,
+            "apply": apply,
+            "foreign_keys_off": foreign_keys_off,
+        })
+        return apply
+    return register
+
+
+def schema_version(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _run_step(conn, step: dict):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        if pyinspect.isgeneratorfunction(step["apply"]):
+            for _ in step["apply"](conn):
+                conn.exec_driver_sql("COMMIT")
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            step["apply"](conn)
+        if step["foreign_keys_off"]:
+            broken = conn.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+            if broken:
+                raise RuntimeError(f"migration {step['version']} broke foreign keys: {broken[:5]}")
+        conn.exec_driver_sql(f"PRAGMA user_version = {int(step['version'])}")
+        conn.exec_driver_sql("COMMIT")
+    except Exception:
+        conn.exec_driver_sql("ROLLBACK")
+        raise
+
+
+def migrate(engine, target: int = None) -> list:
+    """
+    Bring the database up to `target` (default: the latest step).
+    Returns the versions applied by this call.
+    """
+    target = len(MIGRATIONS) if target is None else target
+    applied = []
+    # AUTOCOMMIT hands transaction control to the BEGIN/COMMIT above; pysqlite
+    # would otherwise leave DDL outside any transaction.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        current = schema_version(conn)
+        for step in MIGRATIONS[current:target]:
+            logging.info(f"Schema migration {step['version']}: {step['name']}")
+            if step["foreign_keys_off"]:
+                conn.exec_driver_sql("PRAGMA foreign_keys = OFF")
+            try:
+                _run_step(conn, step)
+            finally:
+                if step["foreign_keys_off"]:
+                    conn.exec_driver_sql("PRAGMA foreign_keys = ON")
+            applied.append(step["version"])
+    return applied
+
+
+# -------------------------
+# Steps
+# -------------------------
+
+@migration(1, "core tables")
+def _core_tables(conn):
+    Transaction.__table__.create(conn, checkfirst=True)
+    Investment.__table__.create(conn, checkfirst=True)
+
+
+@migration(2, "transaction money as integer cents", foreign_keys_off=True)
+def _money_to_cents(conn):
+    """
+    Databases created before Cents hold transaction amounts as NUMERIC
+    floats. Copy them into a cents table in id batches, then swap it in.
+    """
+    columns = {c["name"]: str(c["type"]) for c in inspect(conn).get_columns("transactions")}
+    if columns.get("amount", "").upper().startswith("INTEGER"):
+        return
+
+    table = Transaction.__table__
+    create_new = str(CreateTable(table).compile(conn)).replace(
+        "CREATE TABLE transactions", "CREATE TABLE IF NOT EXISTS transactions_new", 1
+    )
+    # Only copy columns the old table has; newer ones take their defaults
+    copied = [c for c in table.columns if c.name in columns]
+    names = ", ".join(c.name for c in copied)
+    converted = ", ".join(
+        f"CAST(ROUND({c.name} * 100) AS INTEGER)" if isinstance(c.type, Cents) else c.name
+        for c in copied
+    )
+
+    # transactions_new survives an interrupted run; carry on after its last id
+    conn.execute(text(create_new))
+    while True:
+        copied_rows = conn.execute(text(f"""
+            INSERT INTO transactions_new ({names})
+            SELECT {converted} FROM transactions
+            WHERE id > (SELECT COALESCE(MAX(id), 0) FROM transactions_new)
+            ORDER BY id LIMIT :batch
+        """), {"batch": BATCH_SIZE}).rowcount
+        if copied_rows < BATCH_SIZE:
+            break
+        yield
+
+    conn.execute(text("DROP TABLE transactions"))
+    conn.execute(text("ALTER TABLE transactions_new RENAME TO transactions"))
+    if "running_balance" not in columns:
+        rebuild_running_balances(conn)
+
+
+@migration(3, "transactions.running_balance")
+def _running_balance_column(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("transactions")}
+    if "running_balance" not in columns:
+        conn.execute(text("ALTER TABLE transactions ADD COLUMN running_balance INTEGER NOT NULL DEFAULT 0"))
+    rebuild_running_balances(conn)
+
+
+@migration(4, "monthly_rollup")
+def _monthly_rollup(conn):
+    MonthlyRollup.__table__.create(conn, checkfirst=True)
+    rebuild_monthly_rollup(conn)
+
+
+@migration(5, "tags and transaction_tags")
+def _tag_tables(conn):
+    """
+    Fill the tag tables from the comma-separated Transaction.tags strings,
+    in id batches. INSERT OR IGNORE makes a re-run after a crash harmless.
+    """
+    Tag.__table__.create(conn, checkfirst=True)
+    transaction_tags.create(conn, checkfirst=True)
+
+    after = 0
+    while True:
+        rows = conn.execute(text("""
+            SELECT id, tags FROM transactions
+            WHERE id > :after AND tags IS NOT NULL AND tags != ''
+            ORDER BY id LIMIT :batch
+        """), {"after": after, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            return
+        after = rows[-1][0]
+
+        parsed = [(tid, split_tags(raw)) for tid, raw in rows]
+        names = sorted({name for _, tag_list in parsed for name in tag_list})
+        if names:
+            conn.execute(text("INSERT OR IGNORE INTO tags (name) VALUES (:name)"), [{"name": n} for n in names])
+            tag_ids = dict(conn.execute(text("SELECT name, id FROM tags")).fetchall())
+            conn.execute(
+                text("INSERT OR IGNORE INTO transaction_tags (transaction_id, tag_id, position) VALUES (:t, :g, :p)"),
+                [
+                    {"t": tid, "g": tag_ids[name], "p": pos}
+                    for tid, tag_list in parsed
+                    for pos, name in enumerate(tag_list)
+                ],
+            )
+        yield
+
+
+@migration(6, "covering indexes")
+def _covering_indexes(conn):
+    for table in (Transaction.__table__, transaction_tags):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+@migration(7, "finance_diary.json import bookkeeping")
+def _json_import_tables(conn):
+    JsonImportProgress.__table__.create(conn, checkfirst=True)
+    JsonImportEntry.__table__.create(conn, checkfirst=True)
+
+
+# Full-text index over the searchable text columns. External content: the
+# text lives only in transactions, the FTS table holds just the index, and
+# the triggers keep it in step with every insert/delete/edit. The UPDATE
+# trigger only fires for the indexed columns, so running_balance shifts
+# don't touch it. The INSERT trigger stands down while search_index_paused
+# has a row: the bulk insert path sets it inside its own DB transaction and
+# indexes the whole batch with one INSERT ... SELECT, which is several times
+# faster than a trigger call per row.
+FTS_SCHEMA_SQL = [
+    "CREATE TABLE IF NOT EXISTS search_index_paused (paused INTEGER)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, category, tags,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions
+    WHEN NOT EXISTS (SELECT 1 FROM search_index_paused) BEGIN
+        INSERT INTO transactions_fts (rowid, description, category, tags)
+        VALUES (new.id, new.description, new.category, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, category, tags)
+        VALUES ('delete', old.id, old.description, old.category, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, category, tags ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, category, tags)
+        VALUES ('delete', old.id, old.description, old.category, old.tags);
+        INSERT INTO transactions_fts (rowid, description, category, tags)
+        VALUES (new.id, new.description, new.category, new.tags);
+    END
+    """,
+]
+
+
+@migration(8, "transactions_fts search index")
+def _search_index(conn):
+    for statement in FTS_SCHEMA_SQL:
+        conn.execute(text(statement))
+    rebuild_search_index(conn)
+
+
+@migration(9, "archived_years")
+def _archived_years(conn):
+    ArchivedYear.__table__.create(conn, checkfirst=True)
+
+
+@migration(10, "write-behind journal progress")
+def _write_behind_progress(conn):
+    WriteBehindProgress.__table__.create(conn, checkfirst=True)
+
+
+@migration(11, "transactions.id AUTOINCREMENT", foreign_keys_off=True)
+def _transaction_id_autoincrement(conn):
+    """
+    Plain rowids reuse MAX(id) + 1, so archiving a year whose rows held the
+    highest ids handed those ids to new rows. Rebuild the table with
+    AUTOINCREMENT and start its sequence above every id in use, live or in
+    an archive file.
+    """
+    table_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'transactions'")).scalar()
+    if "AUTOINCREMENT" not in table_sql.upper():
+        table = Transaction.__table__
+        create_new = str(CreateTable(table).compile(conn)).replace(
+            "CREATE TABLE transactions", "CREATE TABLE transactions_new", 1
+        )
+        names = ", ".join(c.name for c in table.columns)
+        conn.execute(text("DROP TABLE IF EXISTS transactions_new"))
+        conn.execute(text(create_new))
+        conn.execute(text(f"INSERT INTO transactions_new ({names}) SELECT {names} FROM transactions"))
+        # Dropping the table drops its indexes and search index triggers too
+        conn.execute(text("DROP TABLE transactions"))
+        conn.execute(text("ALTER TABLE transactions_new RENAME TO transactions"))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+        for statement in FTS_SCHEMA_SQL:
+            conn.execute(text(statement))
+
+    # ATTACH is not allowed inside the step's transaction: read each archive
+    # file on its own connection
+    from .archive import archive_path
+    last_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM transactions")).scalar()
+    for year in archived_year_list(conn):
+        path = archive_path(year)
+        if not os.path.exists(path):
+            logging.warning(f"Archive for {year} is missing: {path}; its ids may be reused")
+            continue
+        with closing(sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)) as archive:
+            last_id = max(last_id, archive.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0])
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'transactions'"))
+    conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('transactions', :seq)"), {"seq": last_id})
@@ -1,11 +1,330 @@
 # src/models.py
-from .database import SessionLocal, Transaction, Investment
-from datetime import date
-from typing import List
-from sqlalchemy import select, func, text
-from decimal import Decimal, ROUND_HALF_UP
+from .database import (
+    SessionLocal,
+    ReadSession,
+    Transaction,
+    Investment,
+    MonthlyRollup,
+    Tag,
+    transaction_tags,
+    ArchivedYear,
+    split_tags,
+    rebuild_running_balances,
+    archived_closing_balance,
+    next_transaction_id,
+)
+from .archive import archive_session
+from . import columnar, events
+from .rows import (
+    TransactionRow,
+    InvestmentRow,
+    MonthSummary,
+    TagTotal,
+    CategoryTotal,
+    TRANSACTION_ROW_COLUMNS,
+    INVESTMENT_ROW_COLUMNS,
+    transaction_row,
+)
+from datetime import date, datetime
+from typing import List, Iterable
 from collections import defaultdict
-from sqlalchemy import func
+import re
+import unicodedata
+from sqlalchemy import (
+    select, update, delete, func, bindparam, tuple_, literal_column,
+    MetaData, Table, Column, Integer,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+# -------------------------
+# Query builders
+# -------------------------
+# The read functions below execute these statements; src/query_audit.py runs
+# EXPLAIN QUERY PLAN against the very same statements.
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """'YYYY-MM' -> (first day, first day of next month), for index-friendly range filters."""
+    year, mon = (int(part) for part in month.split("-"))
+    start = date(year, mon, 1)
+    end = date(year + 1, 1, 1) if mon == 12 else date(year, mon + 1, 1)
+    return start, end
+
+def balance_query(as_of: date = None):
+    # Stored running balance of the last row on/before `as_of`: one index probe
+    query = select(Transaction.running_balance)
+    if as_of:
+        query = query.where(Transaction.date <= as_of)
+    return query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(1)
+
+def running_balance_query(from_date: date = None, to_date: date = None):
+    query = select(*TRANSACTION_ROW_COLUMNS).order_by(Transaction.date.desc(), Transaction.id.desc())
+    if from_date:
+        query = query.where(Transaction.date >= from_date)
+    if to_date:
+        query = query.where(Transaction.date <= to_date)
+    return query
+
+def transactions_page_query(cursor: tuple = None, limit: int = 50,
+                            from_date: date = None, to_date: date = None):
+    """
+    Keyset page of the diary, newest first. `cursor` is the (date, id) of the
+    last row of the previous page. One extra row is fetched to tell whether
+    another page follows.
+    """
+    query = running_balance_query(from_date, to_date)
+    if cursor:
+        query = query.where(tuple_(Transaction.date, Transaction.id) < tuple_(*cursor))
+    return query.limit(limit + 1)
+
+def monthly_summary_query(limit: int | None = 24):
+    # Reads the maintained rollup: O(months), not O(transactions)
+    query = select(
+        MonthlyRollup.month,
+        MonthlyRollup.income,
+        MonthlyRollup.expenses,
+        MonthlyRollup.saved,
+        MonthlyRollup.count,
+    ).order_by(MonthlyRollup.month.desc())
+    return query.limit(limit) if limit else query
+
+def tag_summary_query(month: str):
+    start, end = month_bounds(month)
+    total = func.sum(-Transaction.amount).label("total")
+    return (
+        select(Tag.name, total)
+        .select_from(Transaction)
+        .join(transaction_tags, transaction_tags.c.transaction_id == Transaction.id)
+        .join(Tag, Tag.id == transaction_tags.c.tag_id)
+        .where(
+            Transaction.date >= start,
+            Transaction.date < end,
+            Transaction.amount < 0,
+        )
+        .group_by(Tag.id)
+        .order_by(total.desc(), Tag.name)
+    )
+
+def category_summary_query(month: str):
+    start, end = month_bounds(month)
+    total = func.sum(-Transaction.amount).label("total")
+    return (
+        select(Transaction.category, total)
+        .where(
+            Transaction.date >= start,
+            Transaction.date < end,
+            Transaction.amount < 0,
+        )
+        .group_by(Transaction.category)
+        .order_by(total.desc(), Transaction.category)
+    )
+
+def total_saved_query():
+    # The rollup keeps archived months too: O(months), and no archive files
+    return select(func.sum(MonthlyRollup.saved))
+
+# FTS5 index kept in sync with transactions by triggers (see src/migrations.py).
+# A Table (in its own MetaData, so create_all never touches it) rather than a
+# bare table() clause, so archive_session's schema_translate_map applies to it.
+transactions_fts = Table("transactions_fts", MetaData(), Column("rowid", Integer, primary_key=True))
+_fts = literal_column("transactions_fts")
+
+# Wrapped around matched terms in search highlights
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+def fts_match_expression(text: str) -> str | None:
+    """
+    User text -> FTS5 MATCH expression: every word must match, as a prefix
+    ('spar mil' finds 'SPAR milk'). Words are quoted, so FTS5 operators and
+    punctuation typed by the user are taken literally. None if no words.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+def search_transactions_query(match: str, filters: dict = None, limit: int = 50, offset: int = 0):
+    """
+    Ids of one page of matches, best first: bm25 with category hits weighing
+    most, then tags, then description; newer rows first among equals.
+    `filters` may hold from_date, to_date, category and account. Ranking and
+    paging happen inside the FTS index; transactions is only joined when a
+    filter needs it. Fetches one extra row like the diary pages.
+    """
+    filters = filters or {}
+    rank = func.bm25(_fts, 1.0, 4.0, 2.0)
+    query = (
+        select(transactions_fts.c.rowid, rank.label("rank"))
+        .where(_fts.op("MATCH")(match))
+    )
+    conditions = []
+    if filters.get("from_date"):
+        conditions.append(Transaction.date >= filters["from_date"])
+    if filters.get("to_date"):
+        conditions.append(Transaction.date <= filters["to_date"])
+    if filters.get("category"):
+        conditions.append(Transaction.category == filters["category"])
+    if filters.get("account"):
+        conditions.append(Transaction.account == filters["account"])
+    if conditions:
+        query = query.join(Transaction, Transaction.id == transactions_fts.c.rowid).where(*conditions)
+    return (
+        query.order_by(rank, transactions_fts.c.rowid.desc())
+        .limit(limit + 1)
+        .offset(offset)
+    )
+
+def _fold(word: str) -> str:
+    # Same folding as the index tokenizer (unicode61 remove_diacritics): 'Café' -> 'cafe'
+    decomposed = unicodedata.normalize("NFKD", word.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def highlight_matches(text: str | None, words: List[str]) -> str:
+    """Wrap every word of `text` that starts with one of the (folded) search `words` in highlight markers."""
+    if not text:
+        return text or ""
+    return re.sub(
+        r"\w+",
+        lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}"
+        if any(_fold(m.group(0)).startswith(word) for word in words) else m.group(0),
+        text,
+    )
+
+def set_transaction_tags(db, transaction: Transaction, raw_tags: str | None):
+    """Store `raw_tags` on the transaction and sync its normalized tag rows."""
+    names = split_tags(raw_tags)
+    existing = {}
+    if names:
+        existing = {tag.name: tag for tag in db.scalars(select(Tag).where(Tag.name.in_(names)))}
+    transaction.tags = raw_tags
+    transaction.tag_objects = [existing.get(name) or Tag(name=name) for name in names]
+    if not names:
+        return
+
+    # The relationship writes the link rows; record the typed order on them
+    db.flush()
+    db.execute(
+        transaction_tags.update()
+        .where(
+            transaction_tags.c.transaction_id == transaction.id,
+            transaction_tags.c.tag_id == bindparam("b_tag_id"),
+        )
+        .values(position=bindparam("b_position")),
+        [{"b_tag_id": tag.id, "b_position": pos} for pos, tag in enumerate(transaction.tag_objects)],
+    )
+
+# -------------------------
+# Running balance maintenance
+# -------------------------
+# Transaction.running_balance is a prefix sum in (date, id) order. A write at
+# position p only touches rows after p, so a back-dated entry shifts the rows
+# that follow it and nothing else.
+
+def _after(tx_date: date, tx_id: int):
+    return tuple_(Transaction.date, Transaction.id) > tuple_(tx_date, tx_id)
+
+def _balance_before(db, tx_date: date, tx_id: int) -> Decimal:
+    prev = db.scalar(
+        select(Transaction.running_balance)
+        .where(tuple_(Transaction.date, Transaction.id) < tuple_(tx_date, tx_id))
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(1)
+    )
+    if prev is not None:
+        return prev
+    # First live row: it carries on from the archived years
+    return Decimal(archived_closing_balance(db)).scaleb(-2)
+
+def _shift_balances_after(db, tx_date: date, tx_id: int, delta: Decimal):
+    if not delta:
+        return
+    db.execute(
+        update(Transaction)
+        .where(_after(tx_date, tx_id))
+        .values(running_balance=Transaction.running_balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+# -------------------------
+# Monthly rollup maintenance
+# -------------------------
+
+def _upsert_rollup(db, deltas: List[dict]):
+    """Add per-month deltas ({month, income, expenses, saved, count}) to monthly_rollup."""
+    stmt = sqlite_insert(MonthlyRollup)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[MonthlyRollup.month],
+        set_={
+            "income": MonthlyRollup.income + stmt.excluded.income,
+            "expenses": MonthlyRollup.expenses + stmt.excluded.expenses,
+            "saved": MonthlyRollup.saved + stmt.excluded.saved,
+            "count": MonthlyRollup.count + stmt.excluded.count,
+        },
+    ), deltas)
+
+def _apply_to_rollup(db, tx_date: date, amount: Decimal, saved: Decimal, sign: int):
+    """Add (sign=1) or remove (sign=-1) one transaction's contribution to its month."""
+    month = tx_date.strftime("%Y-%m")
+    saved = saved or Decimal('0.00')
+    _upsert_rollup(db, [{
+        "month": month,
+        "income": sign * amount if amount > 0 else Decimal('0.00'),
+        "expenses": sign * -amount if amount < 0 else Decimal('0.00'),
+        "saved": sign * saved,
+        "count": sign,
+    }])
+    if sign < 0:
+        # A month with no transactions left drops out, like the old GROUP BY
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.month == month, MonthlyRollup.count <= 0))
+
+# -------------------------
+# Archived years
+# -------------------------
+# Closed years can live in per-year archive files (src/archive.py). Reads
+# below only open a file when the requested range reaches into its year.
+
+def _archived_years(db, from_date: date = None, to_date: date = None) -> List[ArchivedYear]:
+    """Archived years overlapping [from_date, to_date], newest first."""
+    query = select(ArchivedYear).order_by(ArchivedYear.year.desc())
+    if from_date:
+        query = query.where(ArchivedYear.year >= from_date.year)
+    if to_date:
+        query = query.where(ArchivedYear.year <= to_date.year)
+    return db.scalars(query).all()
+
+def _check_not_archived(db, *dates: date):
+    last = db.scalar(select(func.max(ArchivedYear.year)))
+    if last is not None and any(d.year <= last for d in dates):
+        raise ValueError(f"Transactions up to {last} are archived and read-only")
+
+def _rows(db, statement) -> List[TransactionRow]:
+    """Run a select of TRANSACTION_ROW_COLUMNS and build the row tuples."""
+    return [transaction_row(r) for r in db.execute(statement)]
+
+def _from_archive(year: int, statement) -> List[TransactionRow]:
+    """Run a TRANSACTION_ROW_COLUMNS select against one archive file; the rows come back marked archived."""
+    with archive_session(year) as adb:
+        return [transaction_row(r, archived=True) for r in adb.execute(statement)]
+
+def get_archived_years() -> List[dict]:
+    """One summary per archived year, newest first. Opens no archive file."""
+    with ReadSession() as db:
+        return [
+            {
+                "year": y.year,
+                "row_count": y.row_count,
+                "closing_balance": y.closing_balance,
+                "saved": y.saved,
+            }
+            for y in _archived_years(db)
+        ]
+
+def _place_transaction(db, t: Transaction):
+    """Set t's own running balance and shift everything after it by t.amount."""
+    db.flush()
+    t.running_balance = _balance_before(db, t.date, t.id) + t.amount
+    _shift_balances_after(db, t.date, t.id, t.amount)
 
 def add_transaction(date: date,
                     category: str,
@@ -15,26 +334,258 @@ def add_transaction(date: date,
                     tags: str = "",
                     saved_amount: Decimal = Decimal('0.00')):
     with SessionLocal() as db:
+        _check_not_archived(db, date)
         # Ensure amount is a Decimal before saving
         t = Transaction(date=date,
                         category=category,
                         amount=Decimal(str(amount)),
                         description=description,
                         account=account,
-                        tags=tags,
                         saved_amount=Decimal(str(saved_amount)))
         db.add(t)
+        set_transaction_tags(db, t, tags)
+        _place_transaction(db, t)
+        _apply_to_rollup(db, t.date, t.amount, t.saved_amount, 1)
+        columnar.track_insert(db, [_columnar_row(t)])
+        events.record(db, events.TransactionsChanged(events.months_of([t.date])))
+        db.commit()
+
+def _columnar_row(t: Transaction) -> tuple:
+    """t as the raw row src/columnar.py tracks."""
+    return (t.id, t.date.isoformat(), _to_cents(t.amount), _to_cents(t.saved_amount or 0), t.category, t.tags)
+
+def _to_cents(value) -> int:
+    if isinstance(value, int):
+        return value * 100
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    if not amount.is_finite():
+        raise ValueError(f"amount must be a finite number, not {amount}")
+    cents = amount.scaleb(2)
+    whole = int(cents)
+    # Whole cents (the usual case) need no rounding
+    return whole if whole == cents else int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
+def _validate_bulk_row(index: int, row: dict) -> tuple:
+    """
+    Normalize one bulk row to storage values (ISO date, integer cents) or
+    raise ValueError naming the row.
+    """
+    try:
+        tx_date = row["date"]
+        if type(tx_date) is date:
+            pass
+        elif isinstance(tx_date, datetime):
+            tx_date = tx_date.date()
+        elif isinstance(tx_date, str):
+            tx_date = date.fromisoformat(tx_date)
+        elif not isinstance(tx_date, date):
+            raise ValueError("date must be a date or 'YYYY-MM-DD'")
+
+        category = (row.get("category") or "").strip()
+        if not category:
+            raise ValueError("category is required")
+
+        amount = _to_cents(row["amount"])
+        saved = row.get("saved_amount")
+        saved = _to_cents(saved) if saved else 0
+    except KeyError as ex:
+        raise ValueError(f"Row {index}: missing {ex}") from None
+    except (ValueError, InvalidOperation) as ex:
+        raise ValueError(f"Row {index}: {ex}") from None
+
+    return (
+        tx_date.isoformat(),
+        category,
+        amount,
+        row.get("description") or "",
+        row.get("account") or "Cash",
+        row.get("tags") or "",
+        saved,
+    )
+
+_BULK_INSERT_SQL = (
+    "INSERT INTO transactions "
+    "(id, date, category, amount, description, account, tags, saved_amount, running_balance) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+def _insert_validated(db, batch: List[tuple]):
+    """
+    Write already validated rows (see _validate_bulk_row) in the caller's
+    session with a single executemany, then update tags, running balances
+    and the monthly rollup once for the whole batch. Does not commit.
+    """
+    # Per-month totals in cents: [income, expenses, saved, count]
+    rollup = defaultdict(lambda: [0, 0, 0, 0])
+    for tx_date, _, amount, _, _, _, saved in batch:
+        totals = rollup[tx_date[:7]]
+        if amount > 0:
+            totals[0] += amount
+        else:
+            totals[1] -= amount
+        totals[2] += saved
+        totals[3] += 1
+
+    # Values are already in storage form, so skip per-parameter type
+    # processing and hand the tuples straight to the driver's executemany.
+    # Ids are handed out up front so tag links need no RETURNING.
+    conn = db.connection()
+    # A write first: pysqlite only opens the DB transaction at the first
+    # DML, and the next id and last balance must be read inside it, or a
+    # writer on another connection could take the same ids in between
+    conn.exec_driver_sql("INSERT INTO search_index_paused (paused) VALUES (1)")
+    next_id = next_transaction_id(db)
+    last = db.execute(
+        select(Transaction.date, Transaction.running_balance)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(1)
+    ).first()
+    min_date = min(row[0] for row in batch)
+    _check_not_archived(db, date.fromisoformat(min_date))
+    # A batch that sorts entirely after the existing rows (new ids are
+    # larger, so ties on the last date still come after) can carry its
+    # running balances in the INSERT; otherwise rebuild from min_date.
+    appending = last is None or min_date >= last.date.isoformat()
+    balances = [0] * len(batch)
+    if appending:
+        balance = _to_cents(last.running_balance) if last else archived_closing_balance(db)
+        for offset in sorted(range(len(batch)), key=lambda o: batch[o][0]):
+            balance += batch[offset][2]
+            balances[offset] = balance
+    conn.exec_driver_sql(
+        _BULK_INSERT_SQL,
+        [(next_id + offset, *row, balances[offset]) for offset, row in enumerate(batch)],
+    )
+    conn.exec_driver_sql(
+        "INSERT INTO transactions_fts (rowid, description, category, tags) "
+        "SELECT id, description, category, tags FROM transactions WHERE id >= ?",
+        (next_id,),
+    )
+    conn.exec_driver_sql("DELETE FROM search_index_paused")
+
+    # A batch repeats a handful of tag strings, so each distinct string is
+    # split (and its tag ids looked up) once rather than once per row
+    tag_lists = {row[5]: None for row in batch if row[5]}
+    names = {name for raw in tag_lists for name in split_tags(raw)}
+    if names:
+        conn.exec_driver_sql("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(n,) for n in names])
+        tag_ids = dict(conn.exec_driver_sql("SELECT name, id FROM tags").fetchall())
+        for raw in tag_lists:
+            tag_lists[raw] = [(tag_ids[name], pos) for pos, name in enumerate(split_tags(raw))]
+        conn.exec_driver_sql(
+            "INSERT INTO transaction_tags (transaction_id, tag_id, position) VALUES (?, ?, ?)",
+            [
+                (next_id + offset, tag_id, pos)
+                for offset, row in enumerate(batch) if row[5]
+                for tag_id, pos in tag_lists[row[5]]
+            ],
+        )
+
+    if not appending:
+        rebuild_running_balances(db, date.fromisoformat(min_date))
+    events.record(db, events.TransactionsChanged(frozenset(rollup)))
+    columnar.track_insert(db, (
+        (next_id + offset, tx_date, amount, saved, category, tags)
+        for offset, (tx_date, category, amount, _, _, tags, saved) in enumerate(batch)
+    ))
+    _upsert_rollup(db, [
+        {
+            "month": month,
+            "income": Decimal(income).scaleb(-2),
+            "expenses": Decimal(expenses).scaleb(-2),
+            "saved": Decimal(saved).scaleb(-2),
+            "count": count,
+        }
+        for month, (income, expenses, saved, count) in rollup.items()
+    ])
+
+def add_transactions_bulk(rows: Iterable[dict]) -> int:
+    """
+    Insert many transactions in one DB transaction with a single executemany.
+    The whole batch is validated first (ValueError, nothing written), then
+    tags, running balances and the monthly rollup are updated once for the
+    batch instead of once per row. Returns the number of rows inserted.
+    """
+    batch = [_validate_bulk_row(i, row) for i, row in enumerate(rows)]
+    if not batch:
+        return 0
+    with SessionLocal() as db:
+        _insert_validated(db, batch)
         db.commit()
+    return len(batch)
 
-def get_all_transactions() -> List[Transaction]:
+def update_transaction(transaction_id: int, **fields):
     with SessionLocal() as db:
-        return db.query(Transaction).order_by(Transaction.date.desc()).all()
+        t = db.get(Transaction, transaction_id)
+        if not t:
+            return
+        old_date, old_amount, old_saved = t.date, t.amount, t.saved_amount
+        for k, v in fields.items():
+            # If updating 'amount', ensure it's a Decimal
+            if k == "amount":
+                v = Decimal(str(v))
+            if k == "tags":
+                set_transaction_tags(db, t, v)
+                continue
+            setattr(t, k, v)
+        _check_not_archived(db, old_date, t.date)
 
-def get_balance() -> Decimal:
+        if t.date != old_date or t.amount != old_amount:
+            # Take the row out at its old position, then place it at the new one
+            _shift_balances_after(db, old_date, t.id, -old_amount)
+            _place_transaction(db, t)
+        if (t.date, t.amount, t.saved_amount) != (old_date, old_amount, old_saved):
+            _apply_to_rollup(db, old_date, old_amount, old_saved, -1)
+            _apply_to_rollup(db, t.date, t.amount, t.saved_amount, 1)
+        columnar.track_delete(db, [t.id])
+        columnar.track_insert(db, [_columnar_row(t)])
+        events.record(db, events.TransactionsChanged(events.months_of([old_date, t.date])))
+        db.commit()
+
+def delete_transaction(transaction_id: int):
     with SessionLocal() as db:
-        total = db.scalar(select(func.coalesce(func.sum(Transaction.amount), 0)))
-        # Convert the SQLite result (float/int) back to Decimal
-        return Decimal(str(total)).quantize(Decimal('0.01'))
+        t = db.get(Transaction, transaction_id)
+        if t:
+            _shift_balances_after(db, t.date, t.id, -t.amount)
+            _apply_to_rollup(db, t.date, t.amount, t.saved_amount, -1)
+            columnar.track_delete(db, [t.id])
+            events.record(db, events.TransactionsChanged(events.months_of([t.date])))
+            db.delete(t)
+            db.commit()
+
+def get_all_transactions() -> List[TransactionRow]:
+    statement = select(*TRANSACTION_ROW_COLUMNS).order_by(Transaction.date.desc())
+    with ReadSession() as db:
+        transactions = _rows(db, statement)
+        archived = _archived_years(db)
+    for year in archived:
+        transactions.extend(_from_archive(year.year, statement))
+    return transactions
+
+def get_balance() -> Decimal:
+    return get_balance_as_of(None)
+
+def get_balance_as_of(as_of: date = None) -> Decimal:
+    store = columnar.get_store()
+    if store is not None:
+        return store.balance(as_of)
+    with ReadSession() as db:
+        balance = db.scalar(balance_query(as_of))
+        if balance is not None:
+            return balance
+        archived = _archived_years(db)
+
+    # Nothing live on/before `as_of`: the balance comes from the archived
+    # years, and only the year containing `as_of` needs its file opened
+    for year in archived:
+        if as_of is None or year.year < as_of.year:
+            return year.closing_balance
+        if year.year == as_of.year:
+            with archive_session(year.year) as adb:
+                balance = adb.scalar(balance_query(as_of))
+            if balance is not None:
+                return balance
+    return Decimal('0.00')
 
 def add_or_update_investment(name: str,
                              current_value: Decimal,
@@ -59,13 +610,15 @@ def add_or_update_investment(name: str,
                 target_year=target_year, 
                 notes=notes)
             db.add(inv)
+            db.flush()  # for its id
+        events.record(db, events.InvestmentsChanged(frozenset([inv.id])))
         db.commit()
 
-def get_investments():
-    with SessionLocal() as db:
-        return db.query(Investment).all()
+def get_investments() -> List[InvestmentRow]:
+    with ReadSession() as db:
+        return [InvestmentRow(*r) for r in db.execute(select(*INVESTMENT_ROW_COLUMNS))]
 
-def calculate_future_value(inv: Investment, extra_monthly: Decimal = Decimal('0')) -> Decimal:
+def calculate_future_value(inv: InvestmentRow, extra_monthly: Decimal = Decimal('0')) -> Decimal:
     today = date.today()
     years = inv.target_year - today.year
     if years <= 0:
@@ -96,105 +649,150 @@ def get_total_projected_wealth(target_year: int = None) -> Decimal:
             total += calculate_future_value(inv)
     return total
 
-def get_transactions_with_running_balance() -> List[dict]:
-    with SessionLocal() as db:
-        # Get all transactions ordered from OLDEST to NEWEST (for correct cumulative sum)
-        transactions = db.query(Transaction).order_by(Transaction.date.asc(), Transaction.id.asc()).all()
-        
-        running_balance = Decimal('0.00')
-        result = []
-        
-        for t in transactions:
-            # Convet t.amount (from DB) to Decimal to ensure math is precise
-            amt = Decimal(str(t.amount))
-            running_balance += amt
-            result.append({
-                "transaction": t,
-                "running_balance": running_balance.quantize(Decimal('0.01'))
-            })
-        
-        # Reverse so newest appears first (like current Diary tab)
-        result.reverse()
-        return result
-    
-def get_transactions_with_running_balance_date_to_date(from_date: date = None, to_date: date = None) -> List[dict]:
-    with SessionLocal() as db:
-        query = db.query(Transaction).order_by(Transaction.date.asc(), Transaction.id.asc())
-        if from_date:
-            query = query.filter(Transaction.date >= from_date)
-        if to_date:
-            query = query.filter(Transaction.date <= to_date)
-        transactions = query.all()
-
-        running_balance = Decimal('0.00')
-        result = []
-
-        for t in transactions:
-            amt = Decimal(str(t.amount))
-            running_balance += amt
-            result.append({
-                "transaction": t,
-                "running_balance": running_balance.quantize(Decimal('0.01'))
-            })
-
-        result.reverse()
-        return result
-
-def get_monthly_summary() -> List[dict]:
-    with SessionLocal() as db:
-        result = db.execute(text("""
-            SELECT 
-                strftime('%Y-%m', date) as month,
-                SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as income,
-                SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END) as expenses
-            FROM transactions 
-            GROUP BY strftime('%Y-%m', date)
-            ORDER BY month DESC
-            LIMIT 24
-        """))
-        
-        summary = []
-        for r in result.fetchall():
-            summary.append({
-                "month": r[0],
-                # Convert SQL floats to Strings then Decimals for absolute precision
-                "income": Decimal(str(r[1] or 0)).quantize(Decimal('0.01')),
-                "expenses": Decimal(str(r[2] or 0)).quantize(Decimal('0.01'))
-            })
-        return summary
-    
-def get_tag_summary(month: str = None) -> List[dict]:
+def get_transactions_with_running_balance() -> List[TransactionRow]:
+    return get_transactions_with_running_balance_date_to_date()
+
+def get_transactions_with_running_balance_date_to_date(from_date: date = None, to_date: date = None) -> List[TransactionRow]:
+    with ReadSession() as db:
+        # Newest first (like the Diary tab); balances are the stored prefix
+        # sums, so a date filter no longer restarts the balance at zero
+        transactions = _rows(db, running_balance_query(from_date, to_date))
+        archived = _archived_years(db, from_date, to_date)
+    for year in archived:
+        transactions.extend(_from_archive(year.year, running_balance_query(from_date, to_date)))
+    return transactions
+
+def get_transactions_page(cursor: tuple = None, limit: int = 50,
+                          from_date: date = None, to_date: date = None) -> dict:
+    """
+    Returns {"items": [{"transaction": TransactionRow, "running_balance"}, ...],
+             "next_cursor": (date, id) or None,
+             "opening_balance": balance before the oldest row on the page}.
+    Cost depends on `limit`, not on the size of the table. Once the live
+    rows run out, paging carries on into the archived years, newest first.
+    """
+    with ReadSession() as db:
+        rows = _rows(db, transactions_page_query(cursor, limit, from_date, to_date))
+        archived = _archived_years(db, from_date, to_date) if len(rows) <= limit else []
+    for year in archived:
+        if len(rows) > limit:
+            break
+        if cursor and year.year > cursor[0].year:
+            continue  # everything in it is newer than the cursor
+        # Archived rows all sort before the live ones, so the cursor still applies
+        rows.extend(_from_archive(year.year, transactions_page_query(cursor, limit - len(rows), from_date, to_date)))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last = rows[-1] if rows else None
+    return {
+        "items": [{"transaction": t, "running_balance": t.running_balance} for t in rows],
+        "next_cursor": (last.date, last.id) if has_more else None,
+        "opening_balance": last.running_balance - last.amount if last else None,
+    }
+
+def search_transactions(query: str, filters: dict = None, page: int = 0, page_size: int = 50) -> dict:
+    """
+    Full-text search over description, category and tags.
+    Returns {"items": [{"transaction": TransactionRow, "running_balance", "rank", "highlights"}, ...],
+             "page": page, "has_more": bool}.
+    "highlights" maps description/category/tags to the stored text with
+    HIGHLIGHT_START/HIGHLIGHT_END around each matched term.
+    """
+    match = fts_match_expression(query)
+    if match is None:
+        return {"items": [], "page": page, "has_more": False}
+
+    filters = filters or {}
+    # Each source (live table, archived years in range) ranks its own matches;
+    # the top (page + 1) * page_size + 1 of each is enough to merge this page
+    wanted = (page + 1) * page_size
+    with ReadSession() as db:
+        ranked = [(r.rank, None, r.rowid) for r in db.execute(search_transactions_query(match, filters, wanted))]
+        years = [y.year for y in _archived_years(db, filters.get("from_date"), filters.get("to_date"))]
+    for year in years:
+        with archive_session(year) as adb:
+            ranked.extend((r.rank, year, r.rowid) for r in adb.execute(search_transactions_query(match, filters, wanted)))
+    ranked.sort(key=lambda r: r[0])  # stable: live rows first on equal rank
+
+    ranked = ranked[page * page_size:wanted + 1]
+    has_more = len(ranked) > page_size
+    ranked = ranked[:page_size]
+
+    by_source = defaultdict(list)
+    for _, year, rowid in ranked:
+        by_source[year].append(rowid)
+    loaded = {}
+    for year, ids in by_source.items():
+        statement = select(*TRANSACTION_ROW_COLUMNS).where(Transaction.id.in_(ids))
+        if year is None:
+            with ReadSession() as db:
+                rows = _rows(db, statement)
+        else:
+            rows = _from_archive(year, statement)
+        loaded.update(((year, t.id), t) for t in rows)
+
+    # FTS5's highlight() would re-run the MATCH for every row, so the page is
+    # marked up here with the same prefix rule instead
+    words = [_fold(word) for word in re.findall(r"\w+", query)]
+    items = []
+    for rank, year, rowid in ranked:
+        t = loaded[(year, rowid)]
+        items.append({
+            "transaction": t,
+            "running_balance": t.running_balance,
+            "rank": rank,
+            "highlights": {
+                "description": highlight_matches(t.description, words),
+                "category": highlight_matches(t.category, words),
+                "tags": highlight_matches(t.tags, words),
+            },
+        })
+    return {"items": items, "page": page, "has_more": has_more}
+
+def get_monthly_summary(limit: int | None = 24) -> List[MonthSummary]:
+    """Newest month first. `limit=None` returns every month (CSV export)."""
+    store = columnar.get_store()
+    if store is not None:
+        return store.monthly_summary(limit)
+    with ReadSession() as db:
+        return [MonthSummary(*r) for r in db.execute(monthly_summary_query(limit))]
+
+def get_tag_summary(month: str = None) -> List[TagTotal]:
     target_month = month or date.today().strftime("%Y-%m")
-    
-    with SessionLocal() as db:
-        # 1. Fetch only the necessary columns for the target month
-        # We filter for amount < 0 to get only expenses
-        transactions = (
-            db.query(Transaction.tags, Transaction.amount)
-            .filter(
-                func.strftime('%Y-%m', Transaction.date) == target_month,
-                Transaction.amount < 0
-            )
-            .all()
-        )
+    store = columnar.get_store()
+    if store is not None:
+        return store.tag_summary(*month_bounds(target_month))
 
-        # 2. Aggregate tags using a dictionary
-        tag_map = defaultdict(Decimal)
-        for t_tags, t_amount in transactions:
-            if t_tags:
-                # Split comma-separated tags, strip whitespace, and ignore empty strings
-                tags = [tag.strip() for tag in t_tags.split(",") if tag.strip()]
-                for tag in tags:
-                    # Use abs() because we want to see expense totals as positive numbers
-                    tag_map[tag] += Decimal(str(abs(t_amount)))
-
-        # 3. Convert to the list of dicts your UI expects
-        return [
-            {"tag": tag, "total": total} 
-            for tag, total in sorted(tag_map.items(), key=lambda x: x[1], reverse=True)
-        ]
+    with ReadSession() as db:
+        # One GROUP BY over the tag join table; expenses only (amount < 0),
+        # negated so totals show as positive numbers, largest first
+        archived = db.get(ArchivedYear, int(target_month[:4])) is not None
+        if not archived:
+            rows = db.execute(tag_summary_query(target_month)).all()
+    if archived:
+        with archive_session(int(target_month[:4])) as adb:
+            rows = adb.execute(tag_summary_query(target_month)).all()
+    return [TagTotal(*r) for r in rows]
     
+def get_category_summary(month: str = None) -> List[CategoryTotal]:
+    """Expenses per category for `month` ('YYYY-MM', default this month), largest first."""
+    target_month = month or date.today().strftime("%Y-%m")
+    store = columnar.get_store()
+    if store is not None:
+        return store.category_summary(*month_bounds(target_month))
+    statement = category_summary_query(target_month)
+    with ReadSession() as db:
+        archived = db.get(ArchivedYear, int(target_month[:4])) is not None
+        if not archived:
+            rows = db.execute(statement).all()
+    if archived:
+        with archive_session(int(target_month[:4])) as adb:
+            rows = adb.execute(statement).all()
+    return [CategoryTotal(*r) for r in rows]
+
 def get_total_saved() -> Decimal:
-    with SessionLocal() as db:
-        total = db.query(func.sum(Transaction.saved_amount)).scalar()
-        return Decimal(str(total)) if total else Decimal('0.00')
\ No newline at end of file
+    store = columnar.get_store()
+    if store is not None:
+        return store.total_saved()
+    with ReadSession() as db:
+        return db.scalar(total_saved_query()) or Decimal('0.00')
\ No newline at end of file
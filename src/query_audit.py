@@ -0,0 +1,107 @@
+# src/query_audit.py
+"""
+EXPLAIN QUERY PLAN audit for the service read queries.
+
+Run it with:
+    python -m src.query_audit
+
+Exits non-zero when any audited query visits every row of a table that
+grows with the history: a "SCAN transactions" or "SCAN transaction_tags"
+step, with or without an index (walking a whole index is still O(n)). Such
+a scan only passes in a LIMIT query, where it is an ordered walk that stops
+early (the latest balance, a keyset page). Scans of the other tables are
+fine: they hold one row per month, tag or archived year.
+
+FULL_READS are queries that return every row by definition; their scans
+are reported but do not fail the audit.
+"""
+import sys
+from datetime import date
+from typing import List
+
+from .database import init_db
+from .models import (
+    balance_query,
+    running_balance_query,
+    transactions_page_query,
+    monthly_summary_query,
+    tag_summary_query,
+    category_summary_query,
+    total_saved_query,
+    search_transactions_query,
+    fts_match_expression,
+)
+
+# name -> statement, using representative arguments
+AUDITED_QUERIES = {
+    "get_balance": lambda: balance_query(),
+    "get_balance_as_of": lambda: balance_query(date(2024, 6, 30)),
+    "get_transactions_with_running_balance": lambda: running_balance_query(),
+    "get_transactions_with_running_balance_date_to_date": lambda: running_balance_query(
+        date(2024, 1, 1), date(2024, 12, 31)
+    ),
+    "get_transactions_page": lambda: transactions_page_query((date(2024, 6, 30), 1000), 50),
+    "get_monthly_summary": lambda: monthly_summary_query(),
+    "get_tag_summary": lambda: tag_summary_query(date.today().strftime("%Y-%m")),
+    "get_category_summary": lambda: category_summary_query(date.today().strftime("%Y-%m")),
+    "get_total_saved": lambda: total_saved_query(),
+    "search_transactions": lambda: search_transactions_query(fts_match_expression("spar milk")),
+    "search_transactions_filtered": lambda: search_transactions_query(
+        fts_match_expression("spar milk"), {"from_date": date(2024, 1, 1), "category": "Groceries"}
+    ),
+}
+
+# Tables that grow with the number of transactions
+GROWING_TABLES = ("transactions", "transaction_tags")
+
+# Every row with its balance, by definition; views use the date-range variant
+FULL_READS = {"get_transactions_with_running_balance"}
+
+
+def explain(conn, statement) -> List[str]:
+    """Return the plan detail lines for a Core statement."""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[3] for row in rows]
+
+
+def full_scans(plan: List[str], limited: bool = False) -> List[str]:
+    """
+    The steps of `plan` that read a whole table; see the module docstring.
+    limited: the statement has a LIMIT.
+    """
+    if limited:
+        return []
+    return [d for d in plan if d.startswith("SCAN ") and d.split()[1] in GROWING_TABLES]
+
+
+def audit_query_plans(bind=None) -> dict:
+    """
+    Returns {query name: [offending plan lines]} for every audited query
+    that reads a whole table, FULL_READS included. Empty dict means none does.
+    """
+    failures = {}
+    with (bind or init_db()).connect() as conn:
+        for name, build in AUDITED_QUERIES.items():
+            statement = build()
+            bad = full_scans(explain(conn, statement), limited=statement._limit_clause is not None)
+            if bad:
+                failures[name] = bad
+    return failures
+
+
+def main() -> int:
+    failures = audit_query_plans()
+    for name in AUDITED_QUERIES:
+        if name not in failures:
+            status = "ok"
+        else:
+            status = "full read" if name in FULL_READS else "FULL SCAN"
+        print(f"{status:<10} {name}")
+        for detail in failures.get(name, []):
+            print(f"           {detail}")
+    return 1 if failures.keys() - FULL_READS else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# src/rows.py
+"""
+Read-only row types returned by the query functions in src/models.py.
+
+The read paths select just the columns listed here with a Core select and
+build one NamedTuple per result row: no identity map, no per-row ORM state,
+no lazy loads. The rows are plain values, so they stay usable after the
+session closed and can be handed between threads. Writes still go through
+the ORM classes in src/database.py.
+
+benchmarks/bench_rows.py compares both ways on 100k rows.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+
+from .database import Transaction, Investment, Tag, transaction_tags
+
+
+class TransactionRow(NamedTuple):
+    id: int
+    date: date
+    category: str
+    amount: Decimal
+    description: str | None
+    account: str | None
+    tags: str | None
+    saved_amount: Decimal | None
+    running_balance: Decimal
+    # From transaction_tags, in the order the user typed them (what the tiles show)
+    tag_names: tuple = ()
+    # True on rows read from a per-year archive file (src/archive.py); those are read-only
+    archived: bool = False
+
+
+# The row's tag names in `position` order, joined with commas (tag names
+# never contain one: see split_tags) in a correlated subquery, so the names
+# come with the row instead of being re-split from `tags` on every render
+_ordered_tags = (
+    select(Tag.name)
+    .join(transaction_tags, transaction_tags.c.tag_id == Tag.id)
+    .where(transaction_tags.c.transaction_id == Transaction.id)
+    .order_by(transaction_tags.c.position)
+    .correlate(Transaction)
+    .subquery()
+)
+TAG_NAMES_COLUMN = select(func.group_concat(_ordered_tags.c.name, ",")).scalar_subquery().label("tag_names")
+
+# Column order matches TransactionRow; transaction_row() builds one
+TRANSACTION_ROW_COLUMNS = (
+    Transaction.id,
+    Transaction.date,
+    Transaction.category,
+    Transaction.amount,
+    Transaction.description,
+    Transaction.account,
+    Transaction.tags,
+    Transaction.saved_amount,
+    Transaction.running_balance,
+    TAG_NAMES_COLUMN,
+)
+
+
+def transaction_row(values, archived: bool = False) -> TransactionRow:
+    """TransactionRow from a TRANSACTION_ROW_COLUMNS result row."""
+    *columns, tag_names = values
+    return TransactionRow(*columns, tuple(tag_names.split(",")) if tag_names else (), archived)
+
+
+class InvestmentRow(NamedTuple):
+    id: int
+    name: str
+    current_value: Decimal
+    monthly_contribution: Decimal | None
+    expected_annual_return: Decimal | None
+    target_year: int | None
+    notes: str | None
+
+
+INVESTMENT_ROW_COLUMNS = (
+    Investment.id,
+    Investment.name,
+    Investment.current_value,
+    Investment.monthly_contribution,
+    Investment.expected_annual_return,
+    Investment.target_year,
+    Investment.notes,
+)
+
+
+class MonthSummary(NamedTuple):
+    month: str  # 'YYYY-MM'
+    income: Decimal
+    expenses: Decimal
+    saved: Decimal
+    count: int
+
+
+class TagTotal(NamedTuple):
+    tag: str
+    total: Decimal
+
+
+class CategoryTotal(NamedTuple):
+    category: str
+    total: Decimal
+
+
+class MonthTrend(NamedTuple):
+    month: str  # 'YYYY-MM'
+    expenses: Decimal
+    rolling_average: Decimal
+    last_year: Decimal | None  # same month a year earlier
+    change_pct: float | None  # against last_year
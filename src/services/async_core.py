@@ -0,0 +1,157 @@
+# src/services/async_core.py
+"""
+Async counterparts of every svc_* function in src/services/core.py, for UI
+handlers running on the Flet event loop.
+
+Reads run on DB_EXECUTOR, a small thread pool sized like the read-only
+connection pool, so a burst of refreshes queues up instead of opening
+more connections than the pool holds. Writes are awaited on the single
+database writer thread (src/db_writer.py). Either way the event loop only
+awaits; it never runs a query itself.
+
+Each svc_x_async(...) takes the same arguments as svc_x(...) and returns
+the same value.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import List
+
+from ..database import ENGINE_PROFILES, DEFAULT_ENGINE_PROFILE
+from ..rows import TransactionRow, InvestmentRow, MonthSummary, TagTotal, CategoryTotal, MonthTrend
+from ..db_writer import write_async
+from . import core
+
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=ENGINE_PROFILES[DEFAULT_ENGINE_PROFILE]["pool_size"],
+    thread_name_prefix="db-read",
+)
+
+
+async def _read(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+# -------------------------
+# Transactions
+# -------------------------
+
+async def svc_get_transactions_with_running_balance_async() -> List[TransactionRow]:
+    return await _read(core.svc_get_transactions_with_running_balance)
+
+async def svc_get_transactions_with_running_balance_date_to_date_async(from_date=None, to_date=None) -> List[TransactionRow]:
+    return await _read(core.svc_get_transactions_with_running_balance_date_to_date, from_date, to_date)
+
+async def svc_get_transactions_page_async(cursor=None, limit=50, from_date=None, to_date=None) -> dict:
+    return await _read(core.svc_get_transactions_page, cursor, limit, from_date, to_date)
+
+async def svc_search_transactions_async(query: str, filters: dict = None, page: int = 0, page_size: int = 50) -> dict:
+    return await _read(core.svc_search_transactions, query, filters, page, page_size)
+
+async def svc_get_all_transactions_async() -> List[TransactionRow]:
+    return await _read(core.svc_get_all_transactions)
+
+async def svc_add_transaction_async(date, category, amount, description="", tags="", saved_amount=0):
+    await write_async(core.svc_add_transaction, date, category, amount, description, tags, saved_amount)
+
+async def svc_add_transactions_bulk_async(rows) -> int:
+    return await write_async(core.svc_add_transactions_bulk, rows)
+
+async def svc_enqueue_transaction_async(date, category, amount, description="", tags="", saved_amount=0) -> int:
+    # Only a journal append once the queue has started, but its first use
+    # replays the journal, so keep it off the event loop all the same
+    return await asyncio.to_thread(
+        core.svc_enqueue_transaction, date, category, amount, description, tags, saved_amount
+    )
+
+async def svc_flush_write_behind_async() -> int:
+    return await asyncio.to_thread(core.svc_flush_write_behind)
+
+async def svc_update_transaction_async(transaction_id: int, **fields):
+    await write_async(core.svc_update_transaction, transaction_id, **fields)
+
+async def svc_delete_transaction_async(transaction_id: int):
+    await write_async(core.svc_delete_transaction, transaction_id)
+
+async def svc_get_balance_async() -> Decimal:
+    return await _read(core.svc_get_balance)
+
+async def svc_get_balance_as_of_async(as_of) -> Decimal:
+    return await _read(core.svc_get_balance_as_of, as_of)
+
+# -------------------------
+# Investments
+# -------------------------
+
+async def svc_get_investments_async() -> List[InvestmentRow]:
+    return await _read(core.svc_get_investments)
+
+async def svc_add_or_update_investment_async(
+    name: str,
+    current_value: Decimal,
+    monthly: Decimal = Decimal("0.00"),
+    return_rate: Decimal = Decimal("10.00"),
+    target_year: int = 2050,
+    notes: str = "",
+):
+    await write_async(
+        core.svc_add_or_update_investment, name, current_value, monthly, return_rate, target_year, notes
+    )
+
+async def svc_delete_investment_async(investment_id: int):
+    await write_async(core.svc_delete_investment, investment_id)
+
+async def svc_calculate_future_value_async(inv: InvestmentRow, extra_monthly: Decimal = Decimal("0.00")) -> Decimal:
+    return await _read(core.svc_calculate_future_value, inv, extra_monthly)
+
+async def svc_get_total_projected_wealth_async(target_year: int = None) -> Decimal:
+    return await _read(core.svc_get_total_projected_wealth, target_year)
+
+# -------------------------
+# Reporting
+# -------------------------
+
+async def svc_get_monthly_summary_async(limit=24) -> List[MonthSummary]:
+    return await _read(core.svc_get_monthly_summary, limit)
+
+async def svc_get_tag_summary_async() -> List[TagTotal]:
+    return await _read(core.svc_get_tag_summary)
+
+async def svc_get_category_summary_async(month: str = None) -> List[CategoryTotal]:
+    return await _read(core.svc_get_category_summary, month)
+
+async def svc_get_total_saved_async() -> Decimal:
+    return await _read(core.svc_get_total_saved)
+
+async def svc_get_monthly_trends_async(months: int = 12) -> List[MonthTrend]:
+    return await _read(core.svc_get_monthly_trends, months)
+
+async def svc_get_category_pivot_async(months: int = 6) -> dict:
+    return await _read(core.svc_get_category_pivot, months)
+
+async def svc_get_cache_stats_async() -> dict:
+    return core.svc_get_cache_stats()  # in memory, no query
+
+# -------------------------
+# Archive
+# -------------------------
+
+async def svc_archive_year_async(year: int) -> dict:
+    return await write_async(core.svc_archive_year, year)
+
+async def svc_get_archived_years_async() -> List[dict]:
+    return await _read(core.svc_get_archived_years)
+
+# -------------------------
+# Backups
+# -------------------------
+
+async def svc_backup_database_async() -> dict:
+    return await _read(core.svc_backup_database)
+
+async def svc_list_backups_async() -> List[dict]:
+    return await _read(core.svc_list_backups)
+
+async def svc_restore_backup_async(path: str) -> dict:
+    return await write_async(core.svc_restore_backup, path)
@@ -0,0 +1,155 @@
+# src/services/cache.py
+"""
+Result cache for the read-only svc_* functions in src/services/core.py.
+
+A single refresh_all asks for the balance, the projected wealth and the
+summaries several times over (the header, the Daily Fire popup, the
+Investments and Insights tabs), and nothing changes between those calls.
+Functions decorated with @cached keep their results in RESULT_CACHE, keyed
+by function and arguments; functions decorated with @mutates bump the
+cache's data generation when they return, which invalidates every result
+read before it. Between two writes a repeated read is a dict lookup.
+
+    @cached                    # result per (function, args)
+    @cached(daily=True)        # ... and per calendar day (uses date.today())
+    @mutates                   # a write: bump the generation afterwards
+
+Each entry remembers the generation it was computed under and only counts
+while that is still current, so a read that raced a write never stores a
+stale result as fresh. Concurrent misses on the same key share one call.
+Eviction is LRU beyond MAX_ENTRIES.
+
+Results are shared between callers: treat them as read-only.
+MORNINGMONEY_RESULT_CACHE=0 turns the cache off (every call computes).
+"""
+import functools
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+
+MAX_ENTRIES = 256
+ENABLED = os.environ.get("MORNINGMONEY_RESULT_CACHE", "1") != "0"
+
+
+class ResultCache:
+    """LRU map of key -> (generation, result) plus hit/miss counters."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._inflight = {}  # key -> (generation, Future) for calls running now
+        self._lock = threading.Lock()
+        self._stats = {}  # function name -> [hits, misses]
+        self.evictions = 0
+
+    def get(self, name: str, key, compute):
+        """The cached result for key, or compute() (stored if no write happened meanwhile)."""
+        with self._lock:
+            counts = self._stats.setdefault(name, [0, 0])
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.generation:
+                self._entries.move_to_end(key)
+                counts[0] += 1
+                return entry[1]
+            running = self._inflight.get(key)
+            if running is not None and running[0] == self.generation:
+                # Someone is computing it under the current generation: wait for theirs
+                counts[0] += 1
+                future = running[1]
+            else:
+                counts[1] += 1
+                generation, future = self.generation, Future()
+                self._inflight[key] = (generation, future)
+                running = None
+        if running is not None:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key, (None, None))[1] is future:
+                    del self._inflight[key]
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (generation, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(result)
+        return result
+
+    def bump(self):
+        """The data changed: every cached result is out of date."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._inflight.clear()
+
+    def stats(self) -> dict:
+        """{"hits", "misses", "hit_rate", "entries", "generation", "evictions", "functions": {name: (hits, misses)}}"""
+        with self._lock:
+            hits = sum(h for h, _ in self._stats.values())
+            misses = sum(m for _, m in self._stats.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": len(self._entries),
+                "generation": self.generation,
+                "evictions": self.evictions,
+                "functions": {name: tuple(counts) for name, counts in sorted(self._stats.items())},
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+            self.evictions = 0
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached(fn=None, *, daily: bool = False):
+    """Cache fn's result in RESULT_CACHE; daily=True for results that depend on today's date."""
+    if fn is None:
+        return functools.partial(cached, daily=daily)
+    name = fn.__name__
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return fn(*args, **kwargs)
+        # Bound with defaults, so f(), f(24) and f(limit=24) share one entry
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name, tuple(bound.arguments.items()), date.today() if daily else None)
+        try:
+            hash(key)
+        except TypeError:  # unhashable arguments: not cacheable
+            return fn(*args, **kwargs)
+        return RESULT_CACHE.get(name, key, lambda: fn(*args, **kwargs))
+
+    wrapper.uncached = fn
+    return wrapper
+
+
+def mutates(fn):
+    """fn changes the data: invalidate the cached results once it returns (or fails part way)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            RESULT_CACHE.bump()
+
+    return wrapper
@@ -3,35 +3,66 @@ from typing import List
 from decimal import Decimal
 from ..models import (
     add_transaction,
+    add_transactions_bulk,
+    update_transaction,
+    delete_transaction,
     get_all_transactions,
     get_balance,
+    get_balance_as_of,
     add_or_update_investment,
     get_investments,
     calculate_future_value,
     get_total_projected_wealth,
     get_monthly_summary,
     get_tag_summary,
+    get_category_summary,
     get_transactions_with_running_balance,
     get_transactions_with_running_balance_date_to_date,
+    get_transactions_page,
+    search_transactions,
     get_total_saved,
-    Transaction,
-    Investment,
+    get_archived_years,
 )
-from ..database import SessionLocal
+from ..database import SessionLocal, Investment
+from ..rows import TransactionRow, InvestmentRow, MonthSummary, TagTotal, CategoryTotal, MonthTrend
+from ..db_writer import run_write
+from ..archive import archive_year
+from ..backup import backup_database, list_backups, restore_backup
+from ..write_behind import get_write_behind_queue
+from .. import analytics, events
+from .cache import RESULT_CACHE, cached, mutates
+
+# Commits outside a @mutates call (write-behind batches, the JSON import)
+# invalidate the cached results too; subscribed first, before any view
+events.subscribe(lambda change: RESULT_CACHE.bump())
 
 # -------------------------
 # Transactions
 # -------------------------
+# Writes go through the single database writer thread (src/db_writer.py) and
+# block until it has run them; reads use the read-only connection pool.
 
-def svc_get_transactions_with_running_balance() -> List[dict]:
+def svc_get_transactions_with_running_balance() -> List[TransactionRow]:
     return get_transactions_with_running_balance()
 
-def svc_get_transactions_with_running_balance_date_to_date(from_date=None, to_date=None) -> List[dict]:
+def svc_get_transactions_with_running_balance_date_to_date(from_date=None, to_date=None) -> List[TransactionRow]:
     return get_transactions_with_running_balance_date_to_date(from_date, to_date)
 
-def svc_get_all_transactions() -> List[Transaction]:
+def svc_get_transactions_page(cursor=None, limit=50, from_date=None, to_date=None) -> dict:
+    return get_transactions_page(cursor, limit, from_date, to_date)
+
+def svc_search_transactions(query: str, filters: dict = None, page: int = 0, page_size: int = 50) -> dict:
+    """
+    Ranked full-text search over description, category and tags.
+    filters: optional from_date, to_date, category, account.
+    Returns {"items", "page", "has_more"}; see models.search_transactions.
+    """
+    return search_transactions(query, filters, page, page_size)
+
+def svc_get_all_transactions() -> List[TransactionRow]:
     return get_all_transactions()
 
+@mutates
 def svc_add_transaction(date,
                         category,
                         amount,
@@ -39,7 +70,8 @@ def svc_add_transaction(date,
                         tags="",
                         saved_amount=0):
     # Ensure amount is a Decimal string-conversion safe
-    add_transaction(
+    run_write(
+        add_transaction,
         date=date,
         category=category,
         amount=Decimal(str(amount)),
@@ -49,34 +81,74 @@ def svc_add_transaction(date,
     )
     # Add helper: svc_get_tags_for_transaction(id) if needed later.
 
+@mutates
+def svc_add_transactions_bulk(rows) -> int:
+    """
+    rows: iterable of dicts with date, category, amount and optional
+    description, account, tags, saved_amount. All-or-nothing.
+    """
+    return run_write(add_transactions_bulk, rows)
+
+def svc_enqueue_transaction(date,
+                            category,
+                            amount,
+                            description="",
+                            tags="",
+                            saved_amount=0) -> int:
+    """
+    Write-behind add (src/write_behind.py): validates and journals the row,
+    returns at once; the row is committed with the next batch. ValueError
+    if the row is invalid. Returns the row's journal sequence number.
+    """
+    return get_write_behind_queue().enqueue({
+        "date": date,
+        "category": category,
+        "amount": Decimal(str(amount)),
+        "description": description,
+        "tags": tags,
+        "saved_amount": Decimal(str(saved_amount)),
+    })
+
+def svc_flush_write_behind() -> int:
+    """Commit the pending write-behind rows now. Returns rows inserted."""
+    return get_write_behind_queue().flush()
+
+def svc_on_write_behind_commit(callback):
+    """callback(rows) after each write-behind batch commit (on the writer thread)."""
+    return get_write_behind_queue().subscribe(callback)
+
+def svc_on_change(callback, *event_types):
+    """
+    callback(event) after each commit that changed data (src/events.py), on
+    the committing thread; only for `event_types` if given. Returns an unsubscribe function.
+    """
+    return events.subscribe(callback, *event_types)
+
+@mutates
 def svc_update_transaction(transaction_id: int, **fields):
-    with SessionLocal() as db:
-        t = db.get(Transaction, transaction_id) # Using modern .get() for simplicity
-        if t:
-            for k, v in fields.items():
-                # If updating 'amount', ensure it's a Decimal
-                if k == "amount":
-                    v = Decimal(str(v))
-                setattr(t, k, v)
-            db.commit()
+    run_write(update_transaction, transaction_id, **fields)
 
+@mutates
 def svc_delete_transaction(transaction_id: int):
-    with SessionLocal() as db:
-        t = db.get(Transaction, transaction_id)
-        if t:
-            db.delete(t)
-            db.commit()
+    run_write(delete_transaction, transaction_id)
 
+@cached
 def svc_get_balance() -> Decimal:
     return get_balance()
 
+@cached
+def svc_get_balance_as_of(as_of) -> Decimal:
+    return get_balance_as_of(as_of)
+
 # -------------------------
 # Investments
 # -------------------------
 
-def svc_get_investments() -> List[Investment]:
+@cached
+def svc_get_investments() -> List[InvestmentRow]:
     return get_investments()
 
+@mutates
 def svc_add_or_update_investment(
     name: str,
     current_value: Decimal,
@@ -86,7 +158,8 @@ def svc_add_or_update_investment(
     notes: str = "",
 ):
     # Enforce Decimal types on all currency/rate inputs
-    add_or_update_investment(
+    run_write(
+        add_or_update_investment,
         name=name,
         current_value=Decimal(str(current_value)),
         monthly=Decimal(str(monthly)),
@@ -95,16 +168,22 @@ def svc_add_or_update_investment(
         notes=notes,
     )
 
-def svc_delete_investment(investment_id: int):
+def _delete_investment(investment_id: int):
     with SessionLocal() as db:
         inv = db.get(Investment, investment_id)
         if inv:
             db.delete(inv)
+            events.record(db, events.InvestmentsChanged(frozenset([investment_id])))
             db.commit()
 
-def svc_calculate_future_value(inv: Investment, extra_monthly: Decimal = Decimal("0.00")) -> Decimal:
+@mutates
+def svc_delete_investment(investment_id: int):
+    run_write(_delete_investment, investment_id)
+
+def svc_calculate_future_value(inv: InvestmentRow, extra_monthly: Decimal = Decimal("0.00")) -> Decimal:
     return calculate_future_value(inv, Decimal(str(extra_monthly)))
 
+@cached(daily=True)
 def svc_get_total_projected_wealth(target_year: int = None) -> Decimal:
     return get_total_projected_wealth(target_year)
 
@@ -112,11 +191,59 @@ def svc_get_total_projected_wealth(target_year: int = None) -> Decimal:
 # Reporting
 # -------------------------
 
-def svc_get_monthly_summary():
-    return get_monthly_summary()
+@cached
+def svc_get_monthly_summary(limit=24) -> List[MonthSummary]:
+    return get_monthly_summary(limit)
 
-def svc_get_tag_summary():
+@cached(daily=True)
+def svc_get_tag_summary() -> List[TagTotal]:
     return get_tag_summary()
 
+@cached(daily=True)
+def svc_get_category_summary(month: str = None) -> List[CategoryTotal]:
+    return get_category_summary(month)
+
+@cached
 def svc_get_total_saved() -> Decimal:
     return get_total_saved()
+
+@cached(daily=True)
+def svc_get_monthly_trends(months: int = 12) -> List[MonthTrend]:
+    return analytics.monthly_trends(months)
+
+@cached(daily=True)
+def svc_get_category_pivot(months: int = 6) -> dict:
+    return analytics.category_pivot(months)
+
+def svc_get_cache_stats() -> dict:
+    """Hit/miss counts of the read result cache (src/services/cache.py)."""
+    return RESULT_CACHE.stats()
+
+# -------------------------
+# Archive
+# -------------------------
+
+@mutates
+def svc_archive_year(year: int) -> dict:
+    """Move a closed year's transactions into data/archive/finance_<year>.db."""
+    return run_write(archive_year, int(year))
+
+@cached
+def svc_get_archived_years() -> List[dict]:
+    return get_archived_years()
+
+# -------------------------
+# Backups
+# -------------------------
+
+def svc_backup_database() -> dict:
+    """Verified online backup into data/backups/ (blocking; see backup.start_backup)."""
+    return backup_database()
+
+def svc_list_backups() -> List[dict]:
+    return list_backups()
+
+@mutates
+def svc_restore_backup(path: str) -> dict:
+    # On the writer thread, so no write runs while the file is replaced
+    return run_write(restore_backup, path)
@@ -1,6 +1,8 @@
 # src/services/investments.py
 from typing import List
-from ..database import Investment
+from ..rows import InvestmentRow
+from .cache import mutates
+from ..db_writer import run_write
 from ..models import (
     add_or_update_investment,
     get_investments as _get_investment,
@@ -9,13 +11,14 @@ from ..models import (
 )
 from decimal import Decimal
 
+@mutates
 def add_or_update(name: str, current_value: Decimal, monthly: Decimal = 0, return_rate: Decimal = 10.0, target_year: int = 2050, notes: str = ""):
-    add_or_update_investment(name=name, current_value=current_value, monthly=monthly, return_rate=return_rate, target_year=target_year, notes=notes)
+    run_write(add_or_update_investment, name=name, current_value=current_value, monthly=monthly, return_rate=return_rate, target_year=target_year, notes=notes)
 
-def get_investments() -> List[Investment]:
+def get_investments() -> List[InvestmentRow]:
     return _get_investment()
 
-def calculate_future_value_for(inv: Investment, extra_monthly: Decimal = 0) -> Decimal:
+def calculate_future_value_for(inv: InvestmentRow, extra_monthly: Decimal = 0) -> Decimal:
     return _calculate_future_value(inv, extra_monthly)
 
 def get_total_projected_wealth(target_year: int = None) -> Decimal:
@@ -22,6 +22,15 @@ def get_force_mobile(session):
     except (KeyError, TypeError):
         return False
 
+def set_write_behind(session, value: bool):
+    session.set("write_behind", value)
+
+def get_write_behind(session):
+    try:
+        return session["write_behind"]
+    except (KeyError, TypeError):
+        return False
+
 async def init_theme(page: ft.Page):  # Removed async—client_storage is sync now
     """
     Initialize theme on app startup.
@@ -1,20 +1,24 @@
 # src/services/transactions.py
 from typing import List
+from ..db_writer import run_write
 from ..models import (
     add_transaction as _add_transaction,
     get_all_transactions as _get_all_transactions,
     get_balance as _get_balance,
     get_monthly_summary as _get_monthly_summary,
 )
-from ..database import Transaction
+from ..rows import TransactionRow
+from .cache import mutates
 from decimal import Decimal
 
 
 # Service layer — provides a stable API for UI and prevents direct model imports.
 
+@mutates
 def add_new_transaction(date, category: str, amount: Decimal, description: str = ""):
     """Add a new transaction through the model layer."""
-    return _add_transaction(
+    return run_write(
+        _add_transaction,
         date=date,
         category=category,
         amount=amount,
@@ -22,7 +26,7 @@ def add_new_transaction(date, category: str, amount: Decimal, description: str =
     )
 
 
-def get_all_transactions() -> List[Transaction]:
+def get_all_transactions() -> List[TransactionRow]:
     """Return all transactions."""
     return _get_all_transactions()
 
@@ -0,0 +1,243 @@
+# src/write_behind.py
+"""
+Optional write-behind mode for fast data entry.
+
+enqueue(row) validates a transaction row, appends it to a journal file and
+returns at once; the row is committed later together with whatever else
+arrived in the meantime, FLUSH_INTERVAL_S after the first pending row or as
+soon as FLUSH_ROWS are pending. A batch is one job on the database writer
+(src/db_writer.py) going through the bulk insert path, so back-to-back
+entries share one commit, and listeners (the UI refresh) run once per batch
+instead of once per row.
+
+Crash safety: every row reaches the journal (one JSON line with a sequence
+number) before enqueue returns. The batch commit also records the highest
+sequence it contains in write_behind_progress, in the same DB transaction.
+On start, recover() replays journal lines above that marker, so a row is
+never lost or committed twice. The journal is emptied whenever nothing is
+pending. Lines are flushed to the OS, not fsynced: like synchronous=NORMAL
+for the database, a crash of the app loses nothing, a power cut can lose
+the last moments.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, List, Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .database import DB_PATH, ReadSession, SessionLocal, WriteBehindProgress
+from .db_writer import run_write, submit_write
+from .models import _check_not_archived, _insert_validated, _validate_bulk_row
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "write_behind.journal")
+FLUSH_INTERVAL_S = 0.05
+FLUSH_ROWS = 500
+
+
+class WriteBehindQueue:
+    """Journal + pending list + timer; see the module docstring."""
+
+    def __init__(self, journal_path: str = JOURNAL_PATH,
+                 flush_interval: float = FLUSH_INTERVAL_S, flush_rows: int = FLUSH_ROWS):
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self._journal_name = os.path.basename(journal_path)
+        self._lock = threading.Lock()
+        self._pending = []       # [(seq, validated row)]
+        self._next_seq = None    # set by recover(), which runs first (get_write_behind_queue)
+        self._journal = None
+        self._timer = None
+        self._listeners = []
+        self._held_through = None  # year being archived, see held_back()
+
+    # ---- listeners ----
+
+    def subscribe(self, callback: Callable[[int], None]) -> Callable[[], None]:
+        """
+        callback(rows_committed) runs on the writer thread after each batch
+        commit. Returns a function that unsubscribes it.
+        """
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback) if callback in self._listeners else None
+
+    def _notify(self, count: int):
+        for callback in list(self._listeners):
+            try:
+                callback(count)
+            except Exception as ex:
+                logging.error(f"Write-behind listener failed: {ex}")
+
+    # ---- journal ----
+
+    def _read_journal(self) -> List[tuple]:
+        entries = []
+        if not os.path.exists(self.journal_path):
+            return entries
+        with open(self.journal_path, "r", encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line torn by a crash was never acknowledged
+                entries.append((entry["seq"], tuple(entry["row"])))
+        return entries
+
+    def _truncate_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+
+    # ---- commit ----
+
+    def _committed_seq(self, db) -> int:
+        progress = db.get(WriteBehindProgress, self._journal_name)
+        return progress.committed_seq if progress else 0
+
+    def _commit_batch(self, db, batch: List[tuple]) -> int:
+        """Insert `batch` and move the marker, in the caller's session. Returns rows inserted."""
+        # Rows were validated on enqueue, and archive_year commits pending
+        # rows before it starts (held_back); still, another process (the
+        # maintenance CLI) may have archived the year since, and one such
+        # row must not sink the rest of the batch.
+        rows = []
+        for seq, row in batch:
+            try:
+                _check_not_archived(db, date.fromisoformat(row[0]))
+            except ValueError as ex:
+                logging.error(f"Write-behind row {seq} dropped: {ex}")
+                continue
+            rows.append(row)
+        if rows:
+            _insert_validated(db, rows)
+        db.execute(
+            sqlite_insert(WriteBehindProgress)
+            .values(journal=self._journal_name, committed_seq=batch[-1][0])
+            .on_conflict_do_update(index_elements=["journal"], set_={"committed_seq": batch[-1][0]})
+        )
+        return len(rows)
+
+    def recover(self) -> int:
+        """
+        Replay journal rows that were acknowledged but never committed and
+        reset the journal. Runs on the writer thread; returns rows replayed.
+        """
+        def replay():
+            with SessionLocal() as db:
+                committed = self._committed_seq(db)
+                entries = self._read_journal()
+                pending = [(seq, row) for seq, row in entries if seq > committed]
+                inserted = self._commit_batch(db, pending) if pending else 0
+                db.commit()
+            with self._lock:
+                self._next_seq = max([committed] + [seq for seq, _ in entries]) + 1
+                self._truncate_journal()
+            if inserted:
+                logging.info(f"Write-behind journal: {inserted} rows recovered")
+            return inserted
+
+        inserted = run_write(replay)
+        if inserted:
+            self._notify(inserted)
+        return inserted
+
+    def _flush_job(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._timer = None
+        if not batch:
+            return 0
+        with SessionLocal() as db:
+            inserted = self._commit_batch(db, batch)
+            db.commit()
+        with self._lock:
+            if not self._pending:
+                self._truncate_journal()
+        self._notify(inserted)
+        return inserted
+
+    # ---- public ----
+
+    def enqueue(self, row: dict) -> int:
+        """
+        Validate `row` (same keys as svc_add_transactions_bulk; ValueError if
+        bad or in an archived year), journal it and schedule its commit. Returns its sequence number.
+        """
+        validated = _validate_bulk_row(0, row)
+        with ReadSession() as db:
+            _check_not_archived(db, date.fromisoformat(validated[0]))
+        with self._lock:
+            if self._held_through is not None and int(validated[0][:4]) <= self._held_through:
+                raise ValueError(f"Transactions up to {self._held_through} are being archived")
+            seq = self._next_seq
+            self._next_seq += 1
+            self._journal.write(json.dumps({"seq": seq, "row": validated}) + "\n")
+            self._journal.flush()
+            self._pending.append((seq, validated))
+            if len(self._pending) >= self.flush_rows:
+                self._schedule(0)
+            elif self._timer is None:
+                self._schedule(self.flush_interval)
+        return seq
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        if delay <= 0:
+            self._timer = None
+            submit_write(self._flush_job)
+            return
+        self._timer = threading.Timer(delay, submit_write, args=(self._flush_job,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    @contextmanager
+    def held_back(self, year: int):
+        """
+        For archive_year: commit every pending row now, and refuse new rows
+        dated in or before `year` until the block ends. A row acknowledged
+        for that year could otherwise reach the commit only after the year
+        was archived, and have nowhere to go.
+        """
+        with self._lock:
+            self._held_through = year
+        try:
+            self.flush()
+            yield
+        finally:
+            with self._lock:
+                self._held_through = None
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Commit everything pending now and wait for it. Returns rows inserted."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return run_write(self._flush_job)
+
+
+_queue: Optional[WriteBehindQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """The app's write-behind queue, created (and its journal recovered) on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = WriteBehindQueue()
+                queue.recover()
+                atexit.register(queue.flush)
+                _queue = queue
+    return _queue
@@ -2,7 +2,7 @@
 import flet as ft
 from datetime import date as dt_date
 from decimal import Decimal
-from src.database import Investment
+from src.rows import InvestmentRow
 from src.services.core import svc_calculate_future_value
 from controls.dialogs import edit_investment_dialog, delete_investment
 from ui.components.investment_form import investment_form  # ← new connection
@@ -15,7 +15,7 @@ ON_TRACK_COLOR = "#ffaa00"            # warm orange
 CARD_BG = "#1e1e2e"
 
 
-def _build_card_content(inv: Investment) -> ft.Column:
+def _build_card_content(inv: InvestmentRow) -> ft.Column:
     """Core content - reusable & testable"""
     try:
         fv = svc_calculate_future_value(inv)
@@ -57,7 +57,7 @@ def _build_card_content(inv: Investment) -> ft.Column:
 
 
 def investment_card(
-    investment: Investment,
+    investment: InvestmentRow,
     page: ft.Page,
     refresh_all,
 ) -> ft.Card:
@@ -1,12 +1,12 @@
 # ui/components/investment_card_mobile.py
 import flet as ft
-from src.database import Investment
+from src.rows import InvestmentRow
 from controls.dialogs import edit_investment_dialog, delete_investment
 from ui.components.investment_card import _investment_card_content
 
 
 def investment_card_mobile(
-    investment: Investment,
+    investment: InvestmentRow,
     page: ft.Page,
     refresh_all,
 ) -> ft.Card:
@@ -4,7 +4,7 @@ import flet as ft
 from datetime import date as dt_date
 from decimal import Decimal, InvalidOperation
 
-from src.services.core import svc_add_or_update_investment
+from src.services.async_core import svc_add_or_update_investment_async
 
 
 def investment_form(page: ft.Page, refresh_all=None, existing_inv=None):
@@ -131,7 +131,7 @@ def investment_form(page: ft.Page, refresh_all=None, existing_inv=None):
             if year_val < dt_date.today().year + 1:
                 raise ValueError("Target year must be future")
 
-            svc_add_or_update_investment(
+            await svc_add_or_update_investment_async(
                 name=name_val,
                 current_value=curr_val,
                 monthly=mon_val,
@@ -0,0 +1,38 @@
+# ui/components/lazy_tab.py
+import inspect
+import flet as ft
+
+
+class LazyTab(ft.Container):
+    """
+    Stand-in for a tab in the layouts: the real tab (tab_class(*args)) is
+    only constructed, and its controls built, by the first refresh(), which
+    main.py runs when the tab is first shown. Until then it is an empty
+    container.
+    """
+
+    def __init__(self, tab_class, *args):
+        super().__init__(expand=True)
+        self.tab_class = tab_class
+        self._args = args
+        self.tab = None
+
+    @property
+    def CHANGE_EVENTS(self):
+        # The tab's own list; no list means every change event
+        return getattr(self.tab_class, "CHANGE_EVENTS", object)
+
+    def build_tab(self):
+        if self.tab is None:
+            self.tab = self.tab_class(*self._args)
+            self.content = self.tab
+            try:
+                self.update()  # send the new subtree before the tab updates parts of it
+            except Exception:
+                pass  # not on the page yet; the next page.update() sends it
+        return self.tab
+
+    async def refresh(self):
+        result = getattr(self.build_tab(), "refresh", lambda: None)()
+        if inspect.isawaitable(result):
+            await result
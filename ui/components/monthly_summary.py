@@ -2,15 +2,15 @@
 import flet as ft
 import csv
 from decimal import Decimal
-from src.services.core import svc_get_monthly_summary
+from src.services.async_core import svc_get_monthly_summary_async
 from controls.common import money_text
 
-def get_monthly_summary_view(page: ft.Page):
+async def get_monthly_summary_view(page: ft.Page):
     # Returns a container with the Desktop table and a Download button
     # 1. Setup FilePicker for saving CSV
-    def on_save_result(e: ft.FilePickerResultEvent):
+    async def on_save_result(e: ft.FilePickerResultEvent):
         if e.path:
-            summaries = svc_get_monthly_summary()
+            summaries = await svc_get_monthly_summary_async(limit=None)  # every month, straight from the rollup
             try:
                 with open(e.path, "w", newline="") as f:
                     writer = csv.writer(f)
@@ -18,33 +18,32 @@ def get_monthly_summary_view(page: ft.Page):
                     writer.writerow(["Month", "Income", "Expenses", "Net"])
 
                     for s in summaries:
-                        inc = Decimal(str(s['income']))
-                        exp = Decimal(str(str['expenses']))
+                        inc = Decimal(str(s.income))
+                        exp = Decimal(str(s.expenses))
                         net = inc - exp
                         # Write row with formatted Decimals
                         writer.writerow([
-                            s['month'],
+                            s.month,
                             f"{inc:.2f}",
                             f"{exp:.2f}",
                             f"{net:.2f}"
                         ])
-                page.show_snack(f"Exported to {e.path}", "green")
+                await page.show_snack(f"Exported to {e.path}", "green")
             except Exception as ex:
-                page.show_snack(f"Export failed: {str(ex)}", "red")
+                await page.show_snack(f"Export failed: {str(ex)}", "red")
 
     file_picker = ft.FilePicker(on_result=on_save_result)
     page.overlay.append(file_picker)
 
     # 2. Build the DataTable (using your Decimal principles)
-    def build_table():
-        summaries = svc_get_monthly_summary()
+    def build_table(summaries):
         rows = []
         for s in summaries:
-            inc = Decimal(str(s['income']))
-            exp = Decimal(str(s['expenses']))
+            inc = Decimal(str(s.income))
+            exp = Decimal(str(s.expenses))
             net = inc - exp
             rows.append(ft.DataRow(cells=[
-                ft.DataCell(ft.Text(s['month'])),
+                ft.DataCell(ft.Text(s.month)),
                 ft.DataCell(ft.Text(f"R{inc:,.2f}", color="green")),
                 ft.DataCell(ft.Text(f"R{-exp:,.2f}", color="red")),
                 ft.DataCell(ft.Text(f"R{net:,.2f}", weight="bold"))
@@ -76,24 +75,23 @@ def get_monthly_summary_view(page: ft.Page):
             )
         ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
         ft.Divider(),
-        build_table()
+        build_table(await svc_get_monthly_summary_async())
     ], spacing=20, expand=True)
 
-def monthly_summary_table() -> ft.DataTable:
-    # 1. Fetch summaries (List of dicts containing Decimal objects)
-    summaries = svc_get_monthly_summary()
+def monthly_summary_table(summaries: list) -> ft.DataTable:
+    # 1. summaries: svc_get_monthly_summary() rows (MonthSummary tuples of Decimals)
     rows = []
 
     for summary in summaries:
         # 2. Ensure Decimal math for the Net column
-        income = Decimal(str(summary.get('income', '0.00')))
-        expenses = Decimal(str(summary.get('expenses', '0.00')))
+        income = Decimal(str(summary.income))
+        expenses = Decimal(str(summary.expenses))
         net = income - expenses
 
         rows.append(
             ft.DataRow(cells=[
                 # Month string
-                ft.DataCell(ft.Text(summary['month'], weight="w500")),
+                ft.DataCell(ft.Text(summary.month, weight="w500")),
                 
                 # Income
                 ft.DataCell(money_text(income, size=14)),
@@ -124,8 +122,8 @@ def monthly_summary_table() -> ft.DataTable:
         column_spacing=40, # Added spacing for wider screens
     )
 
-def monthly_summary_mobile() -> ft.ListView:
-    summaries = svc_get_monthly_summary()  # List of dicts
+def monthly_summary_mobile(summaries: list) -> ft.ListView:
+    # summaries: svc_get_monthly_summary() rows (MonthSummary tuples)
     
     # We use a ListView so the user can scroll through the months easily
     lv = ft.ListView(expand=True, spacing=10, padding=10)
@@ -136,8 +134,8 @@ def monthly_summary_mobile() -> ft.ListView:
 
     for summary in summaries:
         # Calculate Net using Decimal math
-        income = Decimal(str(summary.get('income', 0)))
-        expenses = Decimal(str(summary.get('expenses', 0)))
+        income = Decimal(str(summary.income))
+        expenses = Decimal(str(summary.expenses))
         net = income - expenses
 
         # Create a "Card" for each month
@@ -145,7 +143,7 @@ def monthly_summary_mobile() -> ft.ListView:
             content=ft.Column([
                 # Header: Month and Net Balance
                 ft.Row([
-                    ft.Text(summary['month'], size=18, weight="bold"),
+                    ft.Text(summary.month, size=18, weight="bold"),
                     money_text(net, size=18)
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 
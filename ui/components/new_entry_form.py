@@ -2,9 +2,9 @@
 import flet as ft
 from datetime import date as dt_date, datetime, timezone
 from decimal import Decimal, InvalidOperation
-import asyncio
 
-from src.services.core import svc_add_transaction
+from src.services.async_core import svc_add_transaction_async, svc_enqueue_transaction_async
+from src.services.settings import get_write_behind
 from controls.common import money_text
 
 
@@ -349,8 +349,11 @@ def new_entry_form(page: ft.Page, refresh_all) -> ft.Control:
                 except Exception:
                     saved_amount = Decimal("0.00")
 
-            await asyncio.to_thread(
-                svc_add_transaction,
+            # Fast entry: acknowledged once journaled; the tabs refresh when
+            # the batch commits (main.py subscribes refresh_all to it)
+            write_behind = get_write_behind(page.session)
+            add = svc_enqueue_transaction_async if write_behind else svc_add_transaction_async
+            await add(
                 date=entry_date,
                 category=category_dropdown.value,
                 amount=final_amt,
@@ -364,7 +367,7 @@ def new_entry_form(page: ft.Page, refresh_all) -> ft.Control:
             notes.value = ""
             tags.value = ""
             await set_date_to(dt_date.today(), do_update=True)
-            if refresh_all:
+            if refresh_all and not write_behind:
                 await refresh_all()
             page.update()
 
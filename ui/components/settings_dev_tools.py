@@ -5,7 +5,10 @@ from src.services.settings import (
     set_force_mobile,
     get_force_desktop,
     get_force_mobile,
+    set_write_behind,
+    get_write_behind,
 )
+from src.services.core import svc_get_cache_stats
 
 def settings_dev_tools(page: ft.Page, refresh_all=None) -> ft.Column:
     force_desktop = get_force_desktop(page.session)
@@ -23,6 +26,19 @@ def settings_dev_tools(page: ft.Page, refresh_all=None) -> ft.Column:
         tooltip="Forces narrow phone view + bottom nav even on desktop",
     )
 
+    switch_write_behind = ft.Switch(
+        label="Fast Entry (write-behind)",
+        value=get_write_behind(page.session),
+        tooltip="Saves are acknowledged at once and committed in batches",
+    )
+
+    def on_write_behind_toggle(e):
+        set_write_behind(page.session, switch_write_behind.value)
+        state = "on" if switch_write_behind.value else "off"
+        page.run_task(page.show_snack, f"Fast entry {state}", "blue")
+
+    switch_write_behind.on_change = on_write_behind_toggle
+
     def on_theme_toggle(e):
         page.run_task(page.toggle_theme)
         theme_switch.label = "Dark Mode" if page.theme_mode == "light" else "Light Mode"
@@ -65,6 +81,27 @@ def settings_dev_tools(page: ft.Page, refresh_all=None) -> ft.Column:
         switch_mobile.value = False
         page.run_task(page.show_snack, "Auto-detect restored! Restart app.", "orange")
 
+    cache_stats = ft.Text(size=12, color="grey")
+    refresh_stats = ft.Text(size=12, color="grey")
+
+    def show_cache_stats(e=None):
+        stats = svc_get_cache_stats()
+        cache_stats.value = (
+            f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+            f"{stats['entries']} entries, generation {stats['generation']}"
+        )
+        scheduler = getattr(page, "refresh_scheduler", None)
+        if scheduler is not None:
+            refresh = scheduler.stats()
+            refresh_stats.value = (
+                f"{refresh['requests']} requests in {refresh['batches']} batches; "
+                f"save to screen p50 {refresh['p50_ms']} ms, p95 {refresh['p95_ms']} ms"
+            )
+        if e is not None:
+            page.update()
+
+    show_cache_stats()
+
     async def apply_desktop_size(e):
         page.window.width = 1200
         page.window.height = 800
@@ -89,6 +126,15 @@ def settings_dev_tools(page: ft.Page, refresh_all=None) -> ft.Column:
             switch_desktop,
             switch_mobile,
             ft.Divider(height=20),
+            ft.Text("Data Entry", size=18, weight="bold"),
+            switch_write_behind,
+            ft.Divider(height=20),
+            ft.Text("Result Cache & Refresh", size=18, weight="bold"),
+            ft.Row([
+                ft.Column([cache_stats, refresh_stats], spacing=4),
+                ft.IconButton(ft.Icons.REFRESH, tooltip="Refresh stats", on_click=show_cache_stats),
+            ]),
+            ft.Divider(height=20),
             ft.ElevatedButton(
                 "Auto Detect Device",
                 icon=ft.Icons.PHONE_ANDROID,
@@ -1,34 +1,66 @@
 # ui/components/transaction_tile.py
 import flet as ft
 from decimal import Decimal
-from src.database import Transaction
+from src.rows import TransactionRow
+from src.models import HIGHLIGHT_START, HIGHLIGHT_END
 from controls.dialogs import edit_transaction_dialog, delete_transaction
 from controls.common import money_text
 
+HIGHLIGHT_STYLE = ft.TextStyle(color=ft.Colors.BLACK, bgcolor=ft.Colors.AMBER_300)
+
+
+def highlight_spans(marked: str, max_chars: int | None = None) -> list[ft.TextSpan]:
+    """
+    Search highlight markup -> TextSpans with the matched words styled.
+    `max_chars` cuts the visible text like the plain preview does.
+    """
+    spans, shown = [], 0
+    for i, part in enumerate(marked.replace(HIGHLIGHT_END, HIGHLIGHT_START).split(HIGHLIGHT_START)):
+        if max_chars is not None and shown + len(part) > max_chars:
+            part = part[: max_chars - shown] + "..."
+        if part:
+            # Odd parts sit between a start and an end marker
+            spans.append(ft.TextSpan(part, style=HIGHLIGHT_STYLE if i % 2 else None))
+        shown += len(part)
+        if max_chars is not None and shown >= max_chars:
+            break
+    return spans
 
 
 def transaction_tile(
-    transaction: Transaction,
+    transaction: TransactionRow,
     page: ft.Page,
     refresh_all,
     running_balance: Decimal | None = None,
+    highlights: dict | None = None,
 ) -> ft.Control:
     """
     Responsive transaction tile for desktop/web.
     Shows date, category, description preview, tags, amount + balance,
     with edit/delete buttons and hover effect.
+    `highlights` (search results) marks the matched words in the category,
+    description and tags.
     """
+    highlights = highlights or {}
+
     # ── Description preview ──────────────────────────────────────
     full_desc = transaction.description or transaction.date.strftime("%d %b %Y")
     preview_desc = full_desc[:60] + "..." if len(full_desc) > 60 else full_desc
+    desc_spans = highlight_spans(highlights["description"], 60) if highlights.get("description") else None
+    category_spans = highlight_spans(highlights["category"]) if highlights.get("category") else None
+    matched_tags = {
+        part.replace(HIGHLIGHT_START, "").replace(HIGHLIGHT_END, "").strip()
+        for part in (highlights.get("tags") or "").split(",")
+        if HIGHLIGHT_START in part
+    }
 
     # ── Tags as small chips ──────────────────────────────────────
-    tags_list = [t.strip() for t in (transaction.tags or "").split(",") if t.strip()]
+    tags_list = transaction.tag_names  # already split + stripped by the model
     tag_chips = ft.Row(
         controls=[
             ft.Chip(
-                label=ft.Text(tag, size=11, color=ft.Colors.WHITE_70),
-                bgcolor=ft.Colors.BLUE_GREY_800,
+                label=ft.Text(tag, size=11, color=ft.Colors.BLACK if tag in matched_tags else ft.Colors.WHITE_70),
+                bgcolor=ft.Colors.AMBER_300 if tag in matched_tags else ft.Colors.BLUE_GREY_800,
                 padding=ft.padding.symmetric(horizontal=8, vertical=2),
             )
             for tag in tags_list[:4]
@@ -64,7 +96,8 @@ def transaction_tile(
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             ),
             ft.Text(
-                transaction.category,
+                None if category_spans else transaction.category,
+                spans=category_spans,
                 size=16,
                 weight=ft.FontWeight.W_600,
                 color=ft.Colors.WHITE,
@@ -72,7 +105,8 @@ def transaction_tile(
                 overflow=ft.TextOverflow.ELLIPSIS,
             ),
             ft.Text(
-                preview_desc,
+                None if desc_spans else preview_desc,
+                spans=desc_spans,
                 size=14,
                 color=ft.Colors.GREY_400,
                 max_lines=2,
@@ -107,10 +141,16 @@ def transaction_tile(
         horizontal_alignment=ft.CrossAxisAlignment.END,
     )
 
-    # ── Action buttons ───────────────────────────────────────────
+    # ── Action buttons (archived years are read-only) ────────────
     actions = ft.Column(
         spacing=0,
         controls=[
+            ft.Icon(
+                ft.Icons.INVENTORY_2_OUTLINED,
+                color=ft.Colors.GREY_600,
+                tooltip="Archived year (read-only)",
+            ),
+        ] if transaction.archived else [
             ft.IconButton(
                 ft.Icons.EDIT_OUTLINED,
                 icon_color=ft.Colors.BLUE_300,
@@ -1,20 +1,20 @@
 # ui/components/transaction_tile_mobile.py
 import flet as ft
 from decimal import Decimal
-from src.database import Transaction
+from src.rows import TransactionRow
 from controls.dialogs import edit_transaction_dialog, delete_transaction
 from ui.components.transaction_tile import transaction_tile  # Reuse base
 
 def _mobile_transaction_menu(
-    transaction: Transaction,
+    transaction: TransactionRow,
     page: ft.Page,
     refresh_all,
 ):
     full_desc = transaction.description or "No notes provided."
     # --- ADD TAG LOGIG FOR BOTTOM SHEET ---
-    tags_list = (transaction.tags or "").split(",") if transaction.tags else []
+    tags_list = transaction.tag_names
     tag_chips = ft.Row(
-        [ft.Chip(label=ft.Text(tag.strip(), size=10), bgcolor="blue200") for tag in tags_list],
+        [ft.Chip(label=ft.Text(tag, size=10), bgcolor="blue200") for tag in tags_list],
         wrap=True,
     )
 
@@ -101,10 +101,11 @@ def _mobile_transaction_menu(
     return handler
 
 def transaction_tile_mobile(
-    transaction: Transaction,
+    transaction: TransactionRow,
     page: ft.Page,
     refresh_all,
     running_balance: Decimal | None = None,
+    highlights: dict | None = None,
 ) -> ft.Control:
     """Mobile-specific transaction tile with gestures."""
 
@@ -113,24 +114,30 @@ def transaction_tile_mobile(
         page,
         refresh_all,
         running_balance,
+        highlights,
     )
 
-    return ft.Dismissible(
-        content=ft.Card(
-            elevation=4,
-            margin=8,
-            color="#1e1e2e",
-            content=ft.Container(
-                content=base_tile,
-                padding=12,
-                border_radius=10,
-                on_click=_mobile_transaction_menu(
-                    transaction,
-                    page,
-                    refresh_all,
-                ),
+    card = ft.Card(
+        elevation=4,
+        margin=8,
+        color="#1e1e2e",
+        content=ft.Container(
+            content=base_tile,
+            padding=12,
+            border_radius=10,
+            on_click=None if transaction.archived else _mobile_transaction_menu(
+                transaction,
+                page,
+                refresh_all,
             ),
         ),
+    )
+    if transaction.archived:
+        # Archived years are read-only: no edit menu, no swipe-to-delete
+        return card
+
+    return ft.Dismissible(
+        content=card,
         background=ft.Container(
             content=ft.Row(
                 [ft.Icon(ft.Icons.DELETE_FOREVER, size=40, color="white")],
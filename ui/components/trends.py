@@ -0,0 +1,61 @@
+# ui/components/trends.py
+import flet as ft
+from controls.common import money_text
+
+
+def _change_text(change_pct):
+    # Spending up is bad news: red when up, green when down
+    if change_pct is None:
+        return ft.Text("-", color="grey")
+    color = "#ff4444" if change_pct > 0 else "#07ff07"
+    return ft.Text(f"{change_pct:+.1f}%", color=color)
+
+
+def monthly_trends_table(trends: list) -> ft.DataTable:
+    # trends: svc_get_monthly_trends() rows (MonthTrend tuples), newest first
+    return ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("Month", weight="bold")),
+            ft.DataColumn(ft.Text("Expenses", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("3-Month Avg", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Last Year", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Change", weight="bold"), numeric=True),
+        ],
+        rows=[
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(trend.month, weight="w500")),
+                ft.DataCell(money_text(-trend.expenses, size=14)),
+                ft.DataCell(money_text(-trend.rolling_average, size=14, weight="normal")),
+                ft.DataCell(
+                    money_text(-trend.last_year, size=14, weight="normal")
+                    if trend.last_year is not None else ft.Text("-", color="grey")
+                ),
+                ft.DataCell(_change_text(trend.change_pct)),
+            ])
+            for trend in trends
+        ],
+        heading_row_color=ft.Colors.with_opacity(0.1, ft.Colors.ON_SURFACE),
+        border=ft.border.all(1, ft.Colors.OUTLINE_VARIANT),
+        border_radius=10,
+        column_spacing=30,
+    )
+
+
+def category_pivot_table(pivot: dict) -> ft.DataTable:
+    # pivot: svc_get_category_pivot() -> {"months": [...], "rows": [(category, [Decimal per month])]}
+    months = pivot.get("months", [])
+    return ft.DataTable(
+        columns=[ft.DataColumn(ft.Text("Category", weight="bold"))] + [
+            ft.DataColumn(ft.Text(month, weight="bold"), numeric=True) for month in months
+        ],
+        rows=[
+            ft.DataRow(cells=[ft.DataCell(ft.Text(category))] + [
+                ft.DataCell(ft.Text(f"R{value:,.2f}" if value else "-")) for value in values
+            ])
+            for category, values in pivot.get("rows", [])
+        ],
+        heading_row_color=ft.Colors.with_opacity(0.1, ft.Colors.ON_SURFACE),
+        border=ft.border.all(1, ft.Colors.OUTLINE_VARIANT),
+        border_radius=10,
+        column_spacing=24,
+    )
@@ -2,21 +2,21 @@
 import flet as ft
 from decimal import Decimal
 from src.motivation import daily_message
-from src.services.core import (
-    svc_get_balance,
-    svc_get_total_projected_wealth,
+from src.services.async_core import (
+    svc_get_balance_async,
+    svc_get_total_projected_wealth_async,
 )
 
 
-def _get_daily_fire_text() -> str:
+async def _get_daily_fire_text() -> str:
     return daily_message(
-        svc_get_balance(),
-        svc_get_total_projected_wealth(),
+        await svc_get_balance_async(),
+        await svc_get_total_projected_wealth_async(),
     )
 
 
-def daily_fire(page: ft.Page):
-    message = _get_daily_fire_text()
+async def daily_fire(page: ft.Page):
+    message = await _get_daily_fire_text()
 
     return ft.Container(
         padding=20,
@@ -41,5 +41,5 @@ def daily_fire(page: ft.Page):
         ),
     )
 
-def get_progress_toward_fire():
-    return svc_get_total_projected_wealth() / Decimal('10000000') * 100
\ No newline at end of file
+async def get_progress_toward_fire():
+    return await svc_get_total_projected_wealth_async() / Decimal('10000000') * 100
\ No newline at end of file
@@ -1,26 +1,50 @@
 # ui/sections/desktop/diary_desktop.py
 import flet as ft
-import asyncio
 from datetime import date
-from src.services.core import (
-    svc_get_transactions_with_running_balance_date_to_date
+from src.services.async_core import (
+    svc_get_transactions_page_async,
+    svc_search_transactions_async,
     )
 from ui.components.transaction_tile import transaction_tile
+from src.events import TransactionsChanged, DataReplaced
+
+PAGE_SIZE = 50
+LOAD_MORE_THRESHOLD_PX = 400  # start fetching the next page this close to the bottom
 
 class DiaryTab(ft.Column):
+    CHANGE_EVENTS = (TransactionsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll=ft.ScrollMode.AUTO)
         self._page = page
         self.refresh_all = refresh_all
-        self.list = ft.ListView(expand=True, spacing=4, padding=10)
+        self.list = ft.ListView(expand=True, spacing=4, padding=10, on_scroll=self._on_scroll, scroll_interval=100)
         self.from_date = ft.TextField(label="From Date (YYYY-MM-DD)", value="")
         self.to_date = ft.TextField(label="To Date (YYYY-MM-DD)", value="")
+        self.search = ft.TextField(
+            label="Search notes, categories, tags",
+            prefix_icon=ft.Icons.SEARCH,
+            on_submit=lambda _: self._page.run_task(self.refresh),
+        )
         self.filter_btn = ft.ElevatedButton("Filter", on_click=lambda _: self._page.run_task(self.refresh))
+        self.load_more_btn = ft.TextButton(
+            "Load older transactions",
+            icon=ft.Icons.EXPAND_MORE,
+            on_click=lambda _: self._page.run_task(self._load_next_page),
+        )
+
+        # Paging state: (date, id) cursor of the last loaded row, or the
+        # next results page number while a search is active
+        self._range = (None, None)
+        self._query = ""
+        self._cursor = None
+        self._loading = False
+        self._generation = 0  # bumped by refresh() so stale pages are dropped
 
         self.controls = [
             ft.Text("Recent Transactions", size=28, weight=ft.FontWeight.BOLD),
             ft.Divider(),
-            ft.Row([self.from_date, self.to_date, self.filter_btn,]),
+            ft.Row([self.search, self.from_date, self.to_date, self.filter_btn], wrap=True),
             self.list,
         ]
 
@@ -48,27 +72,62 @@ class DiaryTab(ft.Column):
                 self.to_date.value = ""   # Reset invalid field
                 await self._page.safe_update()
                 return # Early exit to prevent bad data fetch
-                
-        # 2. Fetch data (offloaded to a thread to keep the spinner moving)
-        # This prevents the UI from freezing during the database/API call
-        # Use filtered service (limit to 100 for perf)
-        data = await asyncio.to_thread(
-            svc_get_transactions_with_running_balance_date_to_date, from_d, to_d
-            )
-        data = data[:100]
-        
-        # 3 Build the new List
-        if not data:
-            new_controls = [ft.Text("No transactions found.", size=16, italic=True)]
-        else:
-            new_controls = [
-                transaction_tile(
-                    item["transaction"],
-                    self._page,
-                    self.refresh_all,
-                    item["running_balance"]
-                ) for item in data
-            ]
-        # 4 Update both the list and the summary table
-        self.list.controls = new_controls
-        self.list.update()
\ No newline at end of file
+
+        # 2 Start again from the newest row of the (filtered) range
+        self._generation += 1
+        self._range = (from_d, to_d)
+        self._query = (self.search.value or "").strip()
+        self._cursor = None
+        self._loading = False
+        await self._load_next_page(first=True)
+
+    async def _load_next_page(self, first: bool = False):
+        if self._loading or (not first and self._cursor is None):
+            return
+        self._loading = True
+        generation = self._generation
+        try:
+            # Fetch one page (on the DB executor, so the UI keeps moving)
+            if self._query:
+                from_d, to_d = self._range
+                page_data = await svc_search_transactions_async(
+                    self._query,
+                    {"from_date": from_d, "to_date": to_d},
+                    self._cursor or 0,
+                    PAGE_SIZE,
+                )
+                next_cursor = page_data["page"] + 1 if page_data["has_more"] else None
+            else:
+                page_data = await svc_get_transactions_page_async(
+                    self._cursor, PAGE_SIZE, *self._range
+                )
+                next_cursor = page_data["next_cursor"]
+        finally:
+            self._loading = False
+        if generation != self._generation:
+            return  # a newer refresh started while this page was loading
+
+        # 3 Append the new tiles (the spinner / load-more footer goes first)
+        controls = [] if first else [c for c in self.list.controls if c is not self.load_more_btn]
+        controls.extend(
+            transaction_tile(
+                item["transaction"],
+                self._page,
+                self.refresh_all,
+                item["running_balance"],
+                item.get("highlights"),
+            ) for item in page_data["items"]
+        )
+        if not controls:
+            controls = [ft.Text("No transactions found.", size=16, italic=True)]
+
+        self._cursor = next_cursor
+        if self._cursor is not None:
+            controls.append(self.load_more_btn)
+
+        self.list.controls = controls
+        self.list.update()
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if self._cursor is not None and e.pixels >= e.max_scroll_extent - LOAD_MORE_THRESHOLD_PX:
+            self._page.run_task(self._load_next_page)
@@ -1,12 +1,15 @@
 # ui/sections/desktop/investments_desktop.py
 import flet as ft
 from decimal import Decimal
-from src.services.core import svc_get_investments, svc_get_total_projected_wealth
+from src.services.async_core import svc_get_investments_async, svc_get_total_projected_wealth_async
 from ui.components.investment_card import investment_card
 from ui.components.investment_form import investment_form
+from src.events import InvestmentsChanged, DataReplaced
 
 
 class InvestmentsTab(ft.Column):
+    CHANGE_EVENTS = (InvestmentsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(
             expand=True,
@@ -43,14 +46,11 @@ class InvestmentsTab(ft.Column):
             self.cards_container,
         ]
 
-        # Initial load
-        self._page.run_task(self.refresh)
-
     async def refresh(self):
         """Reload investments + update summary"""
         self.cards_container.controls.clear()
 
-        investments = svc_get_investments()
+        investments = await svc_get_investments_async()
 
         if not investments:
             self.cards_container.controls.append(
@@ -75,7 +75,7 @@ class InvestmentsTab(ft.Column):
                 )
 
         # Update total projected wealth
-        total = svc_get_total_projected_wealth()
+        total = await svc_get_total_projected_wealth_async()
         self.total_projected.value = (
             f"Total Projected Wealth: R{total:,.0f}"
             if total > 0
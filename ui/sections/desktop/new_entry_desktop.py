@@ -5,6 +5,8 @@ from ui.components.new_entry_form import new_entry_form
 from ui.components.investment_form import investment_form
 
 class NewEntryTab(ft.Column):
+    CHANGE_EVENTS = ()
+
     def __init__(self, page: ft.Page, refresh_all=None):
         super().__init__(
             expand=True,
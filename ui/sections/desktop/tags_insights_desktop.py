@@ -1,16 +1,20 @@
 # ui/sections/desktop/tags_insights_desktop.py
+import asyncio
 import flet as ft
-from src.services.core import svc_get_tag_summary  # New service wrapper
+from src.services.async_core import svc_get_tag_summary_async, svc_get_category_pivot_async
+from ui.components.trends import category_pivot_table
+from src.events import TransactionsChanged, DataReplaced
 
 class TagsInsightsTab(ft.Column):
+    CHANGE_EVENTS = (TransactionsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
         self.refresh_all = refresh_all
-        self._build()
+        self._build([], {})  # filled in by refresh()
 
-    def _build(self):
-        summaries = svc_get_tag_summary()  # Fetch
+    def _build(self, summaries, pivot):
         # Build table or list of tag: total
         table = ft.DataTable(
             columns=[
@@ -23,8 +27,8 @@ class TagsInsightsTab(ft.Column):
             rows=[
                 ft.DataRow(
                     cells=[
-                        ft.DataCell(ft.Text(item["tag"])),
-                        ft.DataCell(ft.Text(f"R{item["total"]:,.2f}")),
+                        ft.DataCell(ft.Text(item.tag)),
+                        ft.DataCell(ft.Text(f"R{item.total:,.2f}")),
                     ],
                 ) for item in summaries
             ]
@@ -33,9 +37,15 @@ class TagsInsightsTab(ft.Column):
             ft.Text("Tags & Insights", size=28, weight="bold"),
             ft.Divider(),
             table,
+            ft.Text("Spending by Category", size=22, weight="bold"),
+            ft.Row([category_pivot_table(pivot)], scroll="auto"),
             # Future: Graphs, comparisons (e.g., shop pie)
         ]
 
     async def refresh(self):
-        self._build()
+        summaries, pivot = await asyncio.gather(
+            svc_get_tag_summary_async(),
+            svc_get_category_pivot_async(6),
+        )
+        self._build(summaries, pivot)
         await self._page.safe_update()
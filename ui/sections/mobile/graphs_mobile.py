@@ -2,6 +2,8 @@
 import flet as ft
 
 class GraphsTab(ft.Column):
+    CHANGE_EVENTS = ()
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
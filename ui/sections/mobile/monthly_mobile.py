@@ -1,23 +1,33 @@
 # ui/sections/desktop/monthly_mobile.py
+import asyncio
 import flet as ft
+from src.services.async_core import svc_get_monthly_summary_async, svc_get_monthly_trends_async
 from ui.components.monthly_summary import monthly_summary_mobile  # Desktop table
+from ui.components.trends import monthly_trends_table
+from src.events import TransactionsChanged, DataReplaced
 
 class MonthlyTab(ft.Column):
+    CHANGE_EVENTS = (TransactionsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
         self.refresh_all = refresh_all
-        self.future_content = ft.Column()  # Placeholder for future additions
-        self._build()
+        self._build([], [])  # filled in by refresh()
 
-    def _build(self):
+    def _build(self, summaries, trends):
         self.controls = [
             ft.Text("Monthly Summaries", size=24, weight="bold"),
             ft.Divider(),
-            monthly_summary_mobile(),  # Always on top
-            self.future_content,  # Add stuff here later (e.g., charts, filters)
+            monthly_summary_mobile(summaries),  # Always on top
+            ft.Text("Spending Trends", size=18, weight="bold"),
+            ft.Row([monthly_trends_table(trends)], scroll="auto"),
         ]
 
     async def refresh(self):
-        self._build()  # Rebuild to refresh summary
+        summaries, trends = await asyncio.gather(
+            svc_get_monthly_summary_async(),
+            svc_get_monthly_trends_async(6),
+        )
+        self._build(summaries, trends)  # Rebuild to refresh summary
         await self._page.safe_update()
@@ -3,6 +3,8 @@ import flet as ft
 from ui.components.settings_dev_tools import settings_dev_tools
 
 class SettingsTab(ft.Column):
+    CHANGE_EVENTS = ()
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
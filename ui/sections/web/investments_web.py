@@ -1,10 +1,13 @@
 # ui/sections/web/investments_web.py
 import flet as ft
-from src.services.core import svc_get_investments
+from src.services.async_core import svc_get_investments_async
 from ui.components.investment_card import investment_card
 from ui.components.investment_form import investment_form
+from src.events import InvestmentsChanged, DataReplaced
 
 class InvestmentsTab(ft.Column):
+    CHANGE_EVENTS = (InvestmentsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
@@ -21,7 +24,7 @@ class InvestmentsTab(ft.Column):
     async def refresh(self):
         self.container.controls.clear()
 
-        investments = svc_get_investments()
+        investments = await svc_get_investments_async()
         if not investments:
             self.container.controls.append(
                 ft.Text("No investments yet!", italic=True, color="grey")
@@ -1,17 +1,20 @@
 # ui/sections/desktop/savings_brag_desktop.py
 import flet as ft
-from src.services.core import svc_get_total_saved
+from decimal import Decimal
+from src.services.async_core import svc_get_total_saved_async
 from controls.common import money_text
+from src.events import TransactionsChanged, DataReplaced
 
 class SavingsBragTab(ft.Column):
+    CHANGE_EVENTS = (TransactionsChanged, DataReplaced)
+
     def __init__(self, page: ft.Page, refresh_all):
         super().__init__(expand=True, scroll="auto")
         self._page = page
         self.refresh_all = refresh_all
-        self._build()
+        self._build(Decimal("0.00"))  # filled in by refresh()
 
-    def _build(self):
-        total_saved = svc_get_total_saved()
+    def _build(self, total_saved: Decimal):
         brag_text = ft.Text("Keep hunting those deals—your savings are growing!" if total_saved > 0 else "Start tracking discounts to build your brag rights!", italic=True)
 
         self.controls = [
@@ -29,5 +32,5 @@ class SavingsBragTab(ft.Column):
         ]
 
     async def refresh(self):
-        self._build()
+        self._build(await svc_get_total_saved_async())
         await self._page.safe_update()
@@ -5,6 +5,8 @@ from typing import Any
 
 async def safe_update(page):  # Keep async for now, but could be sync
     """Async-safe wrapper around page.update()."""
+    if getattr(page, "updates_deferred", False):
+        return  # a refresh batch is running; it updates once at the end
     try:
         page.update()
     except Exception:
@@ -0,0 +1,109 @@
+# ui/utils/refresh_scheduler.py
+"""
+Batches the UI refreshes that follow writes.
+
+Quick successive saves each asked for a refresh, and the refreshes ran
+over one another, each awaiting its views one by one and each ending in
+its own page.update(). RefreshScheduler instead:
+
+  - collects requests for DEBOUNCE_S and merges them: a view asked for
+    twice refreshes once;
+  - runs the batch's refreshes concurrently (their svc_*_async reads then
+    run side by side on the DB executor);
+  - holds back page.safe_update() while they run and sends one
+    page.update() at the end;
+  - runs one batch at a time: requests arriving meanwhile form the next.
+
+request() returns a future that resolves once the batch holding the
+request is on screen, so `await` still means "refreshed".
+
+Latency is measured from `since` (when the change was committed, passed
+by the caller) to the end of that page.update(); stats() reports it.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+from ui.utils.flet_compat import safe_update
+
+DEBOUNCE_S = 0.03
+KEEP_LATENCIES = 200
+
+
+class RefreshScheduler:
+    def __init__(self, page, debounce_s: float = DEBOUNCE_S):
+        self._page = page
+        self.debounce_s = debounce_s
+        self._pending = {}  # key -> async refresh function
+        self._waiters = []
+        self._running = None  # waiters of the batch being applied now
+        self._since = None
+        self._task = None
+        self._latencies = deque(maxlen=KEEP_LATENCIES)
+        self.requests = 0
+        self.batches = 0
+
+    def request(self, targets: dict, since: float = None) -> asyncio.Future:
+        """
+        Schedule targets ({key: async function}) for the next batch; `since`
+        is the time.perf_counter() of the change being shown, for the latency.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        if not targets and not self._pending:
+            # Nothing new to show: just wait for the batch on its way, if any
+            if self._running is not None:
+                self._running.append(waiter)
+            else:
+                waiter.set_result(None)
+            return waiter
+        self.requests += 1
+        self._pending.update(targets)
+        if since is not None:
+            self._since = since if self._since is None else min(self._since, since)
+        self._waiters.append(waiter)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._drain())
+        return waiter
+
+    async def _drain(self):
+        while self._waiters:
+            await asyncio.sleep(self.debounce_s)  # let the rest of a burst arrive
+            targets, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            self._running = waiters
+            since, self._since = self._since, None
+            started = time.perf_counter()
+
+            self._page.updates_deferred = True
+            try:
+                results = await asyncio.gather(*(fn() for fn in targets.values()), return_exceptions=True)
+            finally:
+                self._page.updates_deferred = False
+            for key, result in zip(targets, results):
+                if isinstance(result, Exception):
+                    logging.error(f"Refresh error in {key if isinstance(key, str) else key.__class__.__name__}: {result}")
+            await safe_update(self._page)
+
+            self.batches += 1
+            if targets:
+                latency = time.perf_counter() - (since or started)
+                self._latencies.append(latency)
+                logging.info(f"Refreshed {len(targets)} view(s) for {len(waiters)} request(s) in {latency * 1000:.0f} ms")
+            self._running = None
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def stats(self) -> dict:
+        """{"requests", "batches", "p50_ms", "p95_ms", "max_ms"} over the last KEEP_LATENCIES batches."""
+        latencies = sorted(self._latencies)
+        pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "p50_ms": pick(0.5),
+            "p95_ms": pick(0.95),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+        }